@@ -1,27 +1,31 @@
 import os
-import json
 import re
 import time
 import base64
 import binascii
-from typing import List, Optional, Dict
+import sys
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
 
-from vault import Vault, VaultEncrypted, Entry, deserialize_vault, deserialize_vault_encrypted
+import json_codec
+import tracing
+from vault import Vault, VaultEncrypted, Entry, deserialize_vault, deserialize_vault_encrypted, stream_vault_file
 from otp import OTP, generate_totp, generate_hotp, generate_steam_otp, generate_motp
 
 def_period: int = 30  # The default TOTP refresh interval
 
-def find_vault_path(vault_dir: str) -> Optional[str]:
-    vault_path = None
+def find_vault_paths(vault_dir: str) -> List[str]:
+    """Returns the Aegis backup/export files in vault_dir, most recently modified first."""
+    with tracing.span("find_vault_path", dir=vault_dir):
+        return _find_vault_paths(vault_dir)
+
+def _find_vault_paths(vault_dir: str) -> List[str]:
     try:
         files = os.listdir(vault_dir)
     except FileNotFoundError:
-        return None
+        return []
     except Exception:
-        return None
-
-    if not files:
-        return None
+        return []
 
     vault_files = []
     vault_file_re = re.compile(r"^aegis-(backup|export)-\d+(-\d+)*\.json$")
@@ -30,36 +34,56 @@ def find_vault_path(vault_dir: str) -> Optional[str]:
             full_path = os.path.join(vault_dir, f_name)
             if os.path.isfile(full_path):
                 vault_files.append(full_path)
-    
-    if not vault_files:
-        return None
 
-    # Find the most recently modified file
-    vault_path = max(vault_files, key=os.path.getmtime)
+    return sorted(vault_files, key=os.path.getmtime, reverse=True)
 
-    return vault_path
+def find_vault_path(vault_dir: str) -> Optional[str]:
+    # The most recently modified file
+    vault_files = find_vault_paths(vault_dir)
+    return vault_files[0] if vault_files else None
 
 def read_vault_file(file_path: str) -> Vault:
-    with open(file_path, 'r') as f:
-        data = json.load(f)
-    return deserialize_vault(data)
+    return deserialize_vault(json_codec.load_file(file_path))
 
 def read_vault_file_enc(file_path: str) -> VaultEncrypted:
-    with open(file_path, 'r') as f:
-        data = json.load(f)
-    return deserialize_vault_encrypted(data)
+    return deserialize_vault_encrypted(json_codec.load_file(file_path))
+
+def prepare_vault_file(file_path: str, on_header: Optional[Callable[[bool], None]] = None) -> Union[VaultEncrypted, Vault]:
+    """
+    Reads and parses an encrypted vault and decodes its slot parameters, everything short of the KDF.
+    Returns once the header is read; the db payload keeps streaming in, so the KDF overlaps the I/O.
+    A plaintext export is returned already parsed, as a Vault (see needs_password());
+    on_header learns whether the vault is encrypted before that (see stream_vault_file()).
+    """
+    with tracing.span("read_vault", path=file_path):
+        vault = stream_vault_file(file_path, on_header)
+        return vault.prepare() if isinstance(vault, VaultEncrypted) else vault
+
+def needs_password(prepared: Union[VaultEncrypted, Vault, None]) -> bool:
+    """False for a plaintext export, which prepare_vault_file() has already opened."""
+    return not isinstance(prepared, Vault)
+
+def unlock_vault(vault_data_enc: Union[VaultEncrypted, Vault], pwd: Optional[str], timings: Optional[Dict[str, float]] = None, load_icons: bool = False) -> Vault:
+    """
+    Derives the master key and decrypts an already parsed vault. Safe to retry with another password.
+    If timings is given, the seconds spent in each stage (kdf, unwrap, decrypt, parse) are added to it.
+    Icons are only decoded with load_icons; otherwise vault.icons loads them on demand.
+    A plaintext export needs neither and is returned as it is (its icons always load on demand).
+    """
+    if not needs_password(vault_data_enc):
+        return vault_data_enc
+    with tracing.span("unlock_vault"):
+        master_key = vault_data_enc.find_master_key(pwd, timings)
+        return vault_data_enc.decrypt_vault(master_key, timings, load_icons)
 
 def read_and_decrypt_vault_file(file_path: str, pwd: str) -> Vault:
-    vault_data_enc = read_vault_file_enc(file_path)
-    master_key = vault_data_enc.find_master_key(pwd)
-    vault_data_plain = vault_data_enc.decrypt_vault(master_key)
-    return vault_data_plain
+    return unlock_vault(prepare_vault_file(file_path), pwd)
 
 def get_otp(entry: Entry) -> OTP:
     if entry.type == "totp":
         return generate_totp(entry.info.secret, entry.info.algo, entry.info.digits, entry.info.period)
     elif entry.type == "hotp":
-        # Original Go code had a placeholder for HOTP. Using pyotp's actual HOTP.
+        # Original Go code had a placeholder for HOTP. This is a full RFC 4226 HOTP.
         return generate_hotp(entry.info.secret, entry.info.algo, entry.info.digits, entry.info.counter)
     elif entry.type == "steam":
         return generate_steam_otp(entry.info.secret, entry.info.algo, entry.info.digits, entry.info.period)
@@ -69,7 +93,60 @@ def get_otp(entry: Entry) -> OTP:
     else:
         raise ValueError(f"Unsupported OTP type {entry.type}")
 
+def find_entries(vault_data: Vault, query: str) -> List[Entry]:
+    """
+    Resolves a UUID or a search query to entries. A UUID is looked up in an index;
+    otherwise exact (case-insensitive) issuer/name matches win over substring matches.
+    """
+    by_uuid = {entry.uuid: entry for entry in vault_data.db.entries}
+    if query in by_uuid:
+        return [by_uuid[query]]
+
+    needle = query.lower()
+    exact, partial = [], []
+    for entry in vault_data.db.entries:
+        name = entry.name.lower()
+        issuer = (entry.issuer or "").lower()
+        if needle in (name, issuer, f"{issuer}:{name}", f"{issuer} - {name}"):
+            exact.append(entry)
+        elif needle in name or needle in issuer:
+            partial.append(entry)
+    return exact or partial
+
+CODE_RECORD_FIELDS = ("uuid", "issuer", "name", "groups", "code", "expires_at")
+
+def iter_code_records(vault_data: Vault, entries: Iterable[Entry], now: float, group: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Yields one record per entry with its code at the time snapshot now, so all codes
+    are consistent. expires_at is an ISO 8601 UTC time, or None for counter based codes.
+    Entries without a usable OTP are reported on stderr and skipped.
+    """
+    group_names = {g.uuid: g.name for g in vault_data.db.groups}
+    for entry in entries:
+        groups = [group_names.get(g, g) for g in entry.groups or []]
+        if group is not None and group not in groups:
+            continue
+        try:
+            otp = get_otp(entry)
+            code = otp.string_at(now)
+        except Exception as e:
+            print(f"Error generating OTP for entry {entry.uuid}: {e}", file=sys.stderr)
+            continue
+        period = otp.period()
+        expires_at = None
+        if period:
+            window_end = (now // period + 1) * period
+            expires_at = datetime.fromtimestamp(window_end, timezone.utc).isoformat().replace("+00:00", "Z")
+        yield {
+            "uuid": entry.uuid, "issuer": entry.issuer or "", "name": entry.name,
+            "groups": groups, "code": code, "expires_at": expires_at
+        }
+
 def get_otps(vault_data: Vault) -> Dict[str, OTP]:
+    with tracing.span("get_otps", entries=len(vault_data.db.entries)):
+        return _get_otps(vault_data)
+
+def _get_otps(vault_data: Vault) -> Dict[str, OTP]:
     otps: Dict[str, OTP] = {}
     for entry in vault_data.db.entries:
         try:
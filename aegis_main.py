@@ -3,27 +3,136 @@ import getpass
 import os
 import time
 import sys
-import curses
 
-try:
-    import pyperclip
-    PYPERCLIP_AVAILABLE = True
-except ImportError:
-    PYPERCLIP_AVAILABLE = False
-    print("Warning: pyperclip library not found. OTP copying to clipboard will not be available.")
+from concurrent.futures import Future, ThreadPoolExecutor
 
-from aegis_core import find_vault_path, read_and_decrypt_vault_file, get_otps, get_ttn
-from tui_ui import run_reveal_mode
+from aegis_core import (
+    find_vault_path, find_vault_paths, prepare_vault_file, needs_password, unlock_vault, find_entries, iter_code_records, get_otp, get_otps,
+    CODE_RECORD_FIELDS
+)
 from config import load_config, save_config, DEFAULT_AEGIS_VAULT_DIR
-from search_mode import run_search_mode
-from tui_utils import init_colors
+from vault import VaultFormatError
+import tracing
+
+
+def resolve_vault_path(args, config):
+    """Picks the vault to open: the CLI argument, the last opened vault, or the newest file found."""
+    vault_path = args.vault_path
+
+    if not vault_path and config["last_opened_vault"] and os.path.isfile(config["last_opened_vault"]):
+        vault_path = config["last_opened_vault"]
+
+    if not vault_path:
+        vault_path = find_vault_path(args.vault_dir)
+
+        if not vault_path and args.vault_dir != DEFAULT_AEGIS_VAULT_DIR:
+            vault_path = find_vault_path(DEFAULT_AEGIS_VAULT_DIR)
+            args.vault_dir = DEFAULT_AEGIS_VAULT_DIR # Update for consistent messaging
+
+    return vault_path
+
+def expand_vault_paths(paths):
+    """Replaces each directory in paths by the vault files in it, newest first, dropping duplicates."""
+    expanded = []
+    for path in paths:
+        found = find_vault_paths(path) if os.path.isdir(path) else []
+        for vault_path in found or [path]: # A directory without vaults is reported when it is read
+            if vault_path not in expanded:
+                expanded.append(vault_path)
+    return expanded
+
+def prepare_vault(args, encrypted=None):
+    """
+    Does all the work that does not need the password: loads the config, finds,
+    reads and parses the vault and decodes its slot parameters. Runs in the
+    background while the password is typed. Returns (config, vault_path, vault_enc);
+    vault_enc is an already opened Vault for a plaintext export.
+
+    The encrypted Future, if given, gets whether the vault is encrypted as soon as
+    its header is read, or True when no header could be read.
+    """
+    def on_header(is_encrypted):
+        if encrypted is not None and not encrypted.done():
+            encrypted.set_result(is_encrypted)
+
+    try:
+        with tracing.span("prepare_vault"):
+            config = load_config()
+            vault_path = resolve_vault_path(args, config)
+            vault_enc = prepare_vault_file(vault_path, on_header) if vault_path else None
+            return config, vault_path, vault_enc
+    finally:
+        on_header(True) # No vault or no header: the password is asked for, and any error reported after
+
+def warm_up(encrypted, warm_up_tui=True):
+    """
+    Imports what is needed right after Enter: the KDF (unless the vault turned out
+    to be a plaintext export) and the TUI modules. curses itself cannot be
+    initialised while getpass owns the terminal.
+    """
+    try:
+        if vault_needs_password(encrypted):
+            import cryptography.hazmat.primitives.kdf.scrypt
+            import cryptography.hazmat.primitives.ciphers
+        if warm_up_tui:
+            import curses
+            import search_mode
+            import tui_ui
+    except ImportError:
+        pass # Reported where the module is actually needed
+
+def start_prepare_vault(args, warm_up_tui=True):
+    """
+    Starts prepare_vault() in a background thread, done before the warm-up imports.
+    Returns its Future and the Future of whether the vault is encrypted, known
+    from the header before a plaintext export is parsed.
+    """
+    encrypted = Future()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prepare-vault")
+    future = executor.submit(prepare_vault, args, encrypted)
+    executor.submit(warm_up, encrypted, warm_up_tui)
+    executor.shutdown(wait=False)
+    return future, encrypted
+
+def vault_needs_password(encrypted):
+    """
+    Waits for the vault header (not the rest of prepare_vault()) and tells whether
+    a password must be asked for: not for a plaintext export.
+    """
+    return encrypted.result()
+
+def cli_main(stdscr, args, password, prepared=None, latency=None, session=None):
+    # The TUI modules are only needed once curses is running
+    import curses
+    from tui_ui import run_reveal_mode
+    from search_mode import run_search_mode, SearchSession
+    from tui_utils import init_colors
+    from unlock_mode import run_unlock_mode, format_unlock_timings
+    from clipboard import Clipboard
+    from entry_table import EntryTable
 
-def cli_main(stdscr, args, password):
     stdscr.keypad(True) # Enable special keys like arrow keys
 
     # Get terminal dimensions
     max_rows, max_cols = stdscr.getmaxyx()
 
+    row = 0
+
+    # Vault discovery and parsing normally finished while the password was typed
+    if prepared is None:
+        prepared, _ = start_prepare_vault(args)
+    try:
+        config, vault_path, vault_enc = prepared.result()
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        config, vault_path, vault_enc = load_config(), None, None
+        prepare_error = e
+    else:
+        prepare_error = None
+
+    # Override args.no_color if default_color_mode is false and --no-color is not explicitly set
+    if not config["default_color_mode"] and not args.no_color:
+        args.no_color = True
+
     # Initialize colors
     colors, curses_colors_enabled = init_colors(stdscr, args.no_color)
     NORMAL_TEXT_COLOR = colors["NORMAL_TEXT_COLOR"]
@@ -32,84 +141,96 @@ def cli_main(stdscr, args, password):
     RED_TEXT_COLOR = colors["RED_TEXT_COLOR"]
     BOLD_WHITE_COLOR = colors["BOLD_WHITE_COLOR"]
 
-    config = load_config()
-
-    # Override args.no_color if default_color_mode is false and --no-color is not explicitly set
-    if not config["default_color_mode"] and not args.no_color:
-        args.no_color = True
-
-    vault_path = args.vault_path
+    if prepare_error is not None:
+        stdscr.addstr(row, 0, f"Error reading vault: {prepare_error}"[:max_cols - 1], RED_TEXT_COLOR)
+        stdscr.refresh()
+        time.sleep(2)
+        return
 
-    row = 0
+    if not vault_path:
+        stdscr.addstr(row, 0, "Error: No vault file found. Exiting.")
+        row += 1
+        stdscr.refresh()
+        time.sleep(2)
+        return
     
-    if not vault_path and config["last_opened_vault"]:
-        vault_path = config["last_opened_vault"]
-        # row += 1 # Avoid unnecessary printing in TUI
-        # stdscr.refresh()
+    # Copies run on a background worker, configured by clipboard_tool
+    clipboard = Clipboard.from_config(config)
 
-    if not vault_path:
-        # stdscr.addstr(row, 0, f"Debug: Searching for vault in {os.path.abspath(args.vault_dir)}...")
-        # row += 1
-        # stdscr.refresh()
-        vault_path = find_vault_path(args.vault_dir)
+    # Reveals and copies are counted to rank the entries used most; saved in the background
+    usage = None
+    if config.get("usage_tracking", True):
+        from usage_store import UsageStore
+        usage = UsageStore.load()
 
-        if not vault_path and args.vault_dir != DEFAULT_AEGIS_VAULT_DIR:
-            vault_path = find_vault_path(DEFAULT_AEGIS_VAULT_DIR)
-            args.vault_dir = DEFAULT_AEGIS_VAULT_DIR # Update for consistent messaging
+    # Further vaults unlock concurrently with the first and are merged in as they finish
+    vault_set = None
+    extra_vault_paths = getattr(args, "extra_vault_paths", [])
+    if extra_vault_paths:
+        from vault_set import VaultSet
+        vault_set = VaultSet([vault_path] + extra_vault_paths)
+        vault_set.start(password, extra_vault_paths)
 
-        if not vault_path:
-            stdscr.addstr(row, 0, "Error: No vault file found. Exiting.")
-            row += 1
-            stdscr.refresh()
-            time.sleep(2)
-            return
-    
     vault_data = None
+    timings = None
+    if not needs_password(vault_enc):
+        vault_data = vault_enc # A plaintext export, already parsed: no password, no crypto
     attempts = 0
     max_attempts = 3
     
-    while attempts < max_attempts:
+    while vault_data is None and attempts < max_attempts:
+        # Parsed once, reused for every attempt; the KDF runs off the UI thread
         try:
-            vault_data = read_and_decrypt_vault_file(vault_path, password)
+            vault_data, e, timings, cancelled = run_unlock_mode(stdscr, vault_enc, password, row, colors)
+        except VaultFormatError as e: # A broken file, not a wrong password: another attempt cannot help
+            stdscr.addstr(row, 0, f"Error reading vault: {e}", RED_TEXT_COLOR)
+            stdscr.addstr(row + 1, 0, "Exiting.", RED_TEXT_COLOR)
+            stdscr.refresh()
+            time.sleep(2)
+            return
+        if cancelled:
+            stdscr.addstr(row, 0, "Unlock cancelled. Exiting.", RED_TEXT_COLOR)
+            stdscr.refresh()
+            time.sleep(1)
+            return
+        if vault_data is not None:
             break # Success, exit retry loop
-        except ValueError as e:
-            attempts += 1
-            if attempts >= max_attempts:
-                stdscr.addstr(row, 0, f"Error decrypting vault: {e}", RED_TEXT_COLOR)
-                stdscr.addstr(row + 1, 0, "Maximum attempts reached. Exiting.", RED_TEXT_COLOR)
-                stdscr.refresh()
-                time.sleep(2)
-                return
 
-            stdscr.addstr(row, 0, f"Error: {e}. Try again ({attempts}/{max_attempts})", RED_TEXT_COLOR)
-            row += 1
-            stdscr.addstr(row, 0, "Enter vault password: ")
+        attempts += 1
+        if attempts >= max_attempts:
+            stdscr.addstr(row, 0, f"Error decrypting vault: {e}", RED_TEXT_COLOR)
+            stdscr.addstr(row + 1, 0, "Maximum attempts reached. Exiting.", RED_TEXT_COLOR)
             stdscr.refresh()
-            
-            # Secure password input in curses
-            curses.echo() # Ideally we shouldn't use echo for password, but manual masking is complex.
-            # Actually, let's implement a simple masked input loop
-            curses.noecho()
-            pwd_input = []
-            while True:
-                ch = stdscr.getch()
-                if ch in [10, 13]: # Enter
-                    break
-                elif ch in [8, 127, curses.KEY_BACKSPACE]: # Backspace
-                    if pwd_input:
-                        pwd_input.pop()
-                        y, x = stdscr.getyx()
-                        stdscr.move(y, x - 1)
-                        stdscr.delch()
-                elif 32 <= ch <= 126:
-                    pwd_input.append(chr(ch))
-                    stdscr.addch("*")
-            
-            password = "".join(pwd_input)
-            row += 1 # Move past password line for next attempt error or success
-            stdscr.addstr(row, 0, "Verifying...", NORMAL_TEXT_COLOR)
-            stdscr.refresh()
-            row += 1
+            time.sleep(2)
+            return
+
+        stdscr.addstr(row, 0, f"Error: {e}. Try again ({attempts}/{max_attempts})", RED_TEXT_COLOR)
+        row += 1
+        stdscr.addstr(row, 0, "Enter vault password: ")
+        stdscr.refresh()
+        
+        # Secure password input in curses
+        curses.noecho()
+        pwd_input = []
+        while True:
+            ch = stdscr.getch()
+            if ch in [10, 13]: # Enter
+                break
+            elif ch in [8, 127, curses.KEY_BACKSPACE]: # Backspace
+                if pwd_input:
+                    pwd_input.pop()
+                    y, x = stdscr.getyx()
+                    stdscr.move(y, x - 1)
+                    stdscr.delch()
+            elif 32 <= ch <= 126:
+                pwd_input.append(chr(ch))
+                stdscr.addch("*")
+        
+        password = "".join(pwd_input)
+        row += 1 # Move past password line for next attempt error or success
+        if vault_set is not None:
+            vault_set.poll() # Collect the attempts that already failed, then retry them
+            vault_set.start(password, extra_vault_paths)
 
     try:
         # Save the successfully opened vault path to config
@@ -126,25 +247,33 @@ def cli_main(stdscr, args, password):
                 break
         stdscr.nodelay(False)
 
-        group_names = {group.uuid: group.name for group in vault_data.db.groups}
-        otps = get_otps(vault_data)
+        # Keys are recorded or replayed from here on, after the password
+        if session is not None:
+            stdscr = session.attach(stdscr)
+
+        unlock_summary = format_unlock_timings(timings) if timings is not None else "Unencrypted export: opened without a password"
+        if latency is not None:
+            latency.context["entries"] = len(vault_data.db.entries)
+        if vault_set is not None:
+            vault_set.add(vault_path, vault_data)
+            vault_data, group_names, otps = vault_set.vault, vault_set.group_names, vault_set.otps
+            unlock_summary += f" | {vault_set.pending()} more vault(s) loading"
+        else:
+            group_names = {group.uuid: group.name for group in vault_data.db.groups}
+            otps = get_otps(vault_data)
+
+        # Built once: the list, search and reveal screens all read their rows from it
+        entry_table = EntryTable(vault_data.db.entries, group_names, vault_set.sources if vault_set is not None else None)
 
         # Handle direct UUID display via CLI argument
         if args.uuid:
-            entry_to_reveal = next((entry for entry in vault_data.db.entries if entry.uuid == args.uuid), None)
+            entry_to_reveal = entry_table.find(args.uuid)
             if entry_to_reveal:
-                # Create a display_list containing only the selected entry for run_reveal_mode compatibility
-                initial_display_list = [{
-                    "index": 0, # Dummy index for single entry
-                    "name": entry_to_reveal.name,
-                    "issuer": entry_to_reveal.issuer if entry_to_reveal.issuer else "",
-                    "groups": ", ".join(group_names.get(g, g) for g in entry_to_reveal.groups) if entry_to_reveal.groups else "",
-                    "note": entry_to_reveal.note if entry_to_reveal.note else "",
-                    "uuid": entry_to_reveal.uuid
-                }]
                 # Call reveal mode directly.
-                run_reveal_mode(stdscr, initial_display_list[0], otps, set(), get_ttn, config, max_rows, max_cols, curses_colors_enabled, initial_display_list, vault_data, colors, PYPERCLIP_AVAILABLE)
-                if not args.group: # If no group filter, then exit after showing single OTP
+                if usage is not None:
+                    usage.record(entry_to_reveal["uuid"])
+                _, running, _ = run_reveal_mode(stdscr, entry_to_reveal, otps, set(), config, max_rows, max_cols, curses_colors_enabled, [entry_to_reveal], vault_data, colors, clipboard, usage=usage)
+                if not running or not args.group: # If no group filter, then exit after showing single OTP
                     return
             else:
                 stdscr.addstr(row, 0, f"Error: No entry found with UUID {args.uuid}.", RED_TEXT_COLOR)
@@ -152,29 +281,28 @@ def cli_main(stdscr, args, password):
                 time.sleep(2)
                 return
 
-        # Main application loop: Enter search mode
+        # Main application loop: Enter search mode, where the last visit left off
+        search_session = SearchSession.from_config(entry_table, args.group, config)
         while True:
-            selected_otp_uuid = run_search_mode(
-                stdscr, vault_data, group_names, args, colors, curses_colors_enabled, otps, PYPERCLIP_AVAILABLE
+            selected_key = run_search_mode(
+                stdscr, vault_data, group_names, args, colors, curses_colors_enabled, otps, clipboard,
+                config, unlock_summary, vault_set, latency, usage, search_session
             )
+            unlock_summary = "" # Only shown on the first screen
 
             # If an OTP was selected in search mode, enter reveal mode
-            if selected_otp_uuid:
-                entry_to_reveal = next((entry for entry in vault_data.db.entries if entry.uuid == selected_otp_uuid), None)
+            if selected_key:
+                entry_to_reveal = entry_table.row(selected_key)
                 if entry_to_reveal:
-                    # Construct a minimal display_list for consistency with run_reveal_mode's expectation
-                    display_list_for_reveal = [{
-                        "index": 0, # Dummy index
-                        "name": entry_to_reveal.name,
-                        "issuer": entry_to_reveal.issuer if entry_to_reveal.issuer else "",
-                        "groups": ", ".join(group_names.get(g, g) for g in entry_to_reveal.groups) if entry_to_reveal.groups else "",
-                        "note": entry_to_reveal.note if entry_to_reveal.note else "",
-                        "uuid": entry_to_reveal.uuid
-                    }]
                     # Call run_reveal_mode directly
-                    run_reveal_mode(stdscr, display_list_for_reveal[0], otps, set(), get_ttn, config, max_rows, max_cols, curses_colors_enabled, display_list_for_reveal, vault_data, colors, PYPERCLIP_AVAILABLE)
+                    max_rows, max_cols = stdscr.getmaxyx()
+                    if usage is not None:
+                        usage.record(entry_to_reveal["uuid"])
+                    _, running, _ = run_reveal_mode(stdscr, entry_to_reveal, otps, set(), config, max_rows, max_cols, curses_colors_enabled, [entry_to_reveal], vault_data, colors, clipboard, usage=usage)
+                    if not running: # Ctrl+Q in reveal mode exits the application
+                        break
                 else:
-                    stdscr.addstr(max_rows - 1, 0, f"Error: Selected entry with UUID {selected_otp_uuid} not found.", RED_TEXT_COLOR)
+                    stdscr.addstr(max_rows - 1, 0, f"Error: Selected entry {selected_key} not found.", RED_TEXT_COLOR)
                     stdscr.refresh()
                     time.sleep(2)
             else:
@@ -192,26 +320,235 @@ def cli_main(stdscr, args, password):
         # but for debugging it's useful if it doesn't mess up the screen too much.
         # traceback.print_exc() 
         return
+    finally:
+        clipboard.close() # Honours a pending auto-clear
+        if usage is not None:
+            usage.close() # Lets the last save finish
+        if vault_set is not None:
+            vault_set.shutdown() # Vaults still unlocking are abandoned
+
+def read_password(prompt="Enter vault password: "):
+    """Returns AEGIS_CLI_PASSWORD, or asks for the password. Exits on Ctrl+C/Ctrl+D."""
+    password = os.getenv("AEGIS_CLI_PASSWORD")
+    if not password:
+        try:
+            with tracing.span("password_prompt"):
+                password = getpass.getpass(prompt)
+        except (KeyboardInterrupt, EOFError):
+            print("\nExiting.")
+            sys.exit(0)
+    return password
+
+def open_vault_headless(args):
+    """Finds, parses and unlocks the vault for a subcommand. Prints the error and exits on failure."""
+    prepared, encrypted = start_prepare_vault(args, warm_up_tui=False)
+    password = read_password() if vault_needs_password(encrypted) else None
+
+    try:
+        config, vault_path, vault_enc = prepared.result()
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Error reading vault: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not vault_path:
+        print("Error: No vault file found.", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        return unlock_vault(vault_enc, password)
+    except VaultFormatError as e:
+        print(f"Error reading vault: {e}", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Error decrypting vault: {e}", file=sys.stderr)
+        sys.exit(1)
+
+def code_main(argv):
+    """
+    `aegis-cli code <uuid|query>`: prints the current code of one entry and exits.
+    Never touches curses, the clipboard or the config file, so it works without a TTY.
+    """
+    parser = argparse.ArgumentParser(description="Print the current code of one entry and exit.", prog="aegis-cli code")
+    parser.add_argument("query", help="Entry UUID, or text matched against the issuer and name.")
+    parser.add_argument("vault_path", nargs="?", help="Path to the Aegis vault file. If not provided, the last opened or latest vault is used.", default=None)
+    parser.add_argument("-d", "--vault-dir", help="Directory to search for vault files. Defaults to current directory.", default=".")
+    parser.add_argument("-r", "--remaining", action="store_true", help="Also print the seconds until the code changes.")
+    parser.add_argument("--json", action="store_true", help="Print the entry, code and remaining seconds as JSON.")
+    parser.add_argument("--trace", metavar="FILE", help="Write a Chrome/Perfetto trace of the phases to FILE.")
+    args = parser.parse_args(argv)
+    if args.trace:
+        tracing.enable(args.trace)
+
+    vault_data = open_vault_headless(args)
+
+    matches = find_entries(vault_data, args.query)
+    if not matches:
+        print(f"Error: No entry matches {args.query!r}.", file=sys.stderr)
+        sys.exit(1)
+    if len(matches) > 1:
+        print(f"Error: {len(matches)} entries match {args.query!r}, use one of their UUIDs:", file=sys.stderr)
+        for entry in matches:
+            label = f"{entry.issuer} - {entry.name}" if entry.issuer else entry.name
+            print(f"  {entry.uuid}  {label}", file=sys.stderr)
+        sys.exit(1)
+
+    entry = matches[0]
+    try:
+        otp = get_otp(entry)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    now = time.time()
+    code = otp.string_at(now)
+    period = otp.period() or 0
+    remaining = int(period - (now % period)) if period else None # Counter based codes never expire
+
+    if args.json:
+        import json
+        print(json.dumps({
+            "uuid": entry.uuid, "issuer": entry.issuer, "name": entry.name,
+            "code": code, "remaining": remaining, "period": period or None
+        }))
+    elif args.remaining and remaining is not None:
+        print(f"{code} {remaining}")
+    else:
+        print(code)
+
+def export_codes_main(argv):
+    """
+    `aegis-cli export-codes`: streams the current code of every matching entry as
+    JSON Lines or CSV. All codes come from one time snapshot and each record is
+    written as soon as it is computed.
+    """
+    parser = argparse.ArgumentParser(description="Print the current codes of all entries as JSON Lines or CSV.", prog="aegis-cli export-codes")
+    parser.add_argument("vault_path", nargs="?", help="Path to the Aegis vault file. If not provided, the last opened or latest vault is used.", default=None)
+    parser.add_argument("-d", "--vault-dir", help="Directory to search for vault files. Defaults to current directory.", default=".")
+    parser.add_argument("-g", "--group", help="Only export entries in this group.")
+    parser.add_argument("-q", "--query", help="Only export entries matching this UUID or issuer/name query.")
+    parser.add_argument("-f", "--format", choices=("jsonl", "csv"), default="jsonl", help="Output format (default: jsonl).")
+    parser.add_argument("-o", "--output", help="Write to this file instead of standard output.")
+    parser.add_argument("--trace", metavar="FILE", help="Write a Chrome/Perfetto trace of the phases to FILE.")
+    args = parser.parse_args(argv)
+    if args.trace:
+        tracing.enable(args.trace)
+
+    vault_data = open_vault_headless(args)
+    entries = find_entries(vault_data, args.query) if args.query else vault_data.db.entries
+    now = time.time() # One snapshot for every code
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "csv":
+            import csv
+            writer = csv.writer(out)
+            writer.writerow(CODE_RECORD_FIELDS)
+            for record in iter_code_records(vault_data, entries, now, args.group):
+                writer.writerow([", ".join(record[field]) if field == "groups" else record[field] for field in CODE_RECORD_FIELDS])
+        else:
+            import json
+            for record in iter_code_records(vault_data, entries, now, args.group):
+                out.write(json.dumps(record) + "\n")
+    except BrokenPipeError:
+        # The reader (e.g. `head`) went away; stop quietly without a flush error at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+def report_latency(latency, args):
+    """Prints the latency histogram of the session, and saves the samples with --latency-report."""
+    print("\n".join(latency.histogram_lines()), file=sys.stderr)
+    if args.latency_report:
+        import json
+        with open(args.latency_report, "w") as f:
+            json.dump(latency.report(), f, indent=2)
 
 def main():
-    parser = argparse.ArgumentParser(description="Aegis Authenticator CLI in Python.", prog="aegis-cli")
-    parser.add_argument("vault_path", nargs="?", help="Path to the Aegis vault file. If not provided, attempts to find the latest in default locations.", default=None)
+    # Subcommands are dispatched before the main parser, whose first positional is the vault path
+    if sys.argv[1:2] == ["code"]:
+        code_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["export-codes"]:
+        export_codes_main(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(description="Aegis Authenticator CLI in Python.", prog="aegis-cli",
+                                     epilog="Run `aegis-cli code --help` or `aegis-cli export-codes --help` to print codes without the TUI.")
+    parser.add_argument("vault_path", nargs="*", help="Aegis vault files, or directories of them, to open together. If not provided, attempts to find the latest in default locations.", default=None)
     parser.add_argument("-d", "--vault-dir", help="Directory to search for vault files. Defaults to current directory.", default=".")
     parser.add_argument("-u", "--uuid", help="Display OTP for a specific entry UUID.")
     parser.add_argument("-g", "--group", help="Filter OTP entries by a specific group name.")
     parser.add_argument("--no-color", action="store_true", help="Disable colored output.")
+    parser.add_argument("--startup-profile", action="store_true", help="Print an import-time breakdown of startup and exit.")
+    parser.add_argument("--mem-report", action="store_true", help="Print where memory goes while the vault is loaded and first shown, per phase and subsystem, and exit.")
+    parser.add_argument("--trace", metavar="FILE", help="Write a Chrome/Perfetto trace of startup phases and keystroke-to-refresh cycles to FILE.")
+    parser.add_argument("--latency-hud", action="store_true", help="Show keystroke-to-refresh latency in the list view and print a histogram on exit.")
+    parser.add_argument("--latency-report", metavar="FILE", help="With --latency-hud, also save the latency samples to FILE as JSON.")
+    session_group = parser.add_mutually_exclusive_group()
+    session_group.add_argument("--record", metavar="FILE", help="Record the keys pressed after unlocking, with their timing, to FILE (no password or codes are stored).")
+    session_group.add_argument("--replay", metavar="FILE", help="Replay keys recorded with --record, then print frames, time, per-key latency and CPU time.")
+    parser.add_argument("--replay-realtime", action="store_true", help="With --replay, keep the recorded pauses instead of replaying as fast as possible.")
     
     args = parser.parse_args()
+    if args.trace:
+        tracing.enable(args.trace)
 
-    password = os.getenv("AEGIS_CLI_PASSWORD")
-    if not password:
+    # The first vault goes through the usual path; any others are merged in once unlocked
+    vault_paths = expand_vault_paths(args.vault_path or [])
+    args.vault_path = vault_paths[0] if vault_paths else None
+    args.extra_vault_paths = vault_paths[1:]
+
+    if args.startup_profile:
+        from startup_profile import print_startup_profile
+        print_startup_profile()
+        return
+
+    if args.mem_report:
+        from mem_report import print_memory_report
+        vault_path = resolve_vault_path(args, load_config())
+        if not vault_path:
+            print("Error: No vault file found.", file=sys.stderr)
+            sys.exit(1)
         try:
-            password = getpass.getpass("Enter vault password: ")
-        except (KeyboardInterrupt, EOFError):
-            print("\nExiting.")
-            sys.exit(0)
+            print_memory_report(vault_path, read_password) # Only asked for an encrypted vault
+        except ValueError as e:
+            print(f"Error decrypting vault: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    # Find, read and parse the vault while the password is being typed
+    prepared, encrypted = start_prepare_vault(args)
+
+    # Further vaults may be encrypted even when the first is a plaintext export
+    password = None
+    if args.extra_vault_paths or vault_needs_password(encrypted):
+        password = read_password()
+
+    latency = None
+    if args.latency_hud or args.latency_report:
+        from latency_stats import LatencyStats
+        latency = LatencyStats()
+
+    session = None
+    if args.record or args.replay:
+        from session_record import InputSession
+        try:
+            session = InputSession.from_args(args)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error reading session recording: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    import curses
+    try:
+        curses.wrapper(cli_main, args, password, prepared, latency, session)
+    finally:
+        if session is not None:
+            session.close()
 
-    curses.wrapper(cli_main, args, password)
+    if latency is not None:
+        report_latency(latency, args)
+    if session is not None:
+        print("\n".join(session.report_lines()), file=sys.stderr)
 
 if __name__ == "__main__":
     main()
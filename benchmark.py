@@ -0,0 +1,253 @@
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import time
+
+from startup_profile import PACKAGE_DIR, STARTUP_PATHS, measure_imports, parse_importtime, total_import_us
+
+# --- Startup import budget ---
+DEFAULT_STARTUP_BUDGET_MS = {"cli": 120.0, "unlock": 160.0}
+# Packages that must stay deferred: importing aegis_main must not load them
+DEFERRED_PACKAGES = ("curses", "cryptography", "pyperclip", "orjson", "search_mode", "tui_ui", "tui_display")
+
+def bench_startup(args) -> bool:
+    """Fails when importing a headless path takes longer than its budget (best of N runs)."""
+    ok = True
+    for path in args.paths or ("cli", "unlock"):
+        if path not in STARTUP_PATHS:
+            print(f"Unknown startup path: {path}", file=sys.stderr)
+            return False
+        budget_ms = args.budget_ms if args.budget_ms is not None else DEFAULT_STARTUP_BUDGET_MS.get(path, 200.0)
+        runs = [measure_imports(STARTUP_PATHS[path]) for _ in range(args.runs)]
+        best_ms = min(total_import_us(timings) for timings in runs) / 1000
+        status = "ok" if best_ms <= budget_ms else "OVER BUDGET"
+        print(f"startup[{path}]: {best_ms:.1f} ms (budget {budget_ms:.0f} ms) {status}")
+        ok = ok and best_ms <= budget_ms
+
+        if path == "cli":
+            loaded = {name.split(".")[0] for name, _, _, _ in runs[0]}
+            eager = sorted(loaded.intersection(DEFERRED_PACKAGES))
+            if eager:
+                print(f"startup[cli]: imported eagerly: {', '.join(eager)}")
+                ok = False
+    return ok
+
+# --- Headless `code` subcommand ---
+DEFAULT_CODE_BUDGET_MS = 400.0
+DEFAULT_CODE_VAULT = "test_vault.json"
+DEFAULT_CODE_PASSWORD = "testvault123!" # Password of the generated test vault
+# The headless path must never load these
+CODE_FORBIDDEN_PACKAGES = ("curses", "_curses", "pyotp", "pyperclip", "search_mode", "tui_ui", "tui_display")
+
+def bench_code(args) -> bool:
+    """Fails when `aegis_main.py code` takes longer than its budget end to end (best of N runs)."""
+    vault = args.vault or os.path.join(PACKAGE_DIR, DEFAULT_CODE_VAULT)
+    query = args.query
+    env = dict(os.environ, AEGIS_CLI_PASSWORD=args.password or os.getenv("AEGIS_CLI_PASSWORD") or DEFAULT_CODE_PASSWORD)
+    if query is None:
+        # Any entry will do; resolve the first UUID with the same code path the CLI uses
+        from aegis_core import prepare_vault_file, unlock_vault
+        query = unlock_vault(prepare_vault_file(vault), env["AEGIS_CLI_PASSWORD"]).db.entries[0].uuid
+
+    command = [sys.executable, os.path.join(PACKAGE_DIR, "aegis_main.py"), "code", query, vault]
+    runs = []
+    for _ in range(args.runs):
+        started = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True, env=env, stdin=subprocess.DEVNULL)
+        runs.append((time.perf_counter() - started) * 1000)
+        if result.returncode != 0:
+            print(f"code: failed ({result.returncode}): {result.stderr.strip()}", file=sys.stderr)
+            return False
+
+    best_ms = min(runs)
+    ok = best_ms <= args.budget_ms
+    print(f"code: {best_ms:.1f} ms end to end (budget {args.budget_ms:.0f} ms) {'ok' if ok else 'OVER BUDGET'}")
+
+    traced = subprocess.run([sys.executable, "-X", "importtime"] + command[1:], capture_output=True, text=True, env=env, stdin=subprocess.DEVNULL)
+    loaded = {name.split(".")[0] for name, _, _, _ in parse_importtime(traced.stderr)}
+    forbidden = sorted(loaded.intersection(CODE_FORBIDDEN_PACKAGES))
+    if forbidden:
+        print(f"code: imported {', '.join(forbidden)}")
+        ok = False
+    return ok
+
+# --- Rendering on the virtual screen ---
+DEFAULT_RENDER_MIN_FPS = 200.0
+RENDER_SIZES = ((24, 80), (50, 200))
+
+def render_script(entries):
+    """A scripted session over the list: navigation, a search typed and erased, the help screen, ticking clock frames."""
+    import curses
+    keys = [None]
+    keys += [curses.KEY_DOWN] * min(entries, 40) + [curses.KEY_NPAGE, curses.KEY_END, curses.KEY_HOME]
+    keys += ["/", "goo", None, curses.KEY_BACKSPACE, curses.KEY_BACKSPACE, curses.KEY_BACKSPACE, 27]
+    keys += ["?", 27, None, "G", "A", curses.KEY_UP, curses.KEY_PPAGE]
+    return keys + [None] * 20
+
+def bench_render(args) -> bool:
+    """Drives the list view on the virtual screen with scripted keys; fails below a frame-rate floor."""
+    from argparse import Namespace
+    from aegis_core import prepare_vault_file, unlock_vault, get_otps
+    from config import load_config
+    from search_mode import run_search_mode
+    from tui_utils import init_colors
+    from virtual_screen import VirtualBackend, VirtualTerminal
+
+    vault = args.vault or os.path.join(PACKAGE_DIR, DEFAULT_CODE_VAULT)
+    password = args.password or os.getenv("AEGIS_CLI_PASSWORD") or DEFAULT_CODE_PASSWORD
+    vault_data = unlock_vault(prepare_vault_file(vault), password)
+    group_names = {group.uuid: group.name for group in vault_data.db.groups}
+    otps = get_otps(vault_data)
+    config = load_config()
+    script = render_script(len(vault_data.db.entries))
+
+    def session(stdscr):
+        colors, curses_colors_enabled = init_colors(stdscr, False)
+        return run_search_mode(stdscr, vault_data, group_names, Namespace(group=None), colors, curses_colors_enabled, otps, None, config)
+
+    ok = True
+    for rows, cols in RENDER_SIZES:
+        best = None
+        for _ in range(args.runs):
+            terminal = VirtualTerminal(rows, cols, script * args.repeat)
+            started = time.perf_counter()
+            VirtualBackend(terminal).run(session)
+            elapsed = time.perf_counter() - started
+            if best is None or elapsed < best[0]:
+                best = (elapsed, terminal)
+        elapsed, terminal = best
+        fps = terminal.frames / elapsed
+        status = "ok" if fps >= args.min_fps else "BELOW FLOOR"
+        print(f"render[{cols}x{rows}]: {terminal.frames} frames for {terminal.keys_read} keys, {fps:.0f} frames/s, "
+              f"{terminal.bytes_emitted / max(1, terminal.frames):.0f} B/frame, "
+              f"{terminal.cell_writes / max(1, terminal.frames):.0f} cells written/frame (floor {args.min_fps:.0f}/s) {status}")
+        ok = ok and fps >= args.min_fps
+    return ok
+
+# --- Memory per entry ---
+DEFAULT_MEMORY_ENTRIES = 2000
+DEFAULT_MEMORY_BUDGET_KB_PER_ENTRY = 16.0
+GENERATED_VAULT_PASSWORD = "benchmark"
+
+def bench_memory(args) -> bool:
+    """
+    Fails when the peak RSS added by loading a vault and drawing the list view,
+    per entry, exceeds the budget. Measured in a fresh interpreter without tracemalloc.
+    """
+    import json
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = args.vault
+        password = args.password or os.getenv("AEGIS_CLI_PASSWORD") or DEFAULT_CODE_PASSWORD
+        if vault is None:
+            vault, password = os.path.join(tmp, "vault.json"), GENERATED_VAULT_PASSWORD
+            subprocess.run([sys.executable, os.path.join(PACKAGE_DIR, "generate_test_vault.py"), vault, "-p", password, "-n", str(args.entries), "--icons", str(args.icons)],
+                           check=True, stdout=subprocess.DEVNULL)
+        code = "import json, mem_report, sys; print(json.dumps(mem_report.measure_memory(sys.argv[1], sys.argv[2], trace=False)))"
+        result = subprocess.run([sys.executable, "-c", code, vault, password], capture_output=True, text=True, cwd=PACKAGE_DIR)
+    if result.returncode != 0:
+        print(f"memory: failed: {result.stderr.strip()}", file=sys.stderr)
+        return False
+
+    report = json.loads(result.stdout.splitlines()[-1])
+    phases = {record["phase"]: record for record in report["phases"]}
+    if phases["start"]["peak_rss_kb"] is None:
+        print("memory: RSS is not available on this platform; skipped")
+        return True
+    entries = max(1, report["entries"])
+    peak_per_entry = (phases["first_render"]["peak_rss_kb"] - phases["start"]["peak_rss_kb"]) / entries
+    ok = peak_per_entry <= args.budget_kb
+    retained = ""
+    if phases["start"]["rss_kb"] is not None:
+        retained = f", {(phases['first_render']['rss_kb'] - phases['start']['rss_kb']) / entries:.1f} KiB/entry retained"
+    print(f"memory: {report['entries']} entries, peak RSS {peak_per_entry:.1f} KiB/entry{retained} "
+          f"(budget {args.budget_kb:.0f} KiB/entry) {'ok' if ok else 'OVER BUDGET'}")
+    return ok
+
+# --- JSON parse time per backend ---
+DEFAULT_JSON_SIZES = (10000, 100000)
+
+def bench_json(args) -> bool:
+    """
+    Times each available JSON backend on generated plaintext exports: the codec
+    decoding the whole file, and the vault's streaming parse into entries (the
+    same parser decrypted vaults go through). Best of N runs.
+    """
+    import tempfile
+    import json_codec
+    from vault import stream_vault_file
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        for entries in args.sizes:
+            vault = os.path.join(tmp, f"vault-{entries}.json")
+            subprocess.run([sys.executable, os.path.join(PACKAGE_DIR, "generate_test_vault.py"), vault, "-n", str(entries), "--plaintext"],
+                           check=True, stdout=subprocess.DEVNULL)
+            with open(vault, "rb") as f:
+                data = f.read()
+            for backend in json_codec.available_backends():
+                json_codec.use_backend(backend)
+                decode = min(timed(json_codec.loads, data) for _ in range(args.runs))
+                parse = min(timed(stream_vault_file, vault) for _ in range(args.runs))
+                parsed = len(stream_vault_file(vault).db.entries)
+                if parsed != entries:
+                    print(f"json[{backend}]: parsed {parsed} of {entries} entries", file=sys.stderr)
+                    ok = False
+                print(f"json[{backend}, {entries} entries, {len(data) / 2**20:.1f} MiB]: decode {decode * 1000:.0f} ms "
+                      f"({decode / entries * 1e6:.1f} us/entry), vault parse {parse * 1000:.0f} ms ({parse / entries * 1e6:.1f} us/entry)")
+    return ok
+
+def timed(func, *args) -> float:
+    gc.collect() # Garbage from the previous run is not charged to this one
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks and budget checks for aegis-tui.")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    startup = subparsers.add_parser("startup", help="Check python -X importtime of the headless paths against a budget.")
+    startup.add_argument("paths", nargs="*", help=f"Paths to check, from {', '.join(sorted(STARTUP_PATHS))} (default: cli unlock).")
+    startup.add_argument("--budget-ms", type=float, default=None, help="Budget for every path (defaults per path).")
+    startup.add_argument("--runs", type=int, default=3, help="Take the best of this many runs.")
+    startup.set_defaults(func=bench_startup)
+
+    code = subparsers.add_parser("code", help="Time `aegis_main.py code` end to end and check it never loads curses or the clipboard.")
+    code.add_argument("query", nargs="?", default=None, help="Entry UUID or query (default: the first entry).")
+    code.add_argument("--vault", default=None, help=f"Vault to unlock (default: {DEFAULT_CODE_VAULT}).")
+    code.add_argument("--password", default=None, help="Vault password (default: AEGIS_CLI_PASSWORD, then the test vault's).")
+    code.add_argument("--budget-ms", type=float, default=DEFAULT_CODE_BUDGET_MS, help="End-to-end budget.")
+    code.add_argument("--runs", type=int, default=5, help="Take the best of this many runs.")
+    code.set_defaults(func=bench_code)
+
+    render = subparsers.add_parser("render", help="Drive the list view on the virtual screen with scripted keys and report frames/s and bytes/frame.")
+    render.add_argument("--vault", default=None, help=f"Vault to unlock (default: {DEFAULT_CODE_VAULT}).")
+    render.add_argument("--password", default=None, help="Vault password (default: AEGIS_CLI_PASSWORD, then the test vault's).")
+    render.add_argument("--repeat", type=int, default=5, help="Play the key script this many times per run.")
+    render.add_argument("--min-fps", type=float, default=DEFAULT_RENDER_MIN_FPS, help="Frame-rate floor.")
+    render.add_argument("--runs", type=int, default=3, help="Take the best of this many runs.")
+    render.set_defaults(func=bench_render)
+
+    memory = subparsers.add_parser("memory", help="Check the peak RSS per entry of loading a large generated vault and drawing the list view.")
+    memory.add_argument("--entries", type=int, default=DEFAULT_MEMORY_ENTRIES, help="Entries in the generated vault.")
+    memory.add_argument("--icons", type=int, default=0, help="Give the generated entries this many distinct SVG icons.")
+    memory.add_argument("--vault", default=None, help="Measure this vault instead of a generated one.")
+    memory.add_argument("--password", default=None, help="Password of --vault (default: AEGIS_CLI_PASSWORD, then the test vault's).")
+    memory.add_argument("--budget-kb", type=float, default=DEFAULT_MEMORY_BUDGET_KB_PER_ENTRY, help="Peak RSS budget in KiB per entry.")
+    memory.set_defaults(func=bench_memory)
+
+    json_bench = subparsers.add_parser("json", help="Time parsing generated plaintext exports with each available JSON backend.")
+    json_bench.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_JSON_SIZES, help="Entries in each generated vault.")
+    json_bench.add_argument("--runs", type=int, default=3, help="Take the best of this many runs.")
+    json_bench.set_defaults(func=bench_json)
+
+    args = parser.parse_args()
+    if not args.func(args):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
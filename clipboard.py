@@ -0,0 +1,203 @@
+import importlib.util
+import os
+import queue
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from typing import List, Optional
+
+# Tried in order when no clipboard_tool is configured: (environment variable that must be set, command)
+AUTO_TOOLS = (
+    ("WAYLAND_DISPLAY", ["wl-copy"]),
+    ("DISPLAY", ["xclip", "-selection", "clipboard"]),
+    ("DISPLAY", ["xsel", "--clipboard", "--input"]),
+)
+# How to read the clipboard back, by copy tool, so an auto-clear leaves a newer copy alone
+PASTE_TOOLS = {
+    "wl-copy": ["wl-paste", "--no-newline"],
+    "xclip": ["xclip", "-selection", "clipboard", "-o"],
+    "xsel": ["xsel", "--clipboard", "--output"],
+    "pbcopy": ["pbpaste"],
+}
+TOOL_TIMEOUT_SECONDS = 5
+CLOSE = object() # Queued by close(): the worker's last request
+
+def detect_tool() -> Optional[List[str]]:
+    """Returns the command of the first clipboard tool that suits this session, if any."""
+    if sys.platform == "darwin" and shutil.which("pbcopy"):
+        return ["pbcopy"]
+    for env_var, command in AUTO_TOOLS:
+        if os.environ.get(env_var) and shutil.which(command[0]):
+            return command
+    return None
+
+class Clipboard:
+    """
+    Copies text to the clipboard without blocking the UI.
+
+    Copies are handed to one long-lived worker thread, which runs the configured
+    tool (e.g. `wl-copy`, `xclip -selection clipboard`) or falls back to pyperclip's
+    native backends. Only the newest pending copy is performed. Screens call poll()
+    to pick up completion messages for their status line. With clear_seconds, the
+    clipboard is emptied that long after the last copy, and on close(), unless it
+    no longer holds what was copied (something else was copied since). With a tool
+    that cannot read the clipboard back, it is emptied regardless.
+
+    The copy and auto-clear state belongs to the worker; close() reaches it through
+    the request queue and waits for the worker to finish.
+    """
+
+    def __init__(self, command: Optional[List[str]] = None, clear_seconds: float = 0):
+        self.command = command or detect_tool()
+        self.use_pyperclip = self.command is None and importlib.util.find_spec("pyperclip") is not None
+        self.available = bool(self.command) or self.use_pyperclip
+        self.clear_seconds = clear_seconds
+
+        self._requests = queue.SimpleQueue() # Texts to copy
+        self._messages = queue.SimpleQueue() # Completion messages for the status line
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._worker = None
+        # Worker only
+        self._clear_at = None # monotonic time of the pending auto-clear
+        self._copied = None # The text of the last copy, until it is cleared
+
+    @classmethod
+    def from_config(cls, config):
+        """Builds the clipboard from the clipboard_tool and clipboard_clear_seconds settings."""
+        tool = config.get("clipboard_tool")
+        command = shlex.split(tool) if tool else None
+        return cls(command, float(config.get("clipboard_clear_seconds") or 0))
+
+    def describe(self) -> str:
+        if self.command:
+            return shlex.join(self.command)
+        return "pyperclip" if self.use_pyperclip else "none"
+
+    # --- UI side ---
+
+    def copy(self, text: str) -> bool:
+        """Queues a copy. Returns False (and does nothing) when no clipboard is available."""
+        if not self.available:
+            return False
+        with self._lock:
+            self._in_flight += 1
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="clipboard", daemon=True)
+                self._worker.start()
+        self._requests.put(text)
+        return True
+
+    def busy(self) -> bool:
+        """True while a copy is queued or running; screens poll more often meanwhile."""
+        return self._in_flight > 0
+
+    def poll(self) -> Optional[str]:
+        """Returns the newest completion message since the last poll, if any."""
+        message = None
+        while True:
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                return message
+
+    def close(self):
+        """
+        Lets the worker finish and waits for it: a copy still running completes,
+        then the clipboard is cleared now if an auto-clear is pending. A copy not
+        started yet is only made without auto-clear; with it, it would be cleared
+        straight away.
+        """
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is None:
+            return
+        self._requests.put(CLOSE)
+        worker.join(3 * TOOL_TIMEOUT_SECONDS) # A copy, a read back and a clear at most
+
+    # --- Worker side ---
+
+    def _run(self):
+        while True:
+            timeout = None
+            if self._clear_at is not None:
+                timeout = max(0, self._clear_at - time.monotonic())
+            try:
+                requests = [self._requests.get(timeout=timeout)]
+            except queue.Empty:
+                if self._clear_at is not None and time.monotonic() >= self._clear_at:
+                    self._clear_pending("Clipboard cleared.")
+                continue
+
+            # Skip to the newest request; older ones would be overwritten anyway
+            while True:
+                try:
+                    requests.append(self._requests.get_nowait())
+                except queue.Empty:
+                    break
+            closing = CLOSE in requests
+            texts = [text for text in requests if text is not CLOSE]
+
+            if texts and not (closing and self.clear_seconds > 0):
+                self._copy(texts[-1])
+            with self._lock:
+                self._in_flight -= len(texts)
+            if closing:
+                if self._clear_at is not None:
+                    self._clear_pending()
+                return
+
+    def _copy(self, text: str):
+        try:
+            self._write(text)
+            self._copied = text
+        except Exception as e:
+            self._messages.put(f"Copy failed: {e}")
+        else:
+            if self.clear_seconds > 0:
+                self._clear_at = time.monotonic() + self.clear_seconds
+                self._messages.put(f"Copied to clipboard! Clears in {self.clear_seconds:g}s.")
+            else:
+                self._messages.put("Copied to clipboard!")
+
+    def _clear_pending(self, message: Optional[str] = None):
+        """Runs the pending auto-clear; message goes to the status line if it cleared."""
+        self._clear_at = None
+        try:
+            if self._clear() and message:
+                self._messages.put(message)
+        except Exception:
+            pass
+
+    def _clear(self) -> bool:
+        """Empties the clipboard if it still holds the last copy. Returns whether it did."""
+        current = self._read()
+        if current is not None and current.rstrip("\n") != self._copied.rstrip("\n"):
+            self._copied = None
+            return False # Copied over since; not ours to clear
+        self._write("")
+        self._copied = None
+        return True
+
+    def _read(self) -> Optional[str]:
+        """The clipboard's text, or None if this tool cannot read it back."""
+        if self.command:
+            paste = PASTE_TOOLS.get(os.path.basename(self.command[0]))
+            if paste is None or not shutil.which(paste[0]):
+                return None
+            result = subprocess.run(paste, check=True, timeout=TOOL_TIMEOUT_SECONDS,
+                                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            return result.stdout.decode("utf-8", "replace")
+        import pyperclip
+        return pyperclip.paste()
+
+    def _write(self, text: str):
+        if self.command:
+            subprocess.run(self.command, input=text.encode("utf-8"), check=True, timeout=TOOL_TIMEOUT_SECONDS,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            import pyperclip # Deferred: only loaded on the first copy
+            pyperclip.copy(text)
@@ -0,0 +1,46 @@
+import time
+from typing import Dict, Optional, Tuple
+
+from otp import OTP
+
+COUNTDOWN_BAR_WIDTH = 5
+
+class CodeCache:
+    """
+    Remembers the current code of each entry until its period window rolls over.
+
+    Codes are computed on demand, so the cost of a refresh is proportional to the
+    entries asked for (e.g. the visible rows), never to the size of the vault.
+    """
+
+    def __init__(self, otps: Dict[str, OTP]):
+        self._otps = otps
+        self._codes: Dict[str, Tuple[Optional[int], str]] = {} # uuid -> (window, code)
+
+    def get(self, uuid: str, now: Optional[float] = None) -> Optional[Tuple[str, float, int]]:
+        """Returns (code, seconds_remaining, period) for an entry, or None if it has no OTP.
+        Counter based entries have a period of 0 and never expire."""
+        otp = self._otps.get(uuid)
+        if otp is None:
+            return None
+        if now is None:
+            now = time.time()
+
+        period = otp.period() or 0
+        window = int(now // period) if period else None
+        cached = self._codes.get(uuid)
+        if cached is None or cached[0] != window:
+            cached = (window, otp.string_at(now))
+            self._codes[uuid] = cached
+        remaining = period - (now % period) if period else 0
+        return cached[1], remaining, period
+
+    def clear(self):
+        self._codes.clear()
+
+def countdown_bar(remaining: float, period: int, width: int = COUNTDOWN_BAR_WIDTH) -> str:
+    """Renders the time left in a period as a small bar, e.g. '===--'."""
+    if not period:
+        return " " * width
+    filled = min(width, max(0, int(-(-remaining * width // period)))) # Round up
+    return "=" * filled + "-" * (width - filled)
@@ -1,25 +1,34 @@
 import os
-import json
 from pathlib import Path
 
+import json_codec
+
 DEFAULT_AEGIS_VAULT_DIR = os.path.expanduser("~/.config/aegis-tui")
 CONFIG_FILE_PATH = Path(DEFAULT_AEGIS_VAULT_DIR) / "config.json"
 
 def load_config():
     if CONFIG_FILE_PATH.exists():
         try:
-            with open(CONFIG_FILE_PATH, 'r') as f:
-                config = json.load(f)
-                # Provide default values for new config keys if they don't exist
-                if "last_opened_vault" not in config: config["last_opened_vault"] = None
-                if "last_vault_dir" not in config: config["last_vault_dir"] = None
-                if "default_color_mode" not in config: config["default_color_mode"] = True # Default to color enabled
-                return config
-        except json.JSONDecodeError:
+            config = json_codec.load_file(CONFIG_FILE_PATH)
+            # Provide default values for new config keys if they don't exist
+            if "last_opened_vault" not in config: config["last_opened_vault"] = None
+            if "last_vault_dir" not in config: config["last_vault_dir"] = None
+            if "default_color_mode" not in config: config["default_color_mode"] = True # Default to color enabled
+            if "live_codes" not in config: config["live_codes"] = False # Show codes inline in the list view
+            if "live_codes_masked" not in config: config["live_codes_masked"] = False # Mask live codes until selected
+            if "dashboard_pins" not in config: config["dashboard_pins"] = [] # Keys of the entries pinned to the dashboard (uuid, or uuid@vault with several vaults)
+            if "clipboard_tool" not in config: config["clipboard_tool"] = None # Copy command, e.g. "wl-copy"; None detects one
+            if "clipboard_clear_seconds" not in config: config["clipboard_clear_seconds"] = 0 # Clear the clipboard after a copy (0: never)
+            if "usage_tracking" not in config: config["usage_tracking"] = True # Remember which entries are revealed and copied
+            if "list_order" not in config: config["list_order"] = "name" # "name", or "usage": most used first
+            return config
+        except json_codec.DecodeError:
             print(f"Warning: Could not parse config file {CONFIG_FILE_PATH}. Using default config.")
-    return {"last_opened_vault": None, "last_vault_dir": None, "default_color_mode": True}
+    return {"last_opened_vault": None, "last_vault_dir": None, "default_color_mode": True,
+            "live_codes": False, "live_codes_masked": False, "dashboard_pins": [],
+            "clipboard_tool": None, "clipboard_clear_seconds": 0,
+            "usage_tracking": True, "list_order": "name"}
 
 def save_config(config):
     CONFIG_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(CONFIG_FILE_PATH, 'w') as f:
-        json.dump(config, f, indent=4)
+    json_codec.dump_file(CONFIG_FILE_PATH, config, indent=4) # The layout config.json always had, e.g. for dotfile repos
@@ -0,0 +1,206 @@
+import curses
+import math
+import time
+from typing import Dict, List, Any
+
+from code_cache import CodeCache, countdown_bar
+import tracing
+
+MAX_PINNED = 9 # Panes are addressed by a single digit
+PANE_HEIGHT = 5 # Border, title, code, countdown, border
+PANE_MIN_WIDTH = 32
+
+def migrate_pins(entry_table, pins: List[str]) -> bool:
+    """
+    Rewrites the bare-uuid pins of earlier versions, in place, as the key of the row they
+    find, so each keeps to one vault when the same uuid is in several. Pins of entries not
+    loaded (yet) are left alone. Returns whether any changed.
+    """
+    changed = False
+    for i, pin in enumerate(pins):
+        if "@" not in pin:
+            row = entry_table.find(pin)
+            if row is not None and row["key"] != pin:
+                pins[i] = row["key"]
+                changed = True
+    return changed
+
+def pinned_rows(entry_table, pins: List[str]) -> List[Any]:
+    """The rows the pins find, in pin order, each once."""
+    rows, keys = [], set()
+    for pin in pins:
+        row = entry_table.find(pin)
+        if row is not None and row["key"] not in keys:
+            keys.add(row["key"])
+            rows.append(row)
+    return rows
+
+def _pane_geometry(max_rows: int, max_cols: int, pane_count: int) -> List[tuple]:
+    """Lays the panes out in a grid. Returns (top, left, width) per pane that fits on screen."""
+    columns = max(1, min(pane_count, max_cols // PANE_MIN_WIDTH))
+    width = max(PANE_MIN_WIDTH, max_cols // columns) if max_cols >= PANE_MIN_WIDTH else max_cols
+    width = min(width, max_cols)
+    panes = []
+    for i in range(pane_count):
+        top = 1 + (i // columns) * PANE_HEIGHT
+        left = (i % columns) * width
+        if top + PANE_HEIGHT > max_rows - 1:
+            break
+        panes.append((top, left, width))
+    return panes
+
+def _draw_pane_frame(stdscr, pane, number: int, entry: Dict[str, Any], colors: Dict[str, int]):
+    top, left, width = pane
+    stdscr.addch(top, left, curses.ACS_ULCORNER)
+    stdscr.hline(top, left + 1, curses.ACS_HLINE, width - 2)
+    stdscr.addch(top, left + width - 1, curses.ACS_URCORNER)
+    for r in range(top + 1, top + PANE_HEIGHT - 1):
+        stdscr.addch(r, left, curses.ACS_VLINE)
+        stdscr.addch(r, left + width - 1, curses.ACS_VLINE)
+    stdscr.addch(top + PANE_HEIGHT - 1, left, curses.ACS_LLCORNER)
+    stdscr.hline(top + PANE_HEIGHT - 1, left + 1, curses.ACS_HLINE, width - 2)
+    stdscr.addch(top + PANE_HEIGHT - 1, left + width - 1, curses.ACS_LRCORNER)
+
+    title = f"[{number}] {entry['issuer']} - {entry['name']}" if entry["issuer"] else f"[{number}] {entry['name']}"
+    stdscr.addstr(top + 1, left + 2, title[:width - 4].ljust(width - 4), colors["BOLD_WHITE_COLOR"])
+
+def run_dashboard_mode(stdscr, pinned_entries: List[Dict[str, Any]], otps: Dict[str, Any], colors: Dict[str, int], clipboard=None, clock=time.time, usage=None) -> tuple[str, bool]:
+    """
+    Shows the codes of several pinned entries side by side.
+
+    All panes are updated from one time snapshot per tick, codes are recomputed
+    once per period window, and only panes whose text changed are rewritten.
+    Pressing a pane's number copies its code, counted in usage if given.
+    """
+    NORMAL_TEXT_COLOR = colors["NORMAL_TEXT_COLOR"]
+    REVEAL_HIGHLIGHT_COLOR = colors["REVEAL_HIGHLIGHT_COLOR"]
+    RED_TEXT_COLOR = colors["RED_TEXT_COLOR"]
+
+    TIMEOUT_SECONDS = 60
+    WARNING_SECONDS = 10
+
+    current_mode = "dashboard"
+    running = True
+    feedback_msg = ""
+    feedback_expiry = 0
+
+    pinned_entries = pinned_entries[:MAX_PINNED]
+    code_cache = CodeCache(otps)
+
+    now = clock()
+    last_activity_time = now
+    needs_full_redraw = True
+    panes = []
+    shown = {} # pane index -> (code text, countdown text, attr) currently on screen
+    pane_codes = {} # pane index -> code that would be copied
+    shown_ctrl = None
+    key_started = None # Trace start of the keystroke being handled, until its refresh
+
+    while current_mode == "dashboard" and running:
+        remaining_idle = TIMEOUT_SECONDS - (now - last_activity_time)
+        if remaining_idle <= 0:
+            current_mode = "search"
+            break
+
+        max_rows, max_cols = stdscr.getmaxyx()
+        if needs_full_redraw:
+            stdscr.erase()
+            stdscr.addstr(0, 0, f"--- Dashboard: {len(pinned_entries)} pinned ---"[:max_cols])
+            panes = _pane_geometry(max_rows, max_cols, len(pinned_entries))
+            for i, pane in enumerate(panes):
+                _draw_pane_frame(stdscr, pane, i + 1, pinned_entries[i], colors)
+            shown = {}
+            shown_ctrl = None
+            needs_full_redraw = False
+
+        # One snapshot for every pane; each pane is rewritten only if its text changed
+        changed = False
+        next_boundary = math.floor(now) + 1
+        for i, (top, left, width) in enumerate(panes):
+            current = code_cache.get(pinned_entries[i]["key"], now)
+            if current is None:
+                code_text, ttn_text, attr = "Unavailable", "", NORMAL_TEXT_COLOR
+                pane_codes[i] = None
+            else:
+                code, remaining, period = current
+                if period:
+                    seconds_left = int(math.ceil(remaining))
+                    ttn_text = f"{countdown_bar(remaining, period, 10)} {seconds_left:>3}s"
+                    attr = RED_TEXT_COLOR if seconds_left < 10 else NORMAL_TEXT_COLOR
+                    next_boundary = min(next_boundary, now + remaining)
+                else:
+                    ttn_text, attr = "counter based", NORMAL_TEXT_COLOR
+                code_text = code
+                pane_codes[i] = code
+            if shown.get(i) != (code_text, ttn_text, attr):
+                inner = max(0, width - 4)
+                stdscr.addstr(top + 2, left + 2, code_text[:inner].ljust(inner), REVEAL_HIGHLIGHT_COLOR)
+                stdscr.addstr(top + 3, left + 2, ttn_text[:inner].ljust(inner), attr)
+                shown[i] = (code_text, ttn_text, attr)
+                changed = True
+
+        if clipboard is not None:
+            clipboard_message = clipboard.poll()
+            if clipboard_message:
+                feedback_msg = clipboard_message
+                feedback_expiry = now + 2
+
+        ctrl_msg = "1-9: Copy pane | Ctrl+Q: Exit | ESC: Return"
+        if len(panes) < len(pinned_entries):
+            ctrl_msg = f"{len(pinned_entries) - len(panes)} pane(s) hidden, enlarge the terminal | " + ctrl_msg
+        if remaining_idle <= WARNING_SECONDS:
+            ctrl_msg += f" | Timeout in {int(math.ceil(remaining_idle))}s"
+        if feedback_expiry > now:
+            ctrl_msg = feedback_msg
+        ctrl = (ctrl_msg, NORMAL_TEXT_COLOR if remaining_idle > WARNING_SECONDS else RED_TEXT_COLOR)
+        if ctrl != shown_ctrl:
+            stdscr.move(max_rows - 1, 0)
+            stdscr.clrtoeol()
+            stdscr.addstr(max_rows - 1, 0, ctrl[0][:max_cols - 1], ctrl[1])
+            shown_ctrl = ctrl
+            changed = True
+
+        if changed:
+            stdscr.refresh()
+        if key_started is not None:
+            tracing.complete("dashboard_key_to_refresh", key_started, {"key": char})
+            key_started = None
+
+        # Sleep in getch() until the next second, window boundary or expiry
+        deadlines = [next_boundary, last_activity_time + TIMEOUT_SECONDS]
+        if feedback_expiry > now:
+            deadlines.append(feedback_expiry)
+        if clipboard is not None and clipboard.busy():
+            deadlines.append(now + 0.05) # Pick up the copy's completion message promptly
+        stdscr.timeout(max(1, int(math.ceil((min(deadlines) - now) * 1000))))
+
+        char = stdscr.getch()
+        now = clock()
+        if char == curses.ERR:
+            continue
+        if tracing.enabled:
+            key_started = tracing.now_us()
+
+        last_activity_time = now
+        if char == 27: # ESC
+            current_mode = "search"
+        elif char == 17: # Ctrl+Q
+            running = False
+        elif char == curses.KEY_RESIZE:
+            needs_full_redraw = True
+        elif ord('1') <= char <= ord('9'):
+            pane_index = char - ord('1')
+            if pane_codes.get(pane_index):
+                if clipboard is not None and clipboard.available:
+                    clipboard.copy(pane_codes[pane_index]) # Completes in the background
+                    feedback_msg = f"Copying pane {pane_index + 1}..."
+                    if usage is not None:
+                        usage.record(pinned_entries[pane_index]["uuid"])
+                else:
+                    feedback_msg = "Clipboard unavailable."
+            else:
+                feedback_msg = f"No pane {pane_index + 1}."
+            feedback_expiry = now + 2
+
+    stdscr.timeout(-1)
+    return current_mode, running
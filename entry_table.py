@@ -0,0 +1,173 @@
+import sys
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# The orders the table keeps; each falls back to the name order for equal keys
+SORT_ORDERS = ("name", "issuer", "group", "favorites")
+
+class EntryRow:
+    """
+    One entry of an EntryTable, read like the dicts the screens used to build:
+    row["name"], row.get("vault", ""). Holds no strings of its own.
+    """
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: "EntryTable", index: int):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, key: str) -> str:
+        if key == "index":
+            return self.index
+        try:
+            return self.table.columns[key][self.index]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default=None):
+        column = self.table.columns.get(key)
+        return column[self.index] if column is not None else default
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.table.columns
+
+    def __repr__(self) -> str:
+        return f"EntryRow({self['key']!r}, {self['name']!r})"
+
+class EntryTable:
+    """
+    The vault's entries as the list, search and reveal screens show them, built
+    once per load: parallel columns of interned strings (issuer, name, group
+    labels joined once, note, uuid, the key rows are looked up by, and vault
+    labels with several vaults), the
+    lowercased name and issuer for search, and the order by name. The other
+    SORT_ORDERS are sorted on first use and kept. Screens share the rows
+    (EntryRow views) instead of copying entries into dicts.
+
+    The key is the entry's uuid, or with several vaults the key VaultSet.sources
+    gives it (the same uuid can be in two vaults). The table reads the entry
+    list, group names and sources by reference; sync() picks up entries appended
+    when another vault is merged in.
+    """
+
+    def __init__(self, entries: List, group_names: Dict[str, str], sources: Optional[List[Tuple[str, str]]] = None):
+        self._entries = entries
+        self._group_names = group_names
+        self._sources = sources
+        self._group_labels: Dict[tuple, str] = {} # Group uuids -> joined label, shared by entries in the same groups
+        self.columns: Dict[str, List[str]] = {"issuer": [], "name": [], "groups": [], "note": [], "uuid": [], "key": []}
+        if sources is not None:
+            self.columns["vault"] = []
+        self.name_lower: List[str] = []
+        self.issuer_lower: List[str] = []
+        self.favorite: List[bool] = []
+        self.rows: List[EntryRow] = [] # In vault order
+        self.by_name: List[EntryRow] = [] # Sorted by name (case-insensitive); stable for equal names
+        self._row_by_key: Dict[str, EntryRow] = {}
+        self._orders: Dict[str, List[EntryRow]] = {} # Sort order -> rows, other than by_name
+        self.display_widths: Dict[str, tuple] = {} # Measured by the list view once, kept across screens
+        self.sync()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[EntryRow]:
+        return iter(self.rows)
+
+    def sync(self) -> bool:
+        """Adds the entries appended to the vault since the table was built. Returns whether there were any."""
+        start = len(self.rows)
+        if start == len(self._entries):
+            return False
+        columns = self.columns
+        intern = sys.intern
+        for index in range(start, len(self._entries)):
+            entry = self._entries[index]
+            name = intern(entry.name or "")
+            issuer = intern(entry.issuer or "")
+            columns["name"].append(name)
+            columns["issuer"].append(issuer)
+            columns["groups"].append(self._group_label(entry.groups))
+            columns["note"].append(intern(entry.note or ""))
+            columns["uuid"].append(entry.uuid)
+            if self._sources is not None:
+                key, label = self._sources[index]
+                columns["vault"].append(intern(label))
+            else:
+                key = entry.uuid
+            columns["key"].append(key)
+            self.name_lower.append(intern(name.lower()))
+            self.issuer_lower.append(intern(issuer.lower()))
+            self.favorite.append(bool(entry.favorite))
+            row = EntryRow(self, index)
+            self.rows.append(row)
+            self._row_by_key[key] = row
+        names = self.name_lower
+        self.by_name = sorted(self.rows, key=lambda row: names[row.index])
+        self._orders = {}
+        return True
+
+    def _group_label(self, groups: Optional[List[str]]) -> str:
+        if not groups:
+            return ""
+        key = tuple(groups)
+        label = self._group_labels.get(key)
+        if label is None:
+            label = sys.intern(", ".join(self._group_names.get(g, g) for g in groups))
+            self._group_labels[key] = label
+        return label
+
+    def ordered(self, order: str = "name") -> List[EntryRow]:
+        """
+        The rows in one of SORT_ORDERS: by name, by issuer or by group label (entries
+        without one last), or favorites first. Sorted once; the same list is returned
+        until sync() adds entries.
+        """
+        if order == "name":
+            return self.by_name
+        rows = self._orders.get(order)
+        if rows is None:
+            if order == "issuer":
+                issuers = self.issuer_lower
+                key = lambda row: (not issuers[row.index], issuers[row.index])
+            elif order == "group":
+                labels = self.columns["groups"]
+                key = lambda row: (not labels[row.index], labels[row.index].lower())
+            elif order == "favorites":
+                favorite = self.favorite
+                key = lambda row: not favorite[row.index]
+            else:
+                raise ValueError(f"unknown sort order: {order}")
+            rows = sorted(self.by_name, key=key) # Stable: equal keys stay sorted by name
+            self._orders[order] = rows
+        return rows
+
+    def row(self, key: str) -> Optional[EntryRow]:
+        return self._row_by_key.get(key)
+
+    def find(self, ref: str) -> Optional[EntryRow]:
+        """
+        The row a saved reference names: a key, or else the first entry with its uuid. A
+        bare uuid (--uuid, pins from before keys named the vault) or a "uuid@label" key
+        from a run with other vaults falls back to that; the fallback scans the table.
+        """
+        row = self._row_by_key.get(ref)
+        if row is None:
+            try:
+                row = self.rows[self.columns["uuid"].index(ref.partition("@")[0])]
+            except ValueError:
+                return None
+        return row
+
+    def search(self, term: str = "", group: Optional[str] = None, rows: Optional[List[EntryRow]] = None) -> List[EntryRow]:
+        """
+        The rows (by name, or in the order of rows) whose lowercased name or issuer
+        contains term and, with group, whose group label contains it.
+        """
+        rows = self.by_name if rows is None else rows
+        names, issuers, labels = self.name_lower, self.issuer_lower, self.columns["groups"]
+        if group:
+            return [
+                row for row in rows
+                if group in labels[row.index] and (term in names[row.index] or term in issuers[row.index])
+            ]
+        return [row for row in rows if term in names[row.index] or term in issuers[row.index]]
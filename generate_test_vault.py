@@ -1,4 +1,5 @@
 import argparse
+import hashlib
 import json
 import os
 import uuid
@@ -6,7 +7,7 @@ import random
 import base64
 import binascii
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 # Cryptography imports
 try:
@@ -126,6 +127,7 @@ COMMON_NOTES = [
 COMMON_ALGOS = ["SHA1", "SHA256", "SHA512"]
 COMMON_DIGITS = [6, 8]
 COMMON_PERIODS = [30, 60]
+ICON_COLORS = ["#4285F4", "#24292E", "#FF9900", "#1877F2", "#00A4EF", "#5865F2", "#9146FF"]
 
 # --- Functions to construct dataclasses ---
 def create_realistic_info(is_hotp: bool = False) -> Info:
@@ -144,6 +146,16 @@ def create_realistic_info(is_hotp: bool = False) -> Info:
             period=random.choice(COMMON_PERIODS),
         )
 
+def create_icon(num_paths: int = 120) -> Tuple[str, str, str]:
+    """A random SVG icon of a few KiB, as exports carry them: (base64 payload, mime type, sha256 hash)."""
+    color = random.choice(ICON_COLORS)
+    paths = "".join(
+        f'<path fill="{color}" d="M{random.randint(0, 64)} {random.randint(0, 64)}l{random.randint(-9, 9)} {random.randint(-9, 9)}h{random.randint(1, 9)}z"/>'
+        for _ in range(num_paths)
+    )
+    svg = f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 64 64">{paths}</svg>'.encode("utf-8")
+    return base64.b64encode(svg).decode("utf-8"), "image/svg+xml", hashlib.sha256(svg).hexdigest()
+
 def create_realistic_group() -> Group:
     return Group(
         uuid=generate_random_uuid(),
@@ -151,7 +163,7 @@ def create_realistic_group() -> Group:
         note=random.choice(COMMON_NOTES)
     )
 
-def create_realistic_entry(groups_uuids: List[str]) -> Entry:
+def create_realistic_entry(groups_uuids: List[str], icons: List[Tuple[str, str, str]] = ()) -> Entry:
     issuer = random.choice(COMMON_ISSUERS)
     name = random.choice(COMMON_NAMES)
     
@@ -167,12 +179,17 @@ def create_realistic_entry(groups_uuids: List[str]) -> Entry:
         num_assigned_groups = random.randint(1, min(len(groups_uuids), 2)) # Assign to 1 or 2 groups
         assigned_groups = random.sample(groups_uuids, num_assigned_groups)
 
+    icon, icon_mime, icon_hash = random.choice(icons) if icons else ("", None, None)
+
     return Entry(
         type=entry_type,
         uuid=generate_random_uuid(),
         name=name,
         issuer=issuer,
         note=random.choice(COMMON_NOTES),
+        icon=icon,
+        icon_mime=icon_mime,
+        icon_hash=icon_hash,
         favorite=random.random() < 0.2, # 20% chance to be a favorite
         info=create_realistic_info(is_hotp=is_hotp),
         groups=assigned_groups
@@ -180,10 +197,10 @@ def create_realistic_entry(groups_uuids: List[str]) -> Entry:
 # --- End of dataclass construction functions ---
 
 # --- Encryption Logic ---
-def encrypt_vault(db_object: Db, password: str) -> VaultEncrypted:
+def encrypt_vault(db_object: Db, password: str, kdf_n: int = 16384) -> VaultEncrypted:
     # Define Scrypt and AES-GCM parameters based on Aegis's vault.py
     KDF_SALT_LENGTH = 16 # Aegis uses 16 bytes for salt in vault.py find_master_key
-    KDF_N = 16384
+    KDF_N = kdf_n
     KDF_R = 8
     KDF_P = 1
     KEY_LENGTH = 32 # 256-bit key
@@ -262,10 +279,15 @@ def encrypt_vault(db_object: Db, password: str) -> VaultEncrypted:
 def main():
     parser = argparse.ArgumentParser(description="Generate a test Aegis vault file.")
     parser.add_argument("output_path", help="Path to save the generated vault file (e.g., test_vault.json).")
-    parser.add_argument("-p", "--password", required=True, help="Password for the new vault.")
+    parser.add_argument("-p", "--password", help="Password for the new vault (required unless --plaintext).")
     parser.add_argument("-n", "--num-entries", type=int, default=25, help="Number of random OTP entries to generate.")
+    parser.add_argument("--icons", type=int, default=0, help="Give every entry one of this many distinct SVG icons (default: no icons).")
+    parser.add_argument("--plaintext", action="store_true", help="Write an unencrypted export, which opens without a password (fast CI fixtures).")
+    parser.add_argument("--kdf-n", type=int, default=16384, help="scrypt cost N of the password slot (default: 16384); lower it for fast test fixtures.")
 
     args = parser.parse_args()
+    if not args.plaintext and not args.password:
+        parser.error("a password is required unless --plaintext is given")
 
     print(f"Generating a test vault with {args.num_entries} entries at {args.output_path}...")
 
@@ -275,7 +297,8 @@ def main():
     group_uuids = [g.uuid for g in groups]
 
     # Generate entries
-    entries = [create_realistic_entry(group_uuids) for _ in range(args.num_entries)]
+    icons = [create_icon() for _ in range(args.icons)]
+    entries = [create_realistic_entry(group_uuids, icons) for _ in range(args.num_entries)]
 
     # Create Db object
     db = Db(
@@ -284,12 +307,15 @@ def main():
         groups=groups
     )
 
-    # Encrypt the vault
-    vault_encrypted = encrypt_vault(db, args.password)
+    if args.plaintext:
+        # The layout of an unencrypted Aegis export: no slots, the db as an object
+        vault = {"version": 1, "header": {"slots": None, "params": None}, "db": db}
+    else:
+        vault = encrypt_vault(db, args.password, args.kdf_n)
 
     # Serialize and save to file
     with open(args.output_path, 'w') as f:
-        json.dump(vault_encrypted, f, default=lambda o: o.__dict__, indent=4)
+        json.dump(vault, f, default=lambda o: o.__dict__, indent=4)
 
     print(f"Successfully generated test vault at {args.output_path}")
 
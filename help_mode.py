@@ -18,12 +18,20 @@ def run_help_mode(stdscr, colors):
         ("Search / Navigation Mode", ""),
         ("  j / Down", "Move Selection Down"),
         ("  k / Up", "Move Selection Up"),
+        ("  PgUp / PgDn", "Move a Page Up / Down"),
+        ("  Home / End", "Jump to First / Last Entry"),
+        ("  Shift+Letter", "Jump to Next Entry Starting With"),
+        ("  Mouse Wheel", "Scroll the List"),
         ("  /", "Enter Search Mode"),
         ("  Esc", "Clear Search / Filter"),
         ("  l / Enter", "Reveal Selected OTP"),
         ("  h", "Clear Search (if active)"),
         ("  Ctrl+C", "Copy Selected OTP (if available)"),
         ("  Ctrl+G", "Toggle Group Selection Mode"),
+        ("  Ctrl+T", "Toggle Live Codes in the List"),
+        ("  o", "Next Sort: Name/Issuer/Group/Fav./Use"),
+        ("  p", "Pin / Unpin Entry on the Dashboard"),
+        ("  d", "Open the Dashboard"),
         ("", ""),
         ("Search Input Mode", ""),
         ("  Type...", "Filter Entries"),
@@ -36,9 +44,13 @@ def run_help_mode(stdscr, colors):
         ("  Enter", "Select Group"),
         ("  Esc", "Cancel Group Selection"),
         ("", ""),
+        ("Dashboard", ""),
+        ("  1-9", "Copy the Code of that Pane"),
+        ("  Esc", "Return to Search"),
+        ("", ""),
         ("Reveal Mode", ""),
         ("  Esc", "Return to Search"),
-        ("  Ctrl+C", "Copy Revealed OTP"),
+        ("  Enter, Ctrl+C", "Copy Revealed OTP"),
         ("  Ctrl+Q", "Exit Application")
     ]
 
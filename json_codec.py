@@ -0,0 +1,61 @@
+import json
+import os
+from typing import Any, List, Union
+
+# The JSON codec for the vault file, the decrypted vault and the config. orjson,
+# when installed, parses several times faster than the stdlib json module, which
+# stays the fallback. Both read bytes directly, so nothing is decoded to text first.
+# AEGIS_JSON_BACKEND=json forces the stdlib.
+
+BACKENDS = ("orjson", "json")
+
+# Raised by both backends: orjson.JSONDecodeError is a subclass
+DecodeError = json.JSONDecodeError
+
+_orjson = None # Imported on first use: it pulls in uuid, zoneinfo and more
+_backend = None
+
+def available_backends() -> List[str]:
+    global _orjson
+    if _orjson is None:
+        try:
+            import orjson
+        except ImportError:
+            return ["json"]
+        _orjson = orjson
+    return list(BACKENDS)
+
+def backend() -> str:
+    """The backend in use: AEGIS_JSON_BACKEND if it is available, otherwise the fastest one."""
+    global _backend
+    if _backend is None:
+        available = available_backends()
+        wanted = os.environ.get("AEGIS_JSON_BACKEND")
+        _backend = wanted if wanted in available else available[0]
+    return _backend
+
+def use_backend(name: str):
+    """Switches the backend, e.g. to compare them. Raises ValueError if it is not installed."""
+    global _backend
+    if name not in available_backends():
+        raise ValueError(f"JSON backend not available: {name}")
+    _backend = name
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    if backend() == "orjson":
+        return _orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj: Any, indent: int = 0) -> bytes:
+    """UTF-8 JSON, indented by indent spaces. orjson only indents by two: other widths use the stdlib."""
+    if backend() == "orjson" and indent in (0, 2):
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=indent or None, ensure_ascii=False).encode("utf-8")
+
+def load_file(path: Union[str, os.PathLike]) -> Any:
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+def dump_file(path: Union[str, os.PathLike], obj: Any, indent: int = 0):
+    with open(path, "wb") as f:
+        f.write(dumps(obj, indent))
@@ -0,0 +1,119 @@
+import math
+import os
+import time
+from typing import Dict, List, Optional
+
+# Histogram buckets in milliseconds: < 1, 1-2, 2-4, ... doubling up to the last bound
+HISTOGRAM_BOUNDS_MS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+HISTOGRAM_BAR_WIDTH = 40
+
+def bytes_written() -> Optional[int]:
+    """Bytes this process has written so far (Linux /proc/self/io), or None where unavailable."""
+    try:
+        with open("/proc/self/io", "rb") as f:
+            for line in f:
+                if line.startswith(b"wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def percentiles(values: List[float], ps=(50, 95, 99)) -> List[float]:
+    """Nearest-rank percentiles of values (each p in 0-100), sorting once."""
+    if not values:
+        return [0.0 for _ in ps]
+    ordered = sorted(values)
+    return [ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)] for p in ps]
+
+class LatencyStats:
+    """
+    Keystroke-to-refresh latency of the list view, with the filter and render time
+    and the bytes written to the terminal per keystroke.
+
+    A cycle runs from begin() (key received) to end() (screen refreshed); filter
+    and render time measured in between are added to it. The HUD shows the last
+    cycle and running percentiles; histogram_lines() summarises the session.
+    """
+
+    METRICS = ("key", "filter", "render", "bytes")
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {metric: [] for metric in self.METRICS}
+        self.context: Dict[str, object] = session_context() # Filled in further by the caller, e.g. vault size
+        self._started = None
+        self._bytes_start = None
+        self._cycle = {"filter": 0.0, "render": 0.0}
+
+    def begin(self):
+        self._started = time.perf_counter()
+        self._bytes_start = bytes_written()
+        self._cycle = {"filter": 0.0, "render": 0.0}
+
+    def add(self, metric: str, started: float):
+        """Adds the time since started (a perf_counter() value) to the current cycle."""
+        if self._started is not None:
+            self._cycle[metric] += time.perf_counter() - started
+
+    def end(self):
+        if self._started is None:
+            return
+        self.samples["key"].append((time.perf_counter() - self._started) * 1000)
+        self.samples["filter"].append(self._cycle["filter"] * 1000)
+        self.samples["render"].append(self._cycle["render"] * 1000)
+        written = bytes_written()
+        if written is not None and self._bytes_start is not None:
+            self.samples["bytes"].append(written - self._bytes_start)
+        self._started = None
+
+    def in_cycle(self) -> bool:
+        return self._started is not None
+
+    def hud_text(self) -> str:
+        keys = self.samples["key"]
+        if not keys:
+            return "latency: press a key"
+        p50, p95, p99 = percentiles(keys)
+        text = (
+            f"key {keys[-1]:.1f}ms p50 {p50:.1f} p95 {p95:.1f} p99 {p99:.1f} | filter {self.samples['filter'][-1]:.1f}ms "
+            f"| render {self.samples['render'][-1]:.1f}ms"
+        )
+        if self.samples["bytes"]:
+            text += f" | {int(self.samples['bytes'][-1])} B"
+        return text
+
+    def histogram_lines(self) -> List[str]:
+        """The keystroke latency histogram and per-metric percentiles, as text lines."""
+        keys = self.samples["key"]
+        context = ", ".join(f"{key}={value}" for key, value in self.context.items() if value)
+        lines = [f"Keystroke-to-refresh latency (n={len(keys)}{', ' + context if context else ''})"]
+        if not keys:
+            return lines
+        for metric, unit in (("key", "ms"), ("filter", "ms"), ("render", "ms"), ("bytes", "B")):
+            values = self.samples[metric]
+            if values:
+                p50, p95, p99 = percentiles(values)
+                lines.append(f"  {metric:<7} p50 {p50:8.1f}  p95 {p95:8.1f}  p99 {p99:8.1f}  max {max(values):8.1f} {unit}")
+
+        counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        for value in keys:
+            counts[next((i for i, bound in enumerate(HISTOGRAM_BOUNDS_MS) if value < bound), len(HISTOGRAM_BOUNDS_MS))] += 1
+        peak = max(counts)
+        labels = [f"< {HISTOGRAM_BOUNDS_MS[0]} ms"]
+        labels += [f"{low}-{high} ms" for low, high in zip(HISTOGRAM_BOUNDS_MS, HISTOGRAM_BOUNDS_MS[1:])]
+        labels.append(f">= {HISTOGRAM_BOUNDS_MS[-1]} ms")
+        for label, count in zip(labels, counts):
+            if count:
+                lines.append(f"  {label:>11} {'#' * max(1, round(count / peak * HISTOGRAM_BAR_WIDTH)):<{HISTOGRAM_BAR_WIDTH}} {count}")
+        return lines
+
+    def report(self) -> Dict[str, object]:
+        """The raw samples plus context (terminal, vault size...), for saving as JSON."""
+        return {"context": self.context, "histogram_bounds_ms": list(HISTOGRAM_BOUNDS_MS), "samples": self.samples}
+
+def session_context() -> Dict[str, object]:
+    """Describes the terminal a latency report was taken in."""
+    size = os.get_terminal_size() if os.isatty(1) else None
+    return {
+        "term": os.environ.get("TERM", ""),
+        "terminal_size": f"{size.columns}x{size.lines}" if size else None,
+    }
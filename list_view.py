@@ -0,0 +1,229 @@
+import curses
+from bisect import bisect_right
+
+from tui_utils import fit_to_width
+
+class ListViewport:
+    """
+    Selection and scroll state for a list, rendered through a virtualized pad.
+
+    Indices run from first_index to count - 1. Group selection uses
+    first_index = -1 for the static "All OTPs" row above the groups. Only the
+    visible rows plus OVERSCAN rows on each side are ever rendered, so moving,
+    paging and jumping cost the same whatever the size of the list.
+    """
+
+    OVERSCAN = 5
+
+    def __init__(self, first_index=0):
+        self.first_index = first_index
+        self.count = 0
+        self.selected = first_index
+        self.scroll_offset = 0 # Virtual row shown at the top of the viewport
+        self.page_size = 10
+
+        self._pad = None
+        self._pad_base = 0 # Virtual row held in pad line 0
+        self._painted = {} # Virtual row -> selection state it was rendered with
+        self._cells = {} # Virtual row -> text of its live cell as last written
+        self._cell_renderer = None
+        self._geometry = None
+        self._row_renderer = None
+        self._source = None
+        self._source_key = None
+        self._letter_source = None
+        self._letter_index = {}
+
+    # --- State ---
+
+    def _total(self):
+        return self.count - self.first_index
+
+    def reset(self, count, first_index=None, selected=None):
+        """Points the viewport at a new list and moves back to its top."""
+        if first_index is not None:
+            self.first_index = first_index
+        self.count = count
+        self.scroll_offset = 0
+        self.selected = self.first_index if selected is None else selected
+        self._letter_source = None # Built again on the first jump in the new list
+        self._letter_index = {}
+        self.invalidate()
+        self.clamp()
+
+    def set_count(self, count):
+        """Updates the list length, keeping the selection where possible."""
+        if count != self.count:
+            self.count = count
+            self.invalidate()
+        self.clamp()
+
+    def clamp(self):
+        if self.count <= 0 and self.first_index == 0:
+            self.selected = -1
+            self.scroll_offset = 0
+            return
+        self.selected = max(self.first_index, min(self.selected, self.count - 1))
+        self.ensure_visible()
+
+    def ensure_visible(self):
+        v_idx = self.selected - self.first_index
+        if v_idx < self.scroll_offset:
+            self.scroll_offset = v_idx
+        elif v_idx >= self.scroll_offset + self.page_size:
+            self.scroll_offset = v_idx - self.page_size + 1
+        self.scroll_offset = max(0, min(self.scroll_offset, max(0, self._total() - self.page_size)))
+
+    def set_page_size(self, page_size):
+        self.page_size = max(1, page_size)
+        self.ensure_visible()
+
+    # --- Navigation ---
+
+    def move(self, delta):
+        if self._total() <= 0:
+            return
+        self.selected = max(self.first_index, min(self.count - 1, self.selected + delta))
+        self.ensure_visible()
+
+    def page(self, direction):
+        """Moves the selection and the viewport by a full page (PgUp/PgDn)."""
+        if self._total() <= 0:
+            return
+        self.scroll_offset = max(0, min(self.scroll_offset + direction * self.page_size,
+                                        max(0, self._total() - self.page_size)))
+        self.move(direction * self.page_size)
+
+    def home(self):
+        self.move(-self._total())
+
+    def end(self):
+        self.move(self._total())
+
+    def scroll(self, delta):
+        """Scrolls the viewport (mouse wheel), dragging the selection along if it leaves the view."""
+        if self._total() <= 0:
+            return
+        self.scroll_offset = max(0, min(self.scroll_offset + delta, max(0, self._total() - self.page_size)))
+        v_idx = self.selected - self.first_index
+        v_idx = max(self.scroll_offset, min(v_idx, self.scroll_offset + self.page_size - 1))
+        self.selected = min(self.count - 1, v_idx + self.first_index)
+
+    def jump_to_letter(self, letter, display_list, key="name"):
+        """
+        Selects the next item whose name starts with letter, wrapping around the list. The
+        first letters are indexed on the first jump and kept until the list changes.
+        """
+        if self._letter_source is not display_list:
+            self._letter_source = display_list
+            self._letter_index = {}
+            for i, item in enumerate(display_list):
+                text = item[key]
+                if text:
+                    self._letter_index.setdefault(text[0].lower(), []).append(i)
+        positions = self._letter_index.get(letter.lower())
+        if not positions:
+            return False
+        pos = bisect_right(positions, self.selected)
+        self.selected = positions[pos] if pos < len(positions) else positions[0]
+        self.ensure_visible()
+        return True
+
+    # --- Rendering ---
+
+    def invalidate(self):
+        """Forces the next paint to re-render the pad from scratch."""
+        self._painted = {}
+        self._cells = {}
+
+    def paint(self, stdscr, top, left, height, width, row_renderer, source=None, source_key=None, cell_renderer=None):
+        """
+        Renders the viewport at (top, left) through the pad.
+        row_renderer(index, is_selected) returns the (text, attr) of a row. Rows
+        already in the pad are reused unless the source list or source_key changed.
+        cell_renderer(index, is_selected), if given, returns the (col, text, attr)
+        of a cell that changes over time; see refresh_cells().
+        """
+        if source is not self._source or source_key != self._source_key:
+            self._source = source
+            self._source_key = source_key
+            self.invalidate()
+        geometry = (top, left, height, width)
+        if geometry != self._geometry or self._pad is None:
+            self._geometry = geometry
+            pad_rows = max(1, height + 2 * self.OVERSCAN)
+            if self._pad is None:
+                self._pad = curses.newpad(pad_rows, width + 1)
+            else:
+                self._pad.resize(pad_rows, width + 1)
+            self.invalidate()
+        self._row_renderer = row_renderer
+        self._cell_renderer = cell_renderer
+        self.set_page_size(height)
+        self.repaint(stdscr, update=False)
+
+    def repaint(self, stdscr, update=True):
+        """Re-renders only the rows that need it and copies the viewport to the screen."""
+        if self._pad is None or self._geometry is None:
+            return
+        top, left, height, width = self._geometry
+        pad_rows = height + 2 * self.OVERSCAN
+        total = self._total()
+
+        if not self._painted or self.scroll_offset < self._pad_base or \
+                self.scroll_offset + height > self._pad_base + pad_rows:
+            self._pad_base = max(0, self.scroll_offset - self.OVERSCAN)
+            self._pad.erase()
+            self._painted = {}
+            for v_idx in range(self._pad_base, min(total, self._pad_base + pad_rows)):
+                self._render_line(v_idx, width)
+        else:
+            for v_idx, was_selected in list(self._painted.items()):
+                if was_selected != (v_idx + self.first_index == self.selected):
+                    self._render_line(v_idx, width)
+            v_sel = self.selected - self.first_index
+            if v_sel not in self._painted and self._pad_base <= v_sel < self._pad_base + pad_rows and v_sel < total:
+                self._render_line(v_sel, width)
+        self._update_cells()
+
+        if height > 0 and width > 0:
+            self._pad.noutrefresh(self.scroll_offset - self._pad_base, 0, top, left, top + height - 1, left + width - 1)
+        if update:
+            curses.doupdate()
+
+    def refresh_cells(self, stdscr, update=True):
+        """Rewrites the live cell of each visible row, touching only the cells whose text changed."""
+        if self._pad is None or self._geometry is None:
+            return
+        if self._update_cells():
+            top, left, height, width = self._geometry
+            self._pad.noutrefresh(self.scroll_offset - self._pad_base, 0, top, left, top + height - 1, left + width - 1)
+            if update:
+                curses.doupdate()
+
+    def _update_cells(self):
+        if self._cell_renderer is None:
+            return False
+        height = self._geometry[2]
+        changed = False
+        for v_idx in range(self.scroll_offset, min(self._total(), self.scroll_offset + height)):
+            if v_idx not in self._painted:
+                continue
+            index = v_idx + self.first_index
+            col, text, attr = self._cell_renderer(index, index == self.selected)
+            if self._cells.get(v_idx) != text:
+                self._pad.addstr(v_idx - self._pad_base, col, text, attr)
+                self._cells[v_idx] = text
+                changed = True
+        return changed
+
+    def _render_line(self, v_idx, width):
+        index = v_idx + self.first_index
+        is_selected = index == self.selected
+        text, attr = self._row_renderer(index, is_selected)
+        self._pad.addstr(v_idx - self._pad_base, 0, fit_to_width(text, width), attr)
+        self._painted[v_idx] = is_selected
+        if self._cell_renderer is not None:
+            col, cell_text, cell_attr = self._cell_renderer(index, is_selected)
+            self._pad.addstr(v_idx - self._pad_base, col, cell_text, cell_attr)
+            self._cells[v_idx] = cell_text
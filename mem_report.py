@@ -0,0 +1,195 @@
+import gc
+import os
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# Subsystems, recognised by the file that allocated the memory (most specific first).
+# Strings decoded from the vault JSON (names, secrets, icons) are allocated by the
+# json module and kept alive by the entries, so they show up as "vault strings".
+SUBSYSTEM_FILES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("vault strings", ("json" + os.sep, "json_codec.py")),
+    ("entries", ("vault.py", "dataclasses.py")),
+    ("otps", ("otp.py", "aegis_core.py")),
+    ("list view", ("search_mode.py", "entry_table.py", "list_view.py", "tui_display.py", "tui_utils.py")),
+    ("crypto", ("cryptography" + os.sep,)),
+)
+TOP_FILES = 5
+# Not part of the application's own memory: module loading, and the virtual
+# screen standing in for curses' C-side screen buffers
+IGNORED_FILES = ("<frozen *>", "<unknown>", "*" + os.sep + "virtual_screen.py", tracemalloc.__file__)
+
+def rss_kb() -> Tuple[Optional[int], Optional[int]]:
+    """(current, peak) resident set size of this process in KiB, where available."""
+    current = peak = None
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    current = int(line.split()[1])
+                elif line.startswith("VmHWM:"):
+                    peak = int(line.split()[1])
+    except OSError:
+        try:
+            import resource
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if sys.platform == "darwin":
+                peak //= 1024 # Bytes there, KiB on Linux
+        except ImportError:
+            pass
+    return current, peak
+
+def subsystem_of(filename: str) -> str:
+    for subsystem, patterns in SUBSYSTEM_FILES:
+        if any(pattern in filename for pattern in patterns):
+            return subsystem
+    return "other"
+
+def attribute(snapshot, baseline) -> Dict[str, int]:
+    """Bytes allocated since baseline that are still alive in snapshot, per subsystem."""
+    by_subsystem: Dict[str, int] = {}
+    for stat in snapshot.compare_to(baseline, "filename"):
+        if stat.size_diff:
+            subsystem = subsystem_of(stat.traceback[0].filename)
+            by_subsystem[subsystem] = by_subsystem.get(subsystem, 0) + stat.size_diff
+    return by_subsystem
+
+def measure_memory(vault_path: str, password: Union[str, Callable[[], str]], rows: int = 24, cols: int = 80, trace: bool = True) -> Dict[str, Any]:
+    """
+    Loads and unlocks the vault phase by phase, then draws the first frame of the
+    list view on the virtual screen, recording traced and resident memory after
+    each phase. With trace=False only RSS is measured (tracemalloc inflates it).
+    password may be a function asking for it, only called for an encrypted vault.
+    """
+    from argparse import Namespace
+    from aegis_core import prepare_vault_file, needs_password, get_otps
+    from config import load_config
+    from search_mode import run_search_mode
+    from tui_utils import init_colors
+    from virtual_screen import ScriptEnded, VirtualBackend, VirtualTerminal
+    # Everything the phases use is imported up front, so module code is not counted
+    import cryptography.hazmat.primitives.kdf.scrypt
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    Cipher(algorithms.AES(bytes(32)), modes.GCM(bytes(12))).encryptor() # Loads the OpenSSL bindings
+
+    phases: List[Dict[str, Any]] = []
+    snapshots = {}
+    gc.collect()
+    filters = [tracemalloc.Filter(False, pattern) for pattern in IGNORED_FILES]
+    def take_snapshot():
+        return tracemalloc.take_snapshot().filter_traces(filters)
+    if trace:
+        tracemalloc.start()
+        baseline = take_snapshot()
+
+    def phase(name: str):
+        gc.collect()
+        current_kb, peak_kb = rss_kb()
+        record = {"phase": name, "rss_kb": current_kb, "peak_rss_kb": peak_kb}
+        if trace:
+            snapshots[name] = take_snapshot()
+            traced = sum(stat.size for stat in snapshots[name].statistics("filename"))
+            record.update(traced_bytes=traced, traced_peak_bytes=tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        phases.append(record)
+
+    phase("start")
+    vault_enc = prepare_vault_file(vault_path)
+    if needs_password(vault_enc):
+        vault_enc.load_db() # The whole file, not just the header
+        phase("read")
+
+        if callable(password):
+            password = password()
+        master_key = vault_enc.find_master_key(password)
+        phase("kdf")
+        vault_data = vault_enc.decrypt_vault(master_key) # Decrypted and parsed piece by piece
+    else:
+        vault_data = vault_enc # A plaintext export is parsed as it is read
+        phase("read")
+    phase("entries") # Its peak is the peak of the decrypt-and-parse pipeline
+
+    group_names = {group.uuid: group.name for group in vault_data.db.groups}
+    otps = get_otps(vault_data)
+    phase("otps")
+
+    # The list view keeps its state in locals, so measure while it waits for the first key
+    terminal = VirtualTerminal(rows, cols)
+    def first_key(delay):
+        phase("first_render")
+        raise ScriptEnded()
+    terminal.next_key = first_key
+    def session(stdscr):
+        colors, curses_colors_enabled = init_colors(stdscr, False)
+        run_search_mode(stdscr, vault_data, group_names, Namespace(group=None), colors, curses_colors_enabled, otps, None, load_config())
+    VirtualBackend(terminal).run(session)
+
+    entries = len(vault_data.db.entries)
+    report = {
+        "vault": os.path.basename(vault_path),
+        "encrypted": vault_data.encrypted,
+        "entries": entries,
+        "terminal_size": f"{cols}x{rows}",
+        "phases": phases,
+        "icon_bytes": sum(sys.getsizeof(entry.icon) for entry in vault_data.db.entries if entry.icon),
+        "icons_deferred": len(vault_data.icons) if vault_data.icons else 0,
+    }
+    if trace:
+        final = snapshots["first_render"]
+        if vault_data.encrypted:
+            # The encrypted vault (mostly its base64 text) stays loaded for the whole session
+            report["subsystems"] = {"encrypted vault": sum(attribute(snapshots["read"], baseline).values())}
+            report["subsystems"].update(attribute(final, snapshots["read"]))
+        else:
+            report["subsystems"] = attribute(final, baseline)
+        # What each phase added, per subsystem
+        report["phase_subsystems"] = {
+            name: attribute(snapshots[name], snapshots[previous])
+            for previous, name in zip(list(snapshots), list(snapshots)[1:])
+        }
+        report["top_files"] = [
+            (stat.traceback[0].filename, stat.size_diff)
+            for stat in final.compare_to(baseline, "filename")[:TOP_FILES]
+        ]
+        tracemalloc.stop()
+    return report
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+def print_memory_report(vault_path: str, password: Union[str, Callable[[], str]], file=sys.stdout):
+    """Prints where memory goes while a vault is loaded and first shown, per phase and per subsystem."""
+    size = os.get_terminal_size() if os.isatty(1) else os.terminal_size((80, 24))
+    report = measure_memory(vault_path, password, size.lines, size.columns)
+    entries = max(1, report["entries"])
+
+    kind = "" if report["encrypted"] else " (unencrypted export)"
+    print(f"Memory report: {report['vault']}{kind}, {report['entries']} entries, list view at {report['terminal_size']}", file=file)
+    print(f"\n  {'phase':<13} {'traced':>10} {'added':>10} {'peak':>10} {'RSS':>10}", file=file)
+    previous = 0
+    for record in report["phases"]:
+        traced = record["traced_bytes"]
+        rss = format_bytes(record["rss_kb"] * 1024) if record["rss_kb"] is not None else "-"
+        print(f"  {record['phase']:<13} {format_bytes(traced):>10} {format_bytes(traced - previous):>10} "
+              f"{format_bytes(record['traced_peak_bytes']):>10} {rss:>10}", file=file)
+        previous = traced
+
+    print("\n  Retained after the first render, by subsystem:", file=file)
+    for subsystem, size in sorted(report["subsystems"].items(), key=lambda item: item[1], reverse=True):
+        print(f"  {subsystem:<14} {format_bytes(size):>10}  {size / entries:8.0f} B/entry", file=file)
+    print(f"  {'  of which icons':<14} {format_bytes(report['icon_bytes']):>10}  {report['icon_bytes'] / entries:8.0f} B/entry"
+          f" ({report['icons_deferred']} left out of the parse, loaded on demand)", file=file)
+
+    phases = {record["phase"]: record for record in report["phases"]}
+    # A plaintext export is parsed while it is read
+    parsed, label = ("entries", "Decrypt-and-parse") if report["encrypted"] else ("read", "Parse")
+    transient = phases[parsed]["traced_peak_bytes"] - phases[parsed]["traced_bytes"]
+    print(f"\n  {label} working memory at its peak: {format_bytes(max(0, transient))} (freed once the entries are built)", file=file)
+
+    print("\n  Largest allocating files:", file=file)
+    for filename, size in report["top_files"]:
+        print(f"  {format_bytes(size):>10}  {filename}", file=file)
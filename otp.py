@@ -6,8 +6,6 @@ import binascii
 from typing import Union, Protocol
 import math
 
-import pyotp
-
 # Define the OTP interface
 class OTP(Protocol):
     def code(self) -> Union[int, str]:
@@ -19,6 +17,12 @@ class OTP(Protocol):
     def string(self) -> str:
         ...
 
+    def string_at(self, seconds: float) -> str:
+        ...
+
+    def period(self) -> int:
+        ...
+
 # Helper to map algorithm names to hashlib functions
 def _get_hash_algo(algo: str):
     algo = algo.upper()
@@ -46,10 +50,34 @@ def get_digest(algo: str, to_digest: bytes) -> bytes:
     return h.digest()
 
 
-class PyTOTP(pyotp.TOTP, OTP):
+def decode_secret(secret: str) -> bytes:
+    """A base32 secret as Aegis stores it: case-insensitive, padding optional."""
+    secret = secret.upper()
+    return base64.b32decode(secret + "=" * (-len(secret) % 8))
+
+def _check_truncation_algo(algo: str):
+    """Fails on the OTP's creation, not its first code, for an algorithm RFC 4226 truncation cannot use."""
+    if _get_hash_algo(algo)().digest_size < 18: # The 4 bytes read start at up to offset 15 (the last nibble)
+        raise ValueError(f"Unsupported algorithm for TOTP/HOTP: {algo}")
+
+def hotp_at(secret: bytes, algo: str, counter: int, digits: int) -> str:
+    """RFC 4226: the HMAC of the counter, dynamically truncated to digits decimal digits."""
+    secret_hash = get_hash(secret, algo, counter)
+    offset = secret_hash[-1] & 0xf
+    code = int.from_bytes(secret_hash[offset:offset + 4], "big") & 0x7fffffff
+    return str(code % 10 ** digits).zfill(digits)
+
+
+class TOTP(OTP):
     def __init__(self, secret: str, digits: int, period: int, algo: str):
-        super().__init__(secret, digits=digits, interval=period, digest=_get_hash_algo(algo))
-        self._digits = digits # Store digits for consistency with Go interface
+        _check_truncation_algo(algo)
+        self._secret = decode_secret(secret)
+        self._algo = algo
+        self._digits = digits
+        self._period = period
+
+    def at(self, for_time: float) -> str:
+        return hotp_at(self._secret, self._algo, int(for_time) // self._period, self._digits)
 
     def code(self) -> int:
         return int(self.at(time.time()))
@@ -58,15 +86,26 @@ class PyTOTP(pyotp.TOTP, OTP):
         return self._digits
 
     def string(self) -> str:
-        return self.at(time.time())
+        return self.string_at(time.time())
+
+    def string_at(self, seconds: float) -> str:
+        return self.at(seconds)
+
+    def period(self) -> int:
+        return self._period
 
 
-class PyHOTP(pyotp.HOTP, OTP):
+class HOTP(OTP):
     def __init__(self, secret: str, digits: int, counter: int, algo: str):
-        super().__init__(secret, digits=digits, digest=_get_hash_algo(algo))
+        _check_truncation_algo(algo)
+        self._secret = decode_secret(secret)
+        self._algo = algo
         self._digits = digits
         self._counter = counter # Store counter for consistency with Go interface
 
+    def at(self, count: int) -> str:
+        return hotp_at(self._secret, self._algo, count, self._digits)
+
     def code(self) -> int:
         return int(self.at(self._counter))
 
@@ -74,22 +113,26 @@ class PyHOTP(pyotp.HOTP, OTP):
         return self._digits
 
     def string(self) -> str:
-        return self.at(self._counter)
+        return self.string_at(time.time())
+
+    def string_at(self, seconds: float) -> str:
+        return self.at(self._counter) # Counter based, independent of time
+
+    def period(self) -> int:
+        return 0
 
 
 class SteamOTP(OTP):
     STEAM_ALPHA = "23456789BCDFGHJKMNPQRTVWXY"
 
-    def __init__(self, secret_b32_str: str, algo: str, digits: int, period: int, seconds: int = None):
-        self._seconds = seconds if seconds is not None else int(time.time())
+    def __init__(self, secret_b32_str: str, algo: str, digits: int, period: int):
         self._totp_secret_bytes = base64.b32decode(secret_b32_str.encode('utf-8'), casefold=True)
         self._algo = algo
         self._digits = digits
         self._period = period
-        self._numeric_code = self._generate_numeric_code()
 
-    def _generate_numeric_code(self) -> int:
-        counter = int(math.floor(self._seconds / self._period))
+    def _generate_numeric_code(self, seconds: float) -> int:
+        counter = int(math.floor(seconds / self._period))
         secret_hash = get_hash(self._totp_secret_bytes, self._algo, counter)
 
         offset = secret_hash[len(secret_hash) - 1] & 0xf
@@ -102,16 +145,24 @@ class SteamOTP(OTP):
         return otp
 
     def code(self) -> int:
-        return self._numeric_code
+        return self._generate_numeric_code(time.time())
 
     def digits(self) -> int:
         return self._digits
 
     def string(self) -> str:
+        return self.string_at(time.time())
+
+    def string_at(self, seconds: float) -> str:
+        return self._format(self._generate_numeric_code(seconds))
+
+    def period(self) -> int:
+        return self._period
+
+    def _format(self, code: int) -> str:
         steam_alphabet = list(self.STEAM_ALPHA)
         alphabet_len = len(steam_alphabet)
         
-        code = self._numeric_code
         builder = []
 
         for _ in range(self._digits):
@@ -123,17 +174,15 @@ class SteamOTP(OTP):
 
 
 class MOTP(OTP):
-    def __init__(self, secret: bytes, algo: str, digits: int, period: int, pin: str, seconds: int = None):
+    def __init__(self, secret: bytes, algo: str, digits: int, period: int, pin: str):
         self._secret = secret
         self._algo = algo
         self._digits = digits
         self._period = period
         self._pin = pin
-        self._seconds = seconds if seconds is not None else int(time.time())
-        self._code_str = self._generate_code_str()
 
-    def _generate_code_str(self) -> str:
-        time_counter = self._seconds // self._period
+    def _generate_code_str(self, seconds: float) -> str:
+        time_counter = int(seconds) // self._period
         secret_str = binascii.hexlify(self._secret).decode('utf-8')
         to_digest = str(time_counter) + secret_str + self._pin
 
@@ -142,24 +191,30 @@ class MOTP(OTP):
         return code
 
     def code(self) -> str:
-        return self._code_str
+        return self._generate_code_str(time.time())
 
     def digits(self) -> int:
         return self._digits
 
     def string(self) -> str:
-        return self._code_str[0:self._digits]
+        return self.string_at(time.time())
+
+    def string_at(self, seconds: float) -> str:
+        return self._generate_code_str(seconds)[0:self._digits]
+
+    def period(self) -> int:
+        return self._period
 
 
-def generate_totp(secret: str, algo: str, digits: int, period: int) -> PyTOTP:
-    return PyTOTP(secret, digits, period, algo)
+def generate_totp(secret: str, algo: str, digits: int, period: int) -> TOTP:
+    return TOTP(secret, digits, period, algo)
 
-def generate_hotp(secret: str, algo: str, digits: int, counter: int) -> PyHOTP:
-    # Note: The original Go HOTP was a placeholder. This uses pyotp's actual HOTP.
-    return PyHOTP(secret, digits, counter, algo)
+def generate_hotp(secret: str, algo: str, digits: int, counter: int) -> HOTP:
+    # Note: The original Go HOTP was a placeholder. This is a full RFC 4226 HOTP.
+    return HOTP(secret, digits, counter, algo)
 
-def generate_steam_otp(secret: str, algo: str, digits: int, period: int, seconds: int = None) -> SteamOTP:
-    return SteamOTP(secret, algo, digits, period, seconds)
+def generate_steam_otp(secret: str, algo: str, digits: int, period: int) -> SteamOTP:
+    return SteamOTP(secret, algo, digits, period)
 
-def generate_motp(secret: bytes, algo: str, digits: int, period: int, pin: str, seconds: int = None) -> MOTP:
-    return MOTP(secret, algo, digits, period, pin, seconds)
+def generate_motp(secret: bytes, algo: str, digits: int, period: int, pin: str) -> MOTP:
+    return MOTP(secret, algo, digits, period, pin)
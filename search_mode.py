@@ -1,16 +1,70 @@
 import curses
-try:
-    import pyperclip
-except ImportError:
-    pass
-
-from tui_display import draw_main_screen
+import time
+from code_cache import CodeCache, countdown_bar, COUNTDOWN_BAR_WIDTH
+from tui_display import draw_main_screen, draw_hud, ColumnLayout
+from list_view import ListViewport
 from help_mode import run_help_mode
+from dashboard_mode import run_dashboard_mode, migrate_pins, pinned_rows, MAX_PINNED
+from config import load_config, save_config
+from entry_table import EntryTable, SORT_ORDERS
+import tracing
+
+WHEEL_UP = curses.BUTTON4_PRESSED
+WHEEL_DOWN = getattr(curses, "BUTTON5_PRESSED", 0)
+MOUSE_WHEEL_STEP = 3
+LIVE_CODE_DIGITS = 8 # Room for the longest codes (8 digits)
+LIVE_CODE_WIDTH = LIVE_CODE_DIGITS + 1 + COUNTDOWN_BAR_WIDTH
+LIST_ORDERS = SORT_ORDERS + ("usage",) # Cycled with o; "usage" needs a UsageStore
+ORDER_MESSAGES = {
+    "name": "Sorted by name", "issuer": "Sorted by issuer", "group": "Sorted by group",
+    "favorites": "Favorites first", "usage": "Most used first",
+}
+
+class SearchSession:
+    """
+    The list view's state between visits: search term and input mode, group
+    filter, list order and live codes, the ordered and filtered lists with the
+    selection and scroll position, and the column layout. Kept by the caller for
+    the whole run, so coming back from a reveal shows the list as it was left,
+    without filtering, sorting or measuring the entries again.
+    """
+
+    def __init__(self, entry_table, group_filter=None, list_order="name", live_codes=False):
+        self.entry_table = entry_table
+        self.search_term = ""
+        self.current_mode = "search" # "search" or "group_select"
+        self.in_search_mode = False
+        self.group_selection_mode = False
+        self.current_group_filter = group_filter
+        self.list_order = list_order if list_order in LIST_ORDERS else "name"
+        self.live_codes = live_codes
+        self.all_entries = None # The entries in list_order, built on the first visit
+        self.display_list = None
+        self.filter_key = None # Inputs display_list was built from
+        self.entries_version = 0 # Bumped whenever the entries or their order change
+        self.usage_changes = 0 # UsageStore.changes when all_entries was last ordered
+        self.viewport = ListViewport() # Selection and scroll state; renders only the visible rows
+        self.layout = ColumnLayout(entry_table.display_widths) # Column widths and row strings
+
+    @classmethod
+    def from_config(cls, entry_table, group_filter, config):
+        return cls(entry_table, group_filter, config.get("list_order", "name"), bool(config.get("live_codes", False)))
 
 def run_search_mode(
-    stdscr, vault_data, group_names, args, colors, curses_colors_enabled, otps, pyperclip_available
+    stdscr, vault_data, group_names, args, colors, curses_colors_enabled, otps, clipboard,
+    config=None, status_message="", vault_set=None, latency=None, usage=None, session=None
 ):
-    """Runs the interactive search mode for OTP entries."""
+    """
+    Runs the interactive search mode for OTP entries. status_message is shown until the first key press.
+    clipboard is a Clipboard (or None); copies complete in the background and report in the status line.
+    With a VaultSet, vault_data, group_names and otps are its merged views; vaults that finish
+    unlocking while the list is open are merged in and a vault column is shown.
+    With a LatencyStats, each keystroke-to-refresh cycle is measured and shown in an overlay.
+    With a UsageStore, copies are counted, search results list the most used matches
+    first, and the whole list does too when list_order is "usage" (o cycles the orders).
+    session (a SearchSession over an EntryTable of vault_data) carries the list's state
+    from one call to the next; without one, the list starts afresh.
+    """
 
     NORMAL_TEXT_COLOR = colors["NORMAL_TEXT_COLOR"]
     HIGHLIGHT_COLOR = colors["HIGHLIGHT_COLOR"]
@@ -18,191 +72,314 @@ def run_search_mode(
     RED_TEXT_COLOR = colors["RED_TEXT_COLOR"]
     BOLD_WHITE_COLOR = colors["BOLD_WHITE_COLOR"]
 
-    # Initialize state variables
-    search_term = ""
-    current_mode = "search" # "search" or "group_select"
-    in_search_mode = False # Start in navigation mode
-    status_message = ""
-    
-    selected_row = -1 # Track the currently highlighted row for navigation (-1 for no selection)
+    if config is None:
+        config = load_config()
+    if session is None:
+        entry_table = EntryTable(vault_data.db.entries, group_names, vault_set.sources if vault_set is not None else None)
+        session = SearchSession.from_config(entry_table, args.group, config)
+    entry_table = session.entry_table
+
+    # Pick up where the last visit left off (a new session starts in navigation mode)
+    search_term = session.search_term
+    current_mode = session.current_mode
+    in_search_mode = session.in_search_mode
+    current_group_filter = session.current_group_filter
+    group_selection_mode = session.group_selection_mode
+    list_order = session.list_order if usage is not None or session.list_order != "usage" else "name"
+    viewport = session.viewport
+    layout = session.layout
+    filter_key = session.filter_key
+    entries_version = session.entries_version
+
     char = curses.ERR # Initialize char to prevent UnboundLocalError
-    previous_search_term = ""
-    current_group_filter = args.group # Use CLI group filter if provided
-    group_selection_mode = False
-    entry_to_reveal_uuid = None # Store the UUID of the selected entry
+    entry_to_reveal_key = None # Key of the selected entry (EntryTable.row)
     needs_redraw = True # Initial redraw needed
+    needs_repaint = False # Only the list rows changed (navigation)
+    key_started = None # Trace start of the keystroke being handled, until its refresh
+
+    def build_entries():
+        # One of the table's kept orders, not a copy, unless reordered by usage
+        if list_order == "usage":
+            return usage.order(entry_table.by_name) # Stable: equally used entries stay sorted by name
+        return entry_table.ordered(list_order)
 
-    # Prepare initial data based on CLI arguments (group filter)
-    all_entries = []
-    for i, entry in enumerate(vault_data.db.entries):
-        all_entries.append({
-            "index": i,
-            "name": entry.name,
-            "issuer": entry.issuer if entry.issuer else "",
-            "groups": ", ".join(group_names.get(g, g) for g in entry.groups) if entry.groups else "",
-            "note": entry.note if entry.note else "",
-            "uuid": entry.uuid
-        })
-    all_entries.sort(key=lambda x: x["name"].lower())
-
-    if current_group_filter:
-        # Apply initial group filter
-        display_list_for_selection = [entry for entry in all_entries if current_group_filter in entry["groups"]]
-    else:
-        display_list_for_selection = all_entries
-
-    # Ensure selected_row is valid for the initial display
-    if len(display_list_for_selection) > 0:
-        selected_row = 0
-    else:
-        selected_row = -1
-
-    scroll_offset = 0
-    items_per_page = 10 # Initial estimate, will be updated by draw_main_screen
+    usage_changes = usage.changes if usage is not None else 0
+    all_entries = session.all_entries
+    if all_entries is None:
+        all_entries = build_entries()
+    elif usage_changes != session.usage_changes and (list_order == "usage" or search_term):
+        # Uses recorded since the last visit (the reveal) reorder the list; the selection stays on its entry
+        if list_order == "usage":
+            all_entries = build_entries()
+        entries_version += 1
+    display_list = session.display_list if session.display_list is not None else all_entries
+    viewport.invalidate() # Whatever ran since the last visit drew over the list
+
+    # Live mode shows codes and countdowns inline, refreshed once per second for visible rows only
+    live_codes = session.live_codes
+    mask_live_codes = bool(config.get("live_codes_masked", False))
+    code_cache = CodeCache(otps)
+
+    def live_code_cell(item, is_selected):
+        result = code_cache.get(item["key"])
+        if result is None:
+            return "------".ljust(LIVE_CODE_WIDTH)
+        code, remaining, period = result
+        if mask_live_codes and not is_selected:
+            code = "*" * len(code)
+        return code.ljust(LIVE_CODE_DIGITS) + " " + countdown_bar(remaining, period)
+
+    try:
+        curses.mousemask(WHEEL_UP | WHEEL_DOWN)
+    except curses.error:
+        pass
 
     # --- Main Search Loop ---
     while True:
-        # Prepare display list based on current mode and filters
-        if current_mode == "search" and not group_selection_mode:
-            term = search_term.lower()
-            if current_group_filter:
-                display_list = [
-                    entry for entry in all_entries 
-                    if current_group_filter in entry["groups"] and 
-                    (term in entry["name"].lower() or term in entry["issuer"].lower())
-                ]
-            else:
-                display_list = [
-                    entry for entry in all_entries 
-                    if term in entry["name"].lower() or term in entry["issuer"].lower()
-                ]
-        elif group_selection_mode:
-            # In group selection mode, display available groups
-            groups_list = [{"name": group.name, "uuid": group.uuid} for group in vault_data.db.groups]
-            groups_list.sort(key=lambda x: x["name"].lower()) # Sort groups alphabetically
-
-            # Filter groups by search_term if in group selection mode
-            if search_term:
-                display_list = [group for group in groups_list if search_term.lower() in group["name"].lower()]
-            else:
-                display_list = groups_list # No search term, show all groups
+        # Rebuild the display list only when the filter inputs changed
+        if vault_set is not None and vault_set.pending():
+            merged, failed = vault_set.poll()
+            if merged:
+                entry_table.sync()
+                all_entries = build_entries()
+                entries_version += 1
+            if merged or failed:
+                loaded = len(vault_set.loaded)
+                total = len(vault_set.labels)
+                status_message = f"Loaded {', '.join(merged)} ({loaded}/{total} vaults)" if merged else ""
+                for label in failed:
+                    status_message = (status_message + " | " if status_message else "") + f"Could not unlock {label}"
+                needs_redraw = True
 
-            # Adjust selected_row for group list
-        else:
-            display_list = all_entries # Use filtered entries for display
+        if clipboard is not None:
+            clipboard_message = clipboard.poll()
+            if clipboard_message:
+                status_message = clipboard_message
+                needs_redraw = True
 
-        # If no items are in display_list, reset selected_row
-        if len(display_list) == 0:
-            if not group_selection_mode:
-                selected_row = -1
+        current_filter_key = (group_selection_mode, search_term, current_group_filter, entries_version)
+        if current_filter_key != filter_key:
+            filter_started = time.perf_counter()
+            # Another vault arriving keeps the selection; a new filter starts at the top
+            vaults_only = filter_key is not None and filter_key[:3] == current_filter_key[:3]
+            previous_key = None
+            if vaults_only and 0 <= viewport.selected < len(display_list):
+                previous_key = display_list[viewport.selected]["key"]
+            filter_key = current_filter_key
+            if current_mode == "search" and not group_selection_mode:
+                term = search_term.lower()
+                if current_group_filter or term:
+                    display_list = entry_table.search(term, current_group_filter, all_entries)
+                else:
+                    display_list = all_entries
+                if term and usage is not None and list_order != "usage":
+                    display_list = usage.order(display_list) # Ties between matches go to the most used
             else:
-                if selected_row != -1:
-                     selected_row = -1
-        else:
-            # Ensure selected_row is within bounds for the current display_list
-            selected_row = max(-1 if group_selection_mode else 0, min(selected_row, len(display_list) - 1))
+                # In group selection mode, display available groups
+                groups_list = [{"name": group.name, "uuid": group.uuid, "key": group.uuid} for group in vault_data.db.groups]
+                groups_list.sort(key=lambda x: x["name"].lower()) # Sort groups alphabetically
 
+                # Filter groups by search_term if in group selection mode
+                if search_term:
+                    display_list = [group for group in groups_list if search_term.lower() in group["name"].lower()]
+                else:
+                    display_list = groups_list # No search term, show all groups
+
+            # A new list starts at its top; "All OTPs" (-1) is the first row when selecting groups
+            selected = None
+            if previous_key is not None:
+                selected = next((i for i, item in enumerate(display_list) if item["key"] == previous_key), None)
+            viewport.reset(len(display_list), -1 if group_selection_mode else 0, selected)
+            needs_redraw = True
+            if latency is not None:
+                latency.add("filter", filter_started)
+
+        render_started = time.perf_counter()
+        rendered = needs_redraw or needs_repaint
         if needs_redraw:
             max_rows, max_cols = stdscr.getmaxyx()
-            items_per_page = draw_main_screen(
-                stdscr, max_rows, max_cols, display_list, selected_row, search_term,
-                current_mode, group_selection_mode, current_group_filter, args.group,
-                colors, curses_colors_enabled, scroll_offset,
-                in_search_mode, status_message
-            )
+            with tracing.span("draw_main_screen", rows=len(display_list)):
+                draw_main_screen(
+                    stdscr, max_rows, max_cols, display_list, viewport.selected, search_term,
+                    current_mode, group_selection_mode, current_group_filter, args.group,
+                    colors, curses_colors_enabled, viewport.scroll_offset,
+                    in_search_mode, status_message, layout, viewport,
+                    live_code_cell if live_codes else None, LIVE_CODE_WIDTH if live_codes else 6,
+                    latency.hud_text() if latency is not None and not latency.in_cycle() else "",
+                    "[unencrypted]" if not vault_data.encrypted else ""
+                )
             needs_redraw = False # Redraw completed
-            status_message = "" # Clear status message after drawing once (or keep it? Flashing is better)
-            # Actually, if we clear it here, it will be visible for one frame. We should clear it on NEXT input.
-            # But draw_main_screen is called inside the loop.
-            # Let's not clear it here. Clear it on keypress.
+            needs_repaint = False
+        elif needs_repaint:
+            with tracing.span("repaint"):
+                viewport.repaint(stdscr)
+            needs_repaint = False
+
+        if key_started is not None:
+            tracing.complete("key_to_refresh", key_started, {"key": char})
+            key_started = None
+        if latency is not None and latency.in_cycle():
+            if rendered:
+                latency.add("render", render_started)
+            latency.end()
+            draw_hud(stdscr, latency.hud_text(), colors) # Outside the measured cycle
+            stdscr.refresh()
 
         # --- Input Handling ---
+        if clipboard is not None and clipboard.busy():
+            stdscr.timeout(50) # Pick up the copy's completion message promptly
+        elif vault_set is not None and vault_set.pending():
+            stdscr.timeout(100) # Keep polling for vaults that are still unlocking
+        elif live_codes and not group_selection_mode:
+            # Wake up on the next second boundary to advance the countdowns
+            stdscr.timeout(int(1000 - (time.time() % 1) * 1000) + 1)
+        else:
+            stdscr.timeout(-1) # Block until a key arrives
         char = stdscr.getch() # Get a single character
 
         if char != curses.ERR: # Only process if a key was actually pressed
-            needs_redraw = True # Input occurred, so redraw the screen
-            status_message = "" # Clear previous status message on new input
-            
+            if tracing.enabled:
+                key_started = tracing.now_us()
+            if latency is not None:
+                latency.begin()
+            if status_message:
+                status_message = "" # Clear previous status message on new input
+                needs_redraw = True
+
             if char == curses.KEY_RESIZE:
                 # Terminal resized, re-get dimensions and force redraw
                 max_rows, max_cols = stdscr.getmaxyx()
+                needs_redraw = True
                 continue
-            
+
             # --- Global Hotkeys ---
             if char == 17: # Ctrl+Q to exit
                 return None
-            
+
             if char == ord('?'): # Help
                 run_help_mode(stdscr, colors)
                 needs_redraw = True
                 continue
-            
-            if char == 3: # Ctrl+C to copy
-                if pyperclip_available and selected_row != -1 and len(display_list) > 0:
+
+            if not in_search_mode and not group_selection_mode and char == ord('p'): # Pin/unpin for the dashboard
+                if viewport.selected != -1 and len(display_list) > 0:
+                    item = display_list[viewport.selected]
+                    pins = config.setdefault("dashboard_pins", [])
+                    migrate_pins(entry_table, pins)
+                    item_pins = [pin for pin in pins if entry_table.find(pin) is item]
+                    if item_pins:
+                        for pin in item_pins:
+                            pins.remove(pin)
+                        status_message = f"Unpinned {item['name']} ({len(pins)}/{MAX_PINNED})"
+                    elif len(pins) >= MAX_PINNED:
+                        status_message = f"Dashboard is full ({MAX_PINNED} pinned)"
+                    else:
+                        pins.append(item["key"])
+                        status_message = f"Pinned {item['name']} ({len(pins)}/{MAX_PINNED})"
                     try:
-                        # Get UUID based on current selection
-                        if group_selection_mode:
-                             pass # No copy for groups
-                        else:
-                             uuid = display_list[selected_row]["uuid"]
-                             otp = otps[uuid]
-                             pyperclip.copy(otp.string())
-                             status_message = "OTP copied to clipboard!"
-                    except Exception as e:
-                        status_message = f"Copy failed: {str(e)}"
-                elif not pyperclip_available:
-                     status_message = "Clipboard unavailable."
+                        save_config(config)
+                    except OSError as e:
+                        status_message = f"Could not save pins: {e}"
+                needs_redraw = True
                 continue
 
-            # --- Navigation (Common logic for j/k/UP/DOWN) ---
-            move_down = False
-            move_up = False
-            
-            if char == curses.KEY_DOWN:
-                move_down = True
-            elif char == curses.KEY_UP:
-                move_up = True
-            elif not in_search_mode:
-                if char == ord('j'): move_down = True
-                elif char == ord('k'): move_up = True
-            
-            if move_down:
-                if group_selection_mode:
-                     current_v_idx = selected_row + 1
-                     total_virtual_items = len(display_list) + 1
-                     if current_v_idx < total_virtual_items - 1:
-                         selected_row = current_v_idx # (v_idx + 1) - 1
-                         if selected_row + 1 >= scroll_offset + items_per_page:
-                             scroll_offset = selected_row + 1 - items_per_page + 1
+            if not in_search_mode and char == ord('d'): # Dashboard of pinned entries
+                pins = config.get("dashboard_pins", [])
+                if migrate_pins(entry_table, pins):
+                    try:
+                        save_config(config)
+                    except OSError:
+                        pass # Migrated again next time
+                pinned_entries = pinned_rows(entry_table, pins)
+                if pinned_entries:
+                    _, running = run_dashboard_mode(stdscr, pinned_entries, otps, colors, clipboard, usage=usage)
+                    if not running:
+                        return None
+                    viewport.invalidate()
                 else:
-                    if len(display_list) > 0:
-                        selected_row = min(len(display_list) - 1, selected_row + 1)
-                        if selected_row >= scroll_offset + items_per_page:
-                            scroll_offset = selected_row - items_per_page + 1
+                    status_message = "Nothing pinned. Press p on an entry to pin it."
+                needs_redraw = True
                 continue
-                
-            if move_up:
-                if group_selection_mode:
-                    current_v_idx = selected_row + 1
-                    if current_v_idx > 0:
-                        selected_row = current_v_idx - 2 # (v_idx - 1) - 1
-                        if selected_row + 1 < scroll_offset:
-                            scroll_offset = selected_row + 1
-                else:
-                    if len(display_list) > 0:
-                        selected_row = max(0, selected_row - 1)
-                        if selected_row < scroll_offset:
-                            scroll_offset = selected_row
+
+            if char == 20: # Ctrl+T toggles live codes
+                live_codes = not live_codes
+                needs_redraw = True
+                continue
+
+            if not in_search_mode and not group_selection_mode and char == ord('o'): # Next list order
+                orders = [order for order in LIST_ORDERS if order != "usage" or usage is not None]
+                list_order = orders[(orders.index(list_order) + 1) % len(orders)]
+                config["list_order"] = list_order
+                status_message = ORDER_MESSAGES[list_order]
+                all_entries = build_entries() # Kept by the table after the first time; only usage is sorted again
+                usage_changes = usage.changes if usage is not None else 0
+                entries_version += 1 # Rebuild the view, keeping the selected entry
+                try:
+                    save_config(config)
+                except OSError as e:
+                    status_message = f"Could not save the list order: {e}"
+                needs_redraw = True
+                continue
+
+            selected_row = viewport.selected
+
+            if char == 3: # Ctrl+C to copy
+                needs_redraw = True
+                if clipboard is not None and clipboard.available and selected_row != -1 and len(display_list) > 0:
+                    # Get UUID based on current selection
+                    if not group_selection_mode: # No copy for groups
+                        otp = otps.get(display_list[selected_row]["key"])
+                        if otp is None:
+                            status_message = "No code for this entry."
+                        else:
+                            clipboard.copy(otp.string()) # Completes in the background
+                            status_message = "Copying..."
+                            if usage is not None:
+                                usage.record(display_list[selected_row]["uuid"])
+                elif clipboard is None or not clipboard.available:
+                     status_message = "Clipboard unavailable."
+                continue
+
+            # --- Navigation (only the list rows are repainted) ---
+            navigated = True
+            if char == curses.KEY_DOWN or (not in_search_mode and char == ord('j')):
+                viewport.move(1)
+            elif char == curses.KEY_UP or (not in_search_mode and char == ord('k')):
+                viewport.move(-1)
+            elif char == curses.KEY_NPAGE:
+                viewport.page(1)
+            elif char == curses.KEY_PPAGE:
+                viewport.page(-1)
+            elif char == curses.KEY_HOME:
+                viewport.home()
+            elif char == curses.KEY_END:
+                viewport.end()
+            elif char == curses.KEY_MOUSE:
+                try:
+                    _, _, _, _, button_state = curses.getmouse()
+                except curses.error:
+                    button_state = 0
+                if button_state & WHEEL_UP:
+                    viewport.scroll(-MOUSE_WHEEL_STEP)
+                elif button_state & WHEEL_DOWN:
+                    viewport.scroll(MOUSE_WHEEL_STEP)
+            elif not in_search_mode and ord('A') <= char <= ord('Z'): # Shift+letter jumps by first letter
+                viewport.jump_to_letter(chr(char), display_list)
+            else:
+                navigated = False
+
+            if navigated:
+                needs_repaint = True
                 continue
 
+            needs_redraw = True # Input occurred, so redraw the screen
+
             # --- Mode Specific Handling ---
             if group_selection_mode:
                  if char == 27 or char == 7 or (not in_search_mode and char == ord('h')): # ESC/Ctrl+G/h
                     group_selection_mode = False
                     current_group_filter = None
                     search_term = ""
-                    selected_row = 0 if len(all_entries) > 0 else -1
-                    scroll_offset = 0
                     in_search_mode = False
                  elif char == ord('/') and not in_search_mode:
                     in_search_mode = True
@@ -214,9 +391,6 @@ def run_search_mode(
                         current_group_filter = selected_group["name"]
                     group_selection_mode = False
                     current_mode = "search"
-                    initial_filtered_entries = [entry for entry in all_entries if current_group_filter in entry["groups"]] if current_group_filter else all_entries
-                    selected_row = 0 if len(initial_filtered_entries) > 0 else -1
-                    scroll_offset = 0
                     search_term = ""
                     in_search_mode = False
                  elif in_search_mode:
@@ -224,10 +398,8 @@ def run_search_mode(
                      if char in [curses.KEY_BACKSPACE, 127, 8]:
                         if search_term:
                             search_term = search_term[:-1]
-                            scroll_offset = 0
                      elif 32 <= char < 127:
                         search_term += chr(char)
-                        scroll_offset = 0
                      elif char == 27: # Esc exits search mode
                         in_search_mode = False
 
@@ -240,36 +412,43 @@ def run_search_mode(
                      else:
                          search_term = ""
                          current_group_filter = None
-                         selected_row = 0 if len(all_entries) > 0 else -1
-                         scroll_offset = 0
                  elif not in_search_mode and char == ord('h'):
                      # Clear search if present
                      if search_term:
                          search_term = ""
-                         scroll_offset = 0
                  elif char == 7: # Ctrl+G
                      group_selection_mode = not group_selection_mode
                      if group_selection_mode:
-                         selected_row = -1
                          search_term = ""
-                         scroll_offset = 0
                          in_search_mode = False
                  elif char == curses.KEY_ENTER or char in [10, 13] or (not in_search_mode and char == ord('l')):
                      if selected_row != -1 and len(display_list) > 0:
-                         entry_to_reveal_uuid = display_list[selected_row]["uuid"]
+                         entry_to_reveal_key = display_list[selected_row]["key"]
                          break
                  elif in_search_mode:
                      if char in [curses.KEY_BACKSPACE, 127, 8]:
                         if search_term:
                             search_term = search_term[:-1]
-                            scroll_offset = 0
                      elif 32 <= char < 127:
                         search_term += chr(char)
-                        scroll_offset = 0
 
-        else:
-            import time
-            time.sleep(0.01) # Small delay to prevent tight loop if no input
+        elif live_codes and not group_selection_mode:
+            # Tick: only the code cells whose text changed are rewritten
+            viewport.refresh_cells(stdscr)
+
+    # Kept for the next visit, once the entry has been revealed
+    session.search_term = search_term
+    session.current_mode = current_mode
+    session.in_search_mode = in_search_mode
+    session.current_group_filter = current_group_filter
+    session.group_selection_mode = group_selection_mode
+    session.list_order = list_order
+    session.live_codes = live_codes
+    session.all_entries = all_entries
+    session.display_list = display_list
+    session.filter_key = filter_key
+    session.entries_version = entries_version
+    session.usage_changes = usage_changes
 
     # Return the selected UUID or None if user exited
-    return entry_to_reveal_uuid
+    return entry_to_reveal_key
@@ -0,0 +1,174 @@
+import curses
+import json
+import time
+from collections import deque
+from typing import List, Optional
+
+from latency_stats import percentiles
+
+SESSION_FORMAT_VERSION = 1
+QUIT_KEY = 17 # Ctrl+Q; sent once a replay runs out of keys, so every screen exits
+
+class RecordingWindow:
+    """
+    Wraps the main window and records every key read from it with its time since
+    recording started. Mouse events are not recorded: their positions come from
+    curses.getmouse() and would not mean the same on another terminal.
+    """
+
+    def __init__(self, window):
+        self._window = window
+        self._started = time.monotonic()
+        self.keys: List[List[float]] = [] # [seconds since start, key code]
+
+    def __getattr__(self, name):
+        return getattr(self._window, name)
+
+    def getch(self):
+        key = self._window.getch()
+        if key not in (curses.ERR, curses.KEY_MOUSE):
+            self.keys.append([round(time.monotonic() - self._started, 4), key])
+        return key
+
+class ReplayWindow:
+    """
+    Wraps the main window and answers getch() from a recorded key stream instead
+    of the keyboard: as fast as the UI asks for keys, or in real time, with the
+    recorded gaps (timed getch() calls then time out as they did when recorded).
+
+    Counts the frames drawn and the latency of each key: the time from getch()
+    returning it until the UI asks for the next key.
+    """
+
+    def __init__(self, window, keys, realtime: bool = False):
+        self._window = window
+        self._pending = deque(keys)
+        self.realtime = realtime
+        self._delay = -1
+        self._key_started = None
+        self.keys_replayed = 0
+        self.frames = 0
+        self.latencies: List[float] = [] # ms
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+        self.elapsed = None # Seconds and CPU seconds, set once the recorded keys ran out
+        self.cpu = None
+
+    def __getattr__(self, name):
+        return getattr(self._window, name)
+
+    def timeout(self, delay):
+        self._delay = delay
+        self._window.timeout(delay)
+
+    def nodelay(self, flag):
+        self._delay = 0 if flag else -1
+        self._window.nodelay(flag)
+
+    def refresh(self, *args):
+        self.frames += 1
+        return self._window.refresh(*args)
+
+    def count_frame(self):
+        self.frames += 1
+
+    def finish(self):
+        if self.elapsed is None:
+            self.elapsed = time.perf_counter() - self.started
+            self.cpu = time.process_time() - self.cpu_started
+
+    def getch(self):
+        if self._key_started is not None:
+            self.latencies.append((time.perf_counter() - self._key_started) * 1000)
+            self._key_started = None
+        if not self._pending:
+            self.finish()
+            return QUIT_KEY
+
+        due, key = self._pending[0]
+        if self.realtime:
+            wait = self.started + due - time.perf_counter()
+            if wait > 0:
+                if 0 <= self._delay / 1000 < wait:
+                    time.sleep(self._delay / 1000)
+                    return curses.ERR # Timed out, as the recorded session did
+                time.sleep(wait)
+        self._pending.popleft()
+        self.keys_replayed += 1
+        self._key_started = time.perf_counter()
+        return key
+
+class InputSession:
+    """
+    --record / --replay for the interactive flow. attach() wraps the main window
+    once the vault is unlocked, so the password is never part of a recording;
+    only key codes and their timing (plus the terminal size) are saved.
+    """
+
+    def __init__(self, record_path: Optional[str] = None, replay_path: Optional[str] = None, realtime: bool = False):
+        self.record_path = record_path
+        self.replay_path = replay_path
+        self.realtime = realtime
+        self.window = None
+        self.terminal_size = None
+        self.recording = None
+        self._doupdate = None
+        if replay_path:
+            # Read up front, so a bad file is reported before the UI starts
+            with open(replay_path) as f:
+                self.recording = json.load(f)
+            if self.recording.get("version") != SESSION_FORMAT_VERSION:
+                raise ValueError(f"unsupported session recording version: {self.recording.get('version')}")
+
+    @classmethod
+    def from_args(cls, args):
+        if not (args.record or args.replay):
+            return None
+        return cls(args.record, args.replay, args.replay_realtime)
+
+    def attach(self, window):
+        """Returns the window the UI should use from now on."""
+        self.terminal_size = list(window.getmaxyx())
+        if self.recording is not None:
+            self.window = ReplayWindow(window, self.recording["keys"], self.realtime)
+
+            # Pads and the list view draw through curses.doupdate(); count those frames too
+            self._doupdate = curses.doupdate
+            def doupdate():
+                self.window.count_frame()
+                self._doupdate()
+            curses.doupdate = doupdate
+        else:
+            self.window = RecordingWindow(window)
+        return self.window
+
+    def close(self):
+        """Saves the recording, or stops counting replayed frames. Called once curses has ended."""
+        if self._doupdate is not None:
+            curses.doupdate = self._doupdate
+            self._doupdate = None
+        if isinstance(self.window, ReplayWindow):
+            self.window.finish()
+        elif isinstance(self.window, RecordingWindow):
+            with open(self.record_path, "w") as f:
+                json.dump({"version": SESSION_FORMAT_VERSION, "terminal_size": self.terminal_size, "keys": self.window.keys}, f)
+
+    def report_lines(self) -> List[str]:
+        if self.window is None:
+            return ["No session was recorded or replayed (the vault was not unlocked)."]
+        if isinstance(self.window, RecordingWindow):
+            return [f"Recorded {len(self.window.keys)} keys to {self.record_path}."]
+
+        replay = self.window
+        mode = "in real time" if self.realtime else "as fast as possible"
+        lines = [
+            f"Replayed {replay.keys_replayed} keys {mode}: {replay.frames} frames in {replay.elapsed:.3f} s "
+            f"({replay.frames / max(replay.elapsed, 1e-9):.0f} frames/s), CPU {replay.cpu:.3f} s"
+        ]
+        if replay.latencies:
+            p50, p95, p99 = percentiles(replay.latencies)
+            lines.append(f"  key latency p50 {p50:.2f}  p95 {p95:.2f}  p99 {p99:.2f}  max {max(replay.latencies):.2f} ms")
+        recorded_size = self.recording.get("terminal_size")
+        if recorded_size and recorded_size != self.terminal_size:
+            lines.append(f"  note: recorded at {recorded_size[1]}x{recorded_size[0]}, replayed at {self.terminal_size[1]}x{self.terminal_size[0]}")
+        return lines
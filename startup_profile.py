@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+from typing import Dict, List, Sequence, Tuple
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules each startup path loads. Everything past aegis_main is imported lazily
+# by the code that needs it, so the paths can be measured separately.
+STARTUP_PATHS: Dict[str, Sequence[str]] = {
+    "cli": ("aegis_main",),
+    "unlock": (
+        "aegis_main",
+        "cryptography.hazmat.primitives.kdf.scrypt",
+        "cryptography.hazmat.primitives.ciphers",
+    ),
+    "tui": (
+        "aegis_main",
+        "cryptography.hazmat.primitives.kdf.scrypt",
+        "cryptography.hazmat.primitives.ciphers",
+        "curses",
+        "search_mode",
+        "tui_ui",
+    ),
+}
+
+def measure_imports(modules: Sequence[str]) -> List[Tuple[str, int, int, int]]:
+    """
+    Imports modules in a fresh interpreter under `python -X importtime`.
+    Returns (module, self_us, cumulative_us, depth) for every module loaded, in load order.
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=PACKAGE_DIR
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{result.stderr.strip()}")
+
+    return parse_importtime(result.stderr)
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Parses `-X importtime` output into (module, self_us, cumulative_us, depth) tuples."""
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue # Header line
+        name_field = fields[2].rstrip()
+        depth = (len(name_field) - len(name_field.lstrip())) // 2
+        timings.append((name_field.strip(), int(fields[0]), int(fields[1]), depth))
+    return timings
+
+def total_import_us(timings: List[Tuple[str, int, int, int]]) -> int:
+    """Sums the cumulative time of the top-level imports."""
+    return sum(cumulative for _, _, cumulative, depth in timings if depth == 0)
+
+def print_startup_profile(paths: Sequence[str] = ("cli", "unlock", "tui"), top: int = 12, file=sys.stderr):
+    """Prints, per startup path, the total import time and its most expensive modules."""
+    print("Startup import profile (python -X importtime)", file=file)
+    for path in paths:
+        timings = measure_imports(STARTUP_PATHS[path])
+        print(f"\n{path}: {total_import_us(timings) / 1000:.1f} ms", file=file)
+        shallow = [t for t in timings if t[3] <= 1]
+        for name, _, cumulative, depth in sorted(shallow, key=lambda t: t[2], reverse=True)[:top]:
+            print(f"  {cumulative / 1000:8.1f} ms  {'  ' * depth}{name}", file=file)
@@ -0,0 +1,35 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# The application modules live at the repository root
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PACKAGE_DIR)
+
+VAULT_PASSWORD = "test-password"
+VAULT_KDF_N = 1024 # Cheap scrypt: the fixtures are about everything but the KDF
+
+def generate_vault(path, *args):
+    """Writes a vault with generate_test_vault.py, e.g. generate_vault(path, "-p", VAULT_PASSWORD)."""
+    subprocess.run([sys.executable, os.path.join(PACKAGE_DIR, "generate_test_vault.py"), str(path), "-n", "5"] + list(args),
+                   check=True, capture_output=True)
+    return str(path)
+
+@pytest.fixture
+def encrypted_vault(tmp_path):
+    return generate_vault(tmp_path / "vault.json", "-p", VAULT_PASSWORD, "--kdf-n", str(VAULT_KDF_N))
+
+@pytest.fixture
+def tampered_vault(encrypted_vault):
+    """The encrypted vault with one bit of its db GCM tag flipped."""
+    with open(encrypted_vault) as f:
+        data = json.load(f)
+    tag = bytearray.fromhex(data["header"]["params"]["tag"])
+    tag[0] ^= 1
+    data["header"]["params"]["tag"] = tag.hex()
+    with open(encrypted_vault, "w") as f:
+        json.dump(data, f)
+    return encrypted_vault
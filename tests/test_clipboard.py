@@ -0,0 +1,101 @@
+import threading
+import time
+
+from clipboard import Clipboard
+
+class FakeClipboard(Clipboard):
+    """
+    A Clipboard whose tool is a variable; contents None means it cannot be read back.
+    While hold is set, the first write waits for release, like a slow tool.
+    """
+
+    def __init__(self, readable=True, clear_seconds=30, hold=False):
+        super().__init__(["fake-copy"], clear_seconds=clear_seconds)
+        self.contents = "" if readable else None
+        self.readable = readable
+        self.writes = []
+        self.writing = threading.Event()
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+
+    def _read(self):
+        return self.contents if self.readable else None
+
+    def _write(self, text):
+        self.writing.set()
+        assert self.release.wait(5)
+        self.writes.append(text)
+        if self.readable:
+            self.contents = text
+
+def copied(clipboard, text):
+    # What the worker does after a successful copy
+    clipboard._write(text)
+    clipboard._copied = text
+    clipboard._clear_at = 0
+
+def test_clear_empties_the_clipboard_holding_the_copy():
+    clipboard = FakeClipboard()
+    copied(clipboard, "123456")
+    assert clipboard._clear()
+    assert clipboard.contents == ""
+
+def test_clear_leaves_a_newer_copy_alone():
+    clipboard = FakeClipboard()
+    copied(clipboard, "123456")
+    clipboard.contents = "copied elsewhere"
+    assert not clipboard._clear()
+    assert clipboard.contents == "copied elsewhere"
+    assert clipboard.writes == ["123456"]
+
+def test_clear_ignores_a_trailing_newline_from_the_paste_tool():
+    clipboard = FakeClipboard()
+    copied(clipboard, "123456")
+    clipboard.contents = "123456\n"
+    assert clipboard._clear()
+
+def test_clear_empties_a_clipboard_that_cannot_be_read_back():
+    clipboard = FakeClipboard(readable=False)
+    copied(clipboard, "123456")
+    assert clipboard._clear()
+    assert clipboard.writes == ["123456", ""]
+
+def test_close_clears_only_while_a_clear_is_pending():
+    clipboard = FakeClipboard()
+    clipboard.close()
+    assert clipboard.writes == []
+    clipboard.copy("123456")
+    while clipboard.busy():
+        time.sleep(0.01)
+    assert clipboard.contents == "123456"
+    clipboard.close() # The auto-clear is 30 s away
+    assert clipboard.writes == ["123456", ""]
+    assert clipboard.contents == ""
+
+def test_quit_right_after_copy_waits_for_the_copy_then_clears():
+    clipboard = FakeClipboard(hold=True)
+    clipboard.copy("123456")
+    assert clipboard.writing.wait(5) # The tool is running
+    threading.Timer(0.05, clipboard.release.set).start()
+    clipboard.close() # Returns once the copy finished and was cleared
+    assert clipboard.writes == ["123456", ""]
+    assert clipboard.contents == ""
+
+def test_close_skips_a_copy_that_would_be_cleared_at_once():
+    clipboard = FakeClipboard(hold=True)
+    clipboard.copy("111111")
+    assert clipboard.writing.wait(5)
+    clipboard.copy("222222") # Queued behind the running copy
+    threading.Timer(0.05, clipboard.release.set).start()
+    clipboard.close()
+    assert clipboard.writes == ["111111", ""]
+    assert not clipboard.busy()
+
+def test_close_without_auto_clear_completes_the_copy():
+    clipboard = FakeClipboard(clear_seconds=0, hold=True)
+    clipboard.copy("123456")
+    threading.Timer(0.05, clipboard.release.set).start()
+    clipboard.close()
+    assert clipboard.writes == ["123456"]
+    assert clipboard.contents == "123456"
@@ -0,0 +1,17 @@
+import json
+
+import pytest
+
+import config
+import json_codec
+
+@pytest.mark.parametrize("backend", json_codec.BACKENDS)
+def test_save_config_keeps_the_four_space_layout(backend, tmp_path, monkeypatch):
+    if backend not in json_codec.available_backends():
+        pytest.skip(f"{backend} is not installed")
+    monkeypatch.setattr(json_codec, "_backend", backend)
+    monkeypatch.setattr(config, "CONFIG_FILE_PATH", tmp_path / "config.json")
+    settings = {"last_opened_vault": "/home/user/vault.json", "last_vault_dir": None, "dashboard_pins": ["uuid-1"], "clipboard_clear_seconds": 30}
+    config.save_config(settings)
+    assert (tmp_path / "config.json").read_text() == json.dumps(settings, indent=4)
+    assert config.load_config()["dashboard_pins"] == ["uuid-1"]
@@ -0,0 +1,36 @@
+from list_view import ListViewport
+
+class Item(dict):
+    """A list entry counting how often it is read."""
+    reads = 0
+
+    def __getitem__(self, key):
+        Item.reads += 1
+        return super().__getitem__(key)
+
+NAMES = ["alpha", "Amazon", "beta", "bravo", "charlie", "", "apple"]
+
+def test_jump_wraps_through_the_matches():
+    items = [Item(name=name) for name in NAMES]
+    viewport = ListViewport()
+    viewport.reset(len(items))
+    assert [viewport.jump_to_letter("A", items) and viewport.selected for _ in range(4)] == [1, 6, 0, 1]
+    assert viewport.jump_to_letter("c", items) and viewport.selected == 4
+    assert not viewport.jump_to_letter("z", items)
+    assert viewport.selected == 4
+
+def test_letter_index_is_kept_until_the_list_changes():
+    items = [Item(name=name) for name in NAMES * 100]
+    viewport = ListViewport()
+    viewport.reset(len(items))
+    viewport.jump_to_letter("a", items)
+    Item.reads = 0
+    for letter in "abcabc":
+        viewport.jump_to_letter(letter, items)
+    assert Item.reads == 0
+
+    narrowed = items[:7]
+    viewport.reset(len(narrowed))
+    viewport.jump_to_letter("b", narrowed)
+    assert Item.reads == len(narrowed)
+    assert viewport.selected == 2
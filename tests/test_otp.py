@@ -0,0 +1,67 @@
+import base64
+import binascii
+
+import pytest
+
+import otp
+from otp import generate_hotp, generate_motp, generate_steam_otp, generate_totp
+
+SECRET = "JBSWY3DPEHPK3PXP"
+
+def all_otps():
+    return [
+        generate_totp(SECRET, "SHA1", 6, 30),
+        generate_hotp(SECRET, "SHA1", 6, 7),
+        generate_steam_otp(SECRET, "SHA1", 5, 30),
+        generate_motp(binascii.unhexlify("0123456789abcdef"), "MD5", 6, 10, "1234"),
+    ]
+
+@pytest.mark.parametrize("code", all_otps(), ids=lambda code: type(code).__name__)
+def test_string_is_the_code_at_the_current_time(code, monkeypatch):
+    clock = [1_700_000_000.0]
+    monkeypatch.setattr(otp.time, "time", lambda: clock[0])
+    before = code.string()
+    assert before == code.string_at(clock[0])
+
+    # Past the end of the window the code was first generated in
+    clock[0] += max(code.period(), 1) * 3
+    assert code.string() == code.string_at(clock[0])
+    if code.period():
+        assert code.string() != before
+
+def test_steam_and_motp_codes_follow_the_window():
+    steam = generate_steam_otp(SECRET, "SHA1", 5, 30)
+    assert steam.string_at(0) == steam.string_at(29)
+    assert steam.string_at(29) != steam.string_at(30)
+    assert all(ch in steam.STEAM_ALPHA for ch in steam.string_at(0))
+
+    motp = generate_motp(binascii.unhexlify("0123456789abcdef"), "MD5", 6, 10, "1234")
+    assert motp.string_at(0) == motp.string_at(9)
+    assert motp.string_at(9) != motp.string_at(10)
+
+# RFC 4226 appendix D and RFC 6238 appendix B
+RFC_SECRET_SHA1 = base64.b32encode(b"12345678901234567890").decode()
+RFC_SECRET_SHA256 = base64.b32encode(b"12345678901234567890123456789012").decode()
+RFC_SECRET_SHA512 = base64.b32encode(b"1234567890" * 6 + b"1234").decode()
+
+def test_hotp_matches_rfc_4226():
+    expected = ["755224", "287082", "359152", "969429", "338314", "254676", "287922", "162583", "399871", "520489"]
+    assert [generate_hotp(RFC_SECRET_SHA1, "SHA1", 6, counter).string() for counter in range(10)] == expected
+
+@pytest.mark.parametrize("secret, algo, seconds, expected", [
+    (RFC_SECRET_SHA1, "SHA1", 59, "94287082"),
+    (RFC_SECRET_SHA256, "SHA256", 59, "46119246"),
+    (RFC_SECRET_SHA512, "SHA512", 59, "90693936"),
+    (RFC_SECRET_SHA1, "SHA1", 1111111109, "07081804"),
+    (RFC_SECRET_SHA256, "SHA256", 1234567890, "91819424"),
+    (RFC_SECRET_SHA512, "SHA512", 20000000000, "47863826"),
+])
+def test_totp_matches_rfc_6238(secret, algo, seconds, expected):
+    assert generate_totp(secret, algo, 8, 30).string_at(seconds) == expected
+
+def test_totp_secret_without_padding_in_lowercase():
+    assert generate_totp(RFC_SECRET_SHA1.rstrip("=").lower(), "SHA1", 8, 30).string_at(59) == "94287082"
+
+def test_totp_rejects_a_digest_too_short_to_truncate():
+    with pytest.raises(ValueError):
+        generate_totp(SECRET, "MD5", 6, 30)
@@ -0,0 +1,122 @@
+import curses
+
+from tui_ui import run_reveal_mode
+from virtual_screen import VirtualBackend, VirtualTerminal
+
+ENTRY = {"uuid": "entry-1", "key": "entry-1", "name": "alice@example.com", "issuer": "Example", "groups": "", "note": ""}
+COLORS = {name: 0 for name in ("NORMAL_TEXT_COLOR", "REVEAL_HIGHLIGHT_COLOR", "RED_TEXT_COLOR", "BOLD_WHITE_COLOR")}
+
+class FakeOTP:
+    """A 30 s code that is just its window number, counting how often it is computed."""
+
+    def __init__(self):
+        self.computed = 0
+
+    def period(self):
+        return 30
+
+    def string_at(self, seconds):
+        self.computed += 1
+        return "%06d" % (int(seconds) // 30)
+
+class FakeClipboard:
+    available = True
+
+    def __init__(self):
+        self.copies = []
+
+    def copy(self, text):
+        self.copies.append(text)
+
+    def poll(self):
+        return None
+
+    def busy(self):
+        return False
+
+class Reveal:
+    """
+    Runs run_reveal_mode on a virtual terminal with a fake clock. In the key
+    script, None is a getch() timeout: the clock advances by the full timeout
+    the screen asked for, as if nothing was pressed meanwhile.
+    """
+
+    def __init__(self, keys, start=1000.25, rows=24, cols=80, clipboard=None):
+        self.now = start
+        self.otp = FakeOTP()
+        self.clipboard = clipboard
+        self.terminal = VirtualTerminal(rows, cols, keys)
+        self.waits = [] # getch() timeouts asked for, in ms
+        self.frames_after_key = {} # Keys read -> frames drawn before the next getch()
+        scripted = self.terminal.next_key
+
+        def next_key(delay):
+            self.frames_after_key[self.terminal.keys_read] = self.terminal.frames
+            self.waits.append(delay)
+            key = scripted(delay)
+            if key == curses.ERR:
+                self.now += delay / 1000
+            return key
+        self.terminal.next_key = next_key
+
+    def run(self):
+        def screen(stdscr):
+            return run_reveal_mode(
+                stdscr, ENTRY, {ENTRY["key"]: self.otp}, set(), {}, self.terminal.rows, self.terminal.cols,
+                False, [ENTRY], None, COLORS, self.clipboard, clock=lambda: self.now
+            )
+        return VirtualBackend(self.terminal).run(screen)
+
+    def field(self, label):
+        for line in self.terminal.text().splitlines():
+            if f"{label}:" in line:
+                return line.split(f"{label}:", 1)[1].strip(" │")
+        return None
+
+def test_shows_the_code_and_the_countdown():
+    reveal = Reveal([27])
+    assert reveal.run() == ("search", True, 0)
+    assert reveal.field("OTP Code") == "000033"
+    assert reveal.field("Next code refresh in") == "20s" # 19.75 s left in the window, rounded up
+
+def test_the_countdown_ticks_once_per_second():
+    reveal = Reveal([None, None, None, 27])
+    reveal.run()
+    assert reveal.field("Next code refresh in") == "17s"
+    # Each wait lasts until the next whole second, never busy-looping
+    assert reveal.waits[:4] == [750, 1000, 1000, 1000]
+
+def test_nothing_is_redrawn_when_nothing_changed():
+    reveal = Reveal(["x", "y", 27]) # Ignored keys within the same second
+    reveal.run()
+    assert reveal.frames_after_key == {0: 1, 1: 1, 2: 1} # Only the first frame
+    assert reveal.terminal.frames == 1
+
+def test_the_code_is_computed_once_per_window():
+    reveal = Reveal([None] * 3 + [27], start=1018.5)
+    reveal.run()
+    assert reveal.field("OTP Code") == "000034" # Rolled over at 1020
+    assert reveal.field("Next code refresh in") == "29s"
+    assert reveal.otp.computed == 2
+    assert reveal.waits[:2] == [500, 1000]
+
+def test_returns_to_search_after_a_minute_without_keys():
+    reveal = Reveal([None] * 100)
+    assert reveal.run() == ("search", True, 0)
+    assert reveal.now - 1000.25 == 60
+    assert "Timeout in 1s" in reveal.terminal.text()
+
+def test_a_key_resets_the_timeout():
+    reveal = Reveal([None] * 30 + ["x"] + [None] * 100)
+    reveal.run()
+    assert reveal.now - 1000.25 > 60
+
+def test_ctrl_q_exits():
+    assert Reveal([17]).run() == ("reveal", False, 0)
+
+def test_enter_copies_the_current_code_even_when_it_is_not_drawn():
+    clipboard = FakeClipboard()
+    reveal = Reveal([10, 27], rows=8, cols=40, clipboard=clipboard)
+    reveal.run()
+    assert reveal.field("OTP Code") is None # No room for the code row
+    assert clipboard.copies == ["000033"]
@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from aegis_core import prepare_vault_file, unlock_vault
+from benchmark import CODE_FORBIDDEN_PACKAGES, DEFAULT_CODE_BUDGET_MS, DEFAULT_STARTUP_BUDGET_MS, DEFERRED_PACKAGES
+from conftest import VAULT_KDF_N, VAULT_PASSWORD, generate_vault
+from startup_profile import PACKAGE_DIR, parse_importtime
+
+RUNS = 3 # The budget holds if the best run is within it
+
+def importtime(args, home):
+    """(module, self_us, cumulative_us, depth) of every module `python -X importtime args` loads."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime"] + args,
+        capture_output=True, text=True, cwd=PACKAGE_DIR, env=dict(os.environ, HOME=str(home)), stdin=subprocess.DEVNULL
+    )
+    assert result.returncode == 0, result.stderr
+    return parse_importtime(result.stderr)
+
+@pytest.fixture(scope="module")
+def help_runs(tmp_path_factory):
+    home = tmp_path_factory.mktemp("home")
+    interpreter = {name for name, _, _, _ in importtime(["-c", "pass"], home)} # Loaded before any of our code
+    return interpreter, [importtime(["aegis_main.py", "--help"], home) for _ in range(RUNS)]
+
+def test_help_leaves_the_heavy_modules_unloaded(help_runs):
+    _, runs = help_runs
+    loaded = {name for name, _, _, _ in runs[0]}
+    assert "cryptography.hazmat.primitives.ciphers" not in loaded
+    assert "_curses" not in loaded
+    assert sorted({name.split(".")[0] for name in loaded}.intersection(DEFERRED_PACKAGES)) == []
+
+def test_help_imports_within_the_startup_budget(help_runs):
+    interpreter, runs = help_runs
+    def own_ms(timings):
+        return sum(cumulative for name, _, cumulative, depth in timings if depth == 0 and name not in interpreter) / 1000
+    best_ms = min(own_ms(timings) for timings in runs)
+    assert best_ms <= DEFAULT_STARTUP_BUDGET_MS["cli"], f"aegis_main.py --help imports took {best_ms:.1f} ms"
+
+@pytest.fixture(scope="module")
+def headless_commands(tmp_path_factory):
+    """The headless subcommands, run against a fixture vault with a cheap KDF."""
+    path = generate_vault(tmp_path_factory.mktemp("vault") / "vault.json", "-p", VAULT_PASSWORD, "--kdf-n", str(VAULT_KDF_N))
+    uuid = unlock_vault(prepare_vault_file(path), VAULT_PASSWORD).db.entries[0].uuid
+    env = dict(os.environ, HOME=str(tmp_path_factory.mktemp("home")), AEGIS_CLI_PASSWORD=VAULT_PASSWORD)
+    return env, {"code": ["code", uuid, path], "export-codes": ["export-codes", path]}
+
+@pytest.mark.parametrize("command", ["code", "export-codes"])
+def test_headless_command_within_its_budget(headless_commands, command):
+    env, commands = headless_commands
+    args = [os.path.join(PACKAGE_DIR, "aegis_main.py")] + commands[command]
+    runs = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable] + args, capture_output=True, text=True, env=env, stdin=subprocess.DEVNULL)
+        runs.append((time.perf_counter() - started) * 1000)
+        assert result.returncode == 0, result.stderr
+    assert result.stdout.strip()
+    assert min(runs) <= DEFAULT_CODE_BUDGET_MS, f"{command} took {min(runs):.1f} ms end to end"
+
+    traced = subprocess.run([sys.executable, "-X", "importtime"] + args, capture_output=True, text=True, env=env, stdin=subprocess.DEVNULL)
+    loaded = {name.split(".")[0] for name, _, _, _ in parse_importtime(traced.stderr)}
+    assert "pyotp" not in loaded
+    assert "curses" not in loaded and "_curses" not in loaded
+    assert sorted(loaded.intersection(CODE_FORBIDDEN_PACKAGES)) == []
@@ -0,0 +1,56 @@
+from tui_display import ColumnLayout
+
+class Item(dict):
+    """A list entry counting how often the layout reads it."""
+    reads = 0
+
+    def __getitem__(self, key):
+        Item.reads += 1
+        return super().__getitem__(key)
+
+def make_items(count, start=0):
+    return [
+        Item(key=f"k{i}", issuer="I" * (i % 7), name="n" * (i % 11), groups="", note="東" * (i % 3))
+        for i in range(start, start + count)
+    ]
+
+def expected_widths(items):
+    return (
+        max(len(item.get("issuer")) for item in items), max(len(item.get("name")) for item in items),
+        0, max(2 * len(item.get("note")) for item in items), 0,
+    )
+
+def test_widths_follow_the_list():
+    full = make_items(100)
+    layout = ColumnLayout()
+    layout.sync(full)
+    assert layout.max_widths() == expected_widths(full)
+    narrow = [item for item in full if len(item["name"]) < 4]
+    layout.sync(narrow)
+    assert layout.max_widths() == expected_widths(narrow)
+    layout.sync([])
+    assert layout.max_widths() == (0, 0, 0, 0, 0)
+
+def test_lists_seen_before_are_not_read_again():
+    full = make_items(1000)
+    layout = ColumnLayout()
+    layout.sync(full)
+    searches = [full[:500], full[:50], full[:5], full[:50], full[:500]] # Typing, then backspacing
+    for search in searches:
+        layout.sync(search)
+
+    Item.reads = 0
+    layout.sync(full) # The search cleared
+    layout.sync(full)
+    assert Item.reads == 0
+    assert layout.max_widths() == expected_widths(full)
+
+def test_appended_entries_only_read_the_tail():
+    items = make_items(1000)
+    layout = ColumnLayout()
+    layout.sync(items)
+    items += make_items(10, start=1000) # Another vault merged in
+    Item.reads = 0
+    layout.sync(items)
+    assert 0 < Item.reads <= 3 * 10 # The new entries' keys, looked up and stored
+    assert layout.max_widths() == expected_widths(items)
@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from aegis_core import prepare_vault_file, unlock_vault
+from conftest import PACKAGE_DIR, VAULT_PASSWORD
+from unlock_mode import run_unlock_mode
+from vault import TAMPERED_VAULT_MESSAGE, VaultFormatError
+from vault_set import VaultSet
+
+class Screen:
+    """Just what run_unlock_mode() draws with; no key is ever pressed."""
+    def getmaxyx(self): return 24, 80
+    def timeout(self, delay): pass
+    def move(self, row, col): pass
+    def clrtoeol(self): pass
+    def addstr(self, *args): pass
+    def refresh(self): pass
+    def getch(self): return -1
+
+def test_unlock_opens_the_vault(encrypted_vault):
+    assert len(unlock_vault(prepare_vault_file(encrypted_vault), VAULT_PASSWORD).db.entries) == 5
+
+def test_tampered_vault_fails_unlock(tampered_vault):
+    with pytest.raises(VaultFormatError, match=TAMPERED_VAULT_MESSAGE):
+        unlock_vault(prepare_vault_file(tampered_vault), VAULT_PASSWORD)
+
+def test_unlock_mode_raises_instead_of_asking_again(tampered_vault):
+    with pytest.raises(VaultFormatError, match=TAMPERED_VAULT_MESSAGE):
+        run_unlock_mode(Screen(), prepare_vault_file(tampered_vault), VAULT_PASSWORD, 0, {"NORMAL_TEXT_COLOR": 0})
+
+def test_unlock_mode_returns_a_wrong_password(encrypted_vault):
+    vault_data, error, _, cancelled = run_unlock_mode(Screen(), prepare_vault_file(encrypted_vault), "wrong", 0, {"NORMAL_TEXT_COLOR": 0})
+    assert vault_data is None and not cancelled
+    assert isinstance(error, ValueError) and not isinstance(error, VaultFormatError)
+
+def test_headless_reports_a_tampered_vault(tampered_vault, tmp_path):
+    result = subprocess.run(
+        [sys.executable, os.path.join(PACKAGE_DIR, "aegis_main.py"), "code", "anything", tampered_vault],
+        capture_output=True, text=True, stdin=subprocess.DEVNULL,
+        env=dict(os.environ, HOME=str(tmp_path), AEGIS_CLI_PASSWORD=VAULT_PASSWORD)
+    )
+    assert result.returncode == 1
+    assert f"Error reading vault: {TAMPERED_VAULT_MESSAGE}" in result.stderr
+    assert "Traceback" not in result.stderr
+
+def test_vault_set_reports_a_tampered_vault_once(tampered_vault):
+    vault_set = VaultSet(["first.json", tampered_vault])
+    vault_set.start(VAULT_PASSWORD, [tampered_vault])
+    merged, failed = vault_set.poll(wait=True)
+    vault_set.start("another password", [tampered_vault]) # A retry after a wrong first password
+    assert vault_set.pending() == 0
+    vault_set.shutdown()
+    assert (merged, failed) == ([], ["vault"])
+    assert vault_set.errors[tampered_vault] == TAMPERED_VAULT_MESSAGE
@@ -0,0 +1,95 @@
+import shutil
+import threading
+
+import pytest
+
+from conftest import generate_vault
+from dashboard_mode import migrate_pins, pinned_rows
+from entry_table import EntryTable
+from vault_set import VaultSet
+
+@pytest.fixture
+def plain_vaults(tmp_path):
+    """Two plaintext exports with the same entries, as a copied vault would have."""
+    first = generate_vault(tmp_path / "team-a.json", "--icons", "2", "--plaintext")
+    second = str(tmp_path / "team-b.json")
+    shutil.copy(first, second)
+    return [first, second]
+
+def load(paths):
+    vault_set = VaultSet(paths)
+    vault_set.start("", paths)
+    while vault_set.pending():
+        vault_set.poll(wait=True)
+    vault_set.shutdown()
+    return vault_set
+
+def test_duplicate_entries_keep_their_uuids(plain_vaults):
+    vault_set = load(plain_vaults)
+
+    entries = vault_set.vault.db.entries
+    assert len(entries) == 10
+    keys = [key for key, _ in vault_set.sources]
+    assert len(set(keys)) == 10
+    assert all("@" not in entry.uuid for entry in entries)
+    assert set(vault_set.otps) == set(keys)
+
+    # Each vault's icons are looked up by the plain uuids
+    for (_, label), entry in zip(vault_set.sources, entries):
+        assert entry.uuid in vault_set.icons[label].load([entry])
+
+    table = EntryTable(entries, vault_set.group_names, vault_set.sources)
+    for row, (key, label) in zip(table.rows, vault_set.sources):
+        assert table.row(key) is row
+        assert row["vault"] == label
+        assert "@" not in row["uuid"]
+        assert key == f"{row['uuid']}@{label}" # Whichever vault finished first
+
+def test_pins_keep_to_their_vault(plain_vaults):
+    vault_set = load(plain_vaults)
+    table = EntryTable(vault_set.vault.db.entries, vault_set.group_names, vault_set.sources)
+    first, second = table.rows[0], table.rows[5]
+    assert first["uuid"] == second["uuid"] and first["key"] != second["key"]
+
+    # A bare uuid from an earlier version becomes the key of the entry it found
+    pins = [first["uuid"], second["key"], "not-loaded-yet", second["uuid"]]
+    assert migrate_pins(table, pins)
+    assert pins == [first["key"], second["key"], "not-loaded-yet", first["key"]]
+    assert not migrate_pins(table, pins)
+    assert pinned_rows(table, pins) == [first, second]
+
+    # A single vault finds pins saved with several
+    single = load(plain_vaults[1:])
+    table = EntryTable(single.vault.db.entries, single.group_names)
+    assert table.find(second["key"])["uuid"] == second["uuid"]
+    assert not migrate_pins(table, pins)
+
+def test_running_attempt_is_retried_with_the_new_password(monkeypatch, plain_vaults):
+    running = threading.Event()
+    release = threading.Event()
+    tried = []
+    unlock_file = VaultSet._unlock
+
+    def unlock(path, password):
+        tried.append(password)
+        if password == "wrong":
+            running.set()
+            release.wait(5)
+            raise ValueError("wrong password")
+        return unlock_file(path, password)
+
+    monkeypatch.setattr(VaultSet, "_unlock", staticmethod(unlock))
+    path = plain_vaults[1]
+    vault_set = VaultSet(plain_vaults)
+    vault_set.start("wrong", [path])
+    assert running.wait(5)
+    vault_set.start("right", [path]) # The first attempt is still running
+    release.set()
+
+    failed = []
+    while vault_set.pending():
+        failed += vault_set.poll(wait=True)[1]
+    vault_set.shutdown()
+    assert tried == ["wrong", "right"]
+    assert failed == []
+    assert vault_set.loaded == [path]
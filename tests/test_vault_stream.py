@@ -0,0 +1,159 @@
+import base64
+import json
+import os
+
+import pytest
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+
+import json_codec
+from vault import Db, Entry, Group, TAMPERED_VAULT_MESSAGE, Vault, VaultFormatError, from_dict, stream_vault_file
+
+PASSWORD = "stream-test"
+KDF_N = 1024 # Cheap: these tests are about the parser, not the KDF
+
+# Text the incremental parser must not mistake for structure
+NOTES = [
+    "",
+    "closes an object }, then opens one {\"a\": 1},",
+    "closes the array }] early",
+    "quotes the key \"icon\": \"not an icon\"",
+    "non-ASCII: Zürich, 東京, 🔐",
+    "é" * 3000 + "🔐" * 1000, # Longer than a decode window, cut inside a character
+]
+
+def make_db(count=200):
+    groups = [{"uuid": "group-1", "name": "Work }]"}, {"uuid": "group-2", "name": "Ünïcödé"}]
+    entries = []
+    for i in range(count):
+        icon = base64.b64encode(os.urandom(300 + i)).decode() if i % 4 == 0 else None
+        entries.append({
+            "type": "totp", "uuid": f"uuid-{i}", "name": f"name {i}", "issuer": "Issuer }," if i % 5 == 0 else "Issuer",
+            "note": NOTES[i % len(NOTES)], "icon": icon,
+            "icon_mime": "image/png" if icon else None, "icon_hash": f"hash-{i}" if icon else None,
+            "favorite": i % 3 == 0,
+            "info": {"secret": "JBSWY3DPEHPK3PXP", "algo": "SHA1", "digits": 6, "period": 30},
+            "groups": ["group-1"] if i % 2 else [],
+        })
+    return {"version": 2, "entries": entries, "groups": groups}
+
+def dump(data, compact):
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return json.dumps(data, indent=4).encode("utf-8")
+
+def write_encrypted(path, db, compact=False, wrap=False):
+    """An Aegis vault of db with one password slot; with wrap, its base64 payload has line breaks."""
+    master_key = AESGCM.generate_key(256)
+    nonce = os.urandom(12)
+    sealed = AESGCM(master_key).encrypt(nonce, dump(db, compact), None)
+    payload = base64.b64encode(sealed[:-16]).decode()
+    if wrap:
+        payload = "\n".join(payload[i:i + 76] for i in range(0, len(payload), 76))
+
+    salt = os.urandom(16)
+    key = Scrypt(salt=salt, length=32, n=KDF_N, r=8, p=1).derive(PASSWORD.encode())
+    slot_nonce = os.urandom(12)
+    slot_sealed = AESGCM(key).encrypt(slot_nonce, master_key, None)
+    slot = {
+        "type": 1, "uuid": "slot-1", "key": slot_sealed[:-16].hex(),
+        "key_params": {"nonce": slot_nonce.hex(), "tag": slot_sealed[-16:].hex()},
+        "n": KDF_N, "r": 8, "p": 1, "salt": salt.hex(), "repaired": True, "is_backup": False,
+    }
+    vault = {"version": 1, "header": {"slots": [slot], "params": {"nonce": nonce.hex(), "tag": sealed[-16:].hex()}}, "db": payload}
+    with open(path, "wb") as f:
+        f.write(dump(vault, compact))
+    return master_key
+
+def write_plaintext(path, db, compact=False):
+    with open(path, "wb") as f:
+        f.write(dump({"version": 1, "header": {"slots": None, "params": None}, "db": db}, compact))
+
+def reference_db(path, master_key=None):
+    """The db of the file as json.loads (and a one-shot AES-GCM decryption) reads it."""
+    with open(path, "rb") as f:
+        data = json.loads(f.read())
+    db = data["db"]
+    if master_key is not None:
+        params = data["header"]["params"]
+        sealed = base64.b64decode(db) + bytes.fromhex(params["tag"])
+        db = json.loads(AESGCM(master_key).decrypt(bytes.fromhex(params["nonce"]), sealed, None))
+    return Db(version=db["version"], entries=[from_dict(Entry, e) for e in db["entries"]], groups=[from_dict(Group, g) for g in db["groups"]])
+
+def with_icons(vault, master_key=None):
+    """The entries of vault with the icons its IconStore left out put back."""
+    icons = vault.icons.load(vault.db.entries, master_key)
+    for entry in vault.db.entries:
+        if entry.uuid in icons:
+            entry.icon = icons[entry.uuid]
+    return vault.db
+
+@pytest.fixture(autouse=True, params=json_codec.BACKENDS)
+def json_backend(request, monkeypatch):
+    """Runs every test with each AEGIS_JSON_BACKEND value."""
+    if request.param not in json_codec.available_backends():
+        pytest.skip(f"{request.param} is not installed")
+    monkeypatch.setenv("AEGIS_JSON_BACKEND", request.param)
+    monkeypatch.setattr(json_codec, "_backend", None)
+    assert json_codec.backend() == request.param
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("wrap", [False, True])
+def test_encrypted_vault_matches_json_loads(tmp_path, compact, wrap):
+    path = tmp_path / "vault.json"
+    master_key = write_encrypted(path, make_db(), compact, wrap)
+    expected = reference_db(path, master_key)
+
+    vault = stream_vault_file(str(path))
+    assert vault.find_master_key(PASSWORD) == master_key
+    assert vault.decrypt_vault(master_key, load_icons=True).db == expected
+
+    vault = stream_vault_file(str(path))
+    unlocked = vault.decrypt_vault(master_key)
+    assert len(unlocked.icons) == sum(1 for entry in expected.entries if entry.icon)
+    assert all(entry.icon is None for entry in unlocked.db.entries)
+    assert with_icons(unlocked, master_key) == expected
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_plaintext_export_matches_json_loads(tmp_path, compact):
+    path = tmp_path / "export.json"
+    write_plaintext(path, make_db(), compact)
+
+    vault = stream_vault_file(str(path))
+    assert isinstance(vault, Vault) and not vault.encrypted
+    assert with_icons(vault) == reference_db(path)
+
+@pytest.mark.parametrize("fraction", [0.01, 0.3, 0.7, 0.999])
+def test_truncated_encrypted_vault(tmp_path, fraction):
+    path = tmp_path / "vault.json"
+    master_key = write_encrypted(path, make_db(40))
+    content = path.read_bytes()
+    path.write_bytes(content[:int(len(content) * fraction)])
+    with pytest.raises(VaultFormatError):
+        stream_vault_file(str(path)).decrypt_vault(master_key)
+
+@pytest.mark.parametrize("fraction", [0.01, 0.3, 0.7, 0.999])
+def test_truncated_plaintext_export(tmp_path, fraction):
+    path = tmp_path / "export.json"
+    write_plaintext(path, make_db(40))
+    content = path.read_bytes()
+    path.write_bytes(content[:int(len(content) * fraction)])
+    with pytest.raises(VaultFormatError):
+        stream_vault_file(str(path))
+
+@pytest.mark.parametrize("field", ["tag", "payload"])
+def test_tampered_vault(tmp_path, field):
+    path = tmp_path / "vault.json"
+    master_key = write_encrypted(path, make_db(40))
+    data = json.loads(path.read_bytes())
+    if field == "tag":
+        tag = bytearray.fromhex(data["header"]["params"]["tag"])
+        tag[-1] ^= 1
+        data["header"]["params"]["tag"] = tag.hex()
+    else:
+        sealed = bytearray(base64.b64decode(data["db"]))
+        sealed[len(sealed) // 2] ^= 1
+        data["db"] = base64.b64encode(sealed).decode()
+    path.write_text(json.dumps(data))
+    with pytest.raises(VaultFormatError, match=TAMPERED_VAULT_MESSAGE):
+        stream_vault_file(str(path)).decrypt_vault(master_key)
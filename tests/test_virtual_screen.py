@@ -0,0 +1,69 @@
+import curses
+
+import pytest
+
+from virtual_screen import ScriptEnded, VirtualBackend, VirtualTerminal
+
+def test_text_reaches_the_screen_on_refresh():
+    terminal = VirtualTerminal(4, 20)
+    def screen(stdscr):
+        stdscr.addstr(1, 2, "hello", 7)
+        assert terminal.line(1) == "" # Not refreshed yet
+        stdscr.refresh()
+        return stdscr.getmaxyx()
+    assert VirtualBackend(terminal).run(screen) == (4, 20)
+    assert terminal.line(1) == "  hello"
+    assert terminal.attr_at(1, 2) == 7
+    assert terminal.frames == 1
+
+def test_unchanged_cells_are_not_emitted_again():
+    terminal = VirtualTerminal(4, 20)
+    def screen(stdscr):
+        stdscr.addstr(0, 0, "same")
+        stdscr.refresh()
+        first = terminal.bytes_emitted
+        stdscr.addstr(0, 0, "same")
+        stdscr.refresh()
+        return first
+    first = VirtualBackend(terminal).run(screen)
+    assert first > 0
+    assert terminal.bytes_emitted == first
+
+def test_writes_outside_the_window_fail_like_curses():
+    def screen(stdscr):
+        with pytest.raises(curses.error):
+            stdscr.addstr(5, 0, "x")
+    VirtualBackend(rows=4, cols=20).run(screen)
+
+def test_scripted_keys_then_the_session_ends():
+    seen = []
+    def screen(stdscr):
+        stdscr.timeout(100)
+        while True:
+            seen.append(stdscr.getch())
+    assert VirtualBackend(keys=["ab", None, curses.KEY_DOWN]).run(screen) is None
+    assert seen == [ord("a"), ord("b"), curses.ERR, curses.KEY_DOWN]
+
+def test_a_blocking_getch_skips_timeouts():
+    terminal = VirtualTerminal(keys=[None, "q"])
+    assert terminal.next_key(-1) == ord("q")
+    with pytest.raises(ScriptEnded):
+        terminal.next_key(-1)
+
+def test_curses_is_restored_after_a_run_even_when_it_fails():
+    original_doupdate = curses.doupdate
+    had_acs = hasattr(curses, "ACS_HLINE") # Only defined by curses once initscr() has run
+    def screen(stdscr):
+        assert curses.doupdate is not original_doupdate
+        raise ValueError("boom")
+    with pytest.raises(ValueError):
+        VirtualBackend().run(screen)
+    assert curses.doupdate is original_doupdate
+    assert hasattr(curses, "ACS_HLINE") == had_acs
+
+def test_runs_cannot_nest():
+    def outer(stdscr):
+        with pytest.raises(RuntimeError):
+            VirtualBackend().run(lambda stdscr: None)
+        return "done"
+    assert VirtualBackend().run(outer) == "done"
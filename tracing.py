@@ -0,0 +1,83 @@
+import atexit
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Phase tracing in the Chrome trace-event format (chrome://tracing, ui.perfetto.dev).
+# Disabled unless enable() is called (--trace FILE); span() then costs a flag check.
+
+enabled = False
+_path: Optional[str] = None
+_events: List[Dict[str, Any]] = []
+_thread_names: Dict[int, str] = {}
+_lock = threading.Lock()
+
+def now_us() -> float:
+    return time.perf_counter_ns() / 1000
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: Optional[Dict[str, Any]]):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        complete(self.name, self.start, self.args)
+        return False
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def span(name: str, **args):
+    """Context manager recording the enclosed block as a complete event."""
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name, args or None)
+
+def complete(name: str, start_us: float, args: Optional[Dict[str, Any]] = None):
+    """Records an event that started at start_us (from now_us()) and ends now."""
+    if not enabled:
+        return
+    end = now_us()
+    thread = threading.current_thread()
+    event = {"name": name, "ph": "X", "ts": start_us, "dur": end - start_us, "pid": os.getpid(), "tid": thread.ident}
+    if args:
+        event["args"] = args
+    with _lock:
+        _events.append(event)
+        _thread_names.setdefault(thread.ident, thread.name)
+
+def enable(path: str):
+    """Starts recording; the trace is written to path when the process exits."""
+    global enabled, _path
+    enabled = True
+    _path = path
+    atexit.register(write)
+
+def write():
+    """Writes the recorded events as a trace-event JSON file."""
+    if _path is None:
+        return
+    import json
+    with _lock:
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+            for tid, name in _thread_names.items()
+        ]
+        events = metadata + list(_events)
+    with open(_path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -1,6 +1,102 @@
 import curses
 
-def _calculate_column_widths(stdscr, max_cols, display_list, group_selection_mode):
+from tui_utils import display_width, truncate_to_width, fit_to_width
+from list_view import ListViewport
+
+# Columns of the OTP list whose widths depend on the entries being shown
+LIST_COLUMNS = ("issuer", "name", "groups", "note")
+VAULT_COLUMN = "vault" # Only shown when entries carry a vault label (several vaults open)
+MEASURED_COLUMNS = LIST_COLUMNS + (VAULT_COLUMN,)
+COLUMN_SEPARATOR = "    " # 4 spaces
+
+class ColumnLayout:
+    """
+    Maintains the OTP list column widths and padded row strings across redraws.
+
+    Display widths are measured once per entry. The widest value of each column is
+    kept for a few recent lists (the longest ones when more are shown), so going
+    back to one (clearing a search shows the full list again) costs nothing and
+    entries appended to a list only cost the tail; a new filtered set costs one
+    pass over its measured widths. Padded row fragments are cached by (entry,
+    layout).
+    """
+
+    KEPT_LISTS = 4
+
+    def __init__(self, entry_widths=None):
+        # key -> display widths of MEASURED_COLUMNS; may be shared (EntryTable.display_widths)
+        self._entry_widths = {} if entry_widths is None else entry_widths
+        self._lists = [] # [list, length measured, widest per column], most recent first
+        self._widest = (0,) * len(MEASURED_COLUMNS)
+        self._row_layout = None
+        self._row_cache = {}
+
+    def _widths_for(self, item):
+        widths = self._entry_widths.get(item["key"])
+        if widths is None:
+            widths = tuple(display_width(item.get(column, "")) for column in MEASURED_COLUMNS)
+            self._entry_widths[item["key"]] = widths
+        return widths
+
+    def sync(self, display_list):
+        """Makes max_widths() those of display_list, measuring only entries not seen in it before."""
+        kept = next((kept for kept in self._lists if kept[0] is display_list), None)
+        if kept is None:
+            kept = [display_list, 0, (0,) * len(MEASURED_COLUMNS)]
+        if not self._lists or self._lists[0] is not kept:
+            others = [other for other in self._lists if other is not kept]
+            if len(others) >= self.KEPT_LISTS:
+                others.remove(min(others, key=lambda other: other[1])) # The cheapest to measure again
+            self._lists = [kept] + others
+        _, measured, widest = kept
+        if len(display_list) != measured:
+            if len(display_list) < measured: # Shortened in place: measure it again
+                measured, widest = 0, (0,) * len(MEASURED_COLUMNS)
+            entry_widths = self._entry_widths
+            widths = [entry_widths.get(item["key"]) or self._widths_for(item) for item in display_list[measured:]]
+            if widths:
+                widest = tuple(max(max([w[i] for w in widths]), widest[i]) for i in range(len(widest)))
+            kept[1] = len(display_list)
+            kept[2] = widest
+        self._widest = widest
+
+    def max_widths(self):
+        """Returns the widest issuer, name, groups, note and vault label of the synced list."""
+        return self._widest
+
+    def row_parts(self, item, layout):
+        """
+        Returns (left, code_width, right) for an entry, so that
+        left + code.ljust(code_width) + right is the row clipped to the box.
+        layout is (issuer_len, name_len, code_len, group_len, note_len, inner_width, vault_len).
+        """
+        if layout != self._row_layout:
+            self._row_layout = layout
+            self._row_cache = {}
+        parts = self._row_cache.get(item["key"])
+        if parts is None:
+            issuer_len, name_len, code_len, group_len, note_len, inner_width, vault_len = layout
+            left = (
+                fit_to_width(item["issuer"], issuer_len) + COLUMN_SEPARATOR +
+                fit_to_width(item["name"], name_len) + COLUMN_SEPARATOR
+            )
+            if vault_len:
+                left = fit_to_width(item.get(VAULT_COLUMN, ""), vault_len) + COLUMN_SEPARATOR + left
+            right = (
+                COLUMN_SEPARATOR + fit_to_width(item["groups"], group_len) +
+                COLUMN_SEPARATOR + fit_to_width(item["note"], note_len)
+            )
+            room = inner_width
+            left = truncate_to_width(left, room)
+            room -= display_width(left)
+            code_width = max(0, min(code_len, room))
+            room -= code_width
+            right = truncate_to_width(right, room)
+            parts = (left, code_width, right)
+            self._row_cache[item["key"]] = parts
+        return parts
+
+def _calculate_column_widths(stdscr, max_cols, display_list, group_selection_mode, layout=None, code_len=6):
     """Calculates optimal column widths for TUI display."""
     max_rows, max_cols = stdscr.getmaxyx()
 
@@ -14,21 +110,28 @@ def _calculate_column_widths(stdscr, max_cols, display_list, group_selection_mod
     max_code_len = len("Code")
     max_group_len = len("Group")
     max_note_len = len("Note")
+    max_vault_len = 0 # No vault column unless the entries carry vault labels
 
     if not group_selection_mode:
-        for i, item in enumerate(display_list):
-            if len(item["issuer"]) > max_issuer_len: max_issuer_len = len(item["issuer"])
-            if len(item["name"]) > max_name_len: max_name_len = len(item["name"])
-            if len(item["groups"]) > max_group_len: max_group_len = len(item["groups"])
-            if len(item["note"]) > max_note_len: max_note_len = len(item["note"])
+        if layout is None:
+            layout = ColumnLayout()
+        layout.sync(display_list)
+        issuer_w, name_w, group_w, note_w, vault_w = layout.max_widths()
+        if vault_w:
+            max_vault_len = max(len("Vault"), vault_w)
+        max_issuer_len = max(max_issuer_len, issuer_w)
+        max_name_len = max(max_name_len, name_w)
+        max_group_len = max(max_group_len, group_w)
+        max_note_len = max(max_note_len, note_w)
     else:
          for item in display_list:
-            if len(item["name"]) > max_name_len: max_name_len = len(item["name"])
+            name_w = display_width(item["name"])
+            if name_w > max_name_len: max_name_len = name_w
 
     # Re-adjust max_len for headers to ensure they fit
     max_issuer_len = max(len("Issuer"), max_issuer_len)
     max_name_len = max(len("Name"), max_name_len)
-    max_code_len = 6 # Fixed width for code (usually 6 digits)
+    max_code_len = code_len # Fixed width for code (usually 6 digits, wider with live codes)
     max_group_len = max(len("Group"), max_group_len)
     max_note_len = max(len("Note"), max_note_len)
 
@@ -36,13 +139,18 @@ def _calculate_column_widths(stdscr, max_cols, display_list, group_selection_mod
     # Content starts at col 2.
     inner_box_content_width = max(0, box_width - 4)
 
-    separator_len = 3
+    separator_len = len(COLUMN_SEPARATOR)
     num_separators = 4 # Between 5 columns (Issuer, Name, Code, Group, Note)
     
     # Calculate fixed/base widths
     fixed_otp_display_width = max_code_len + (num_separators * separator_len)
     remaining_dynamic_width = max(0, inner_box_content_width - fixed_otp_display_width)
 
+    if max_vault_len:
+        # Vault: up to 15%, taken before the other columns are distributed
+        max_vault_len = max(1, min(max_vault_len, int(remaining_dynamic_width * 0.15)))
+        remaining_dynamic_width = max(0, remaining_dynamic_width - max_vault_len - separator_len)
+
     if not group_selection_mode:
         # Distribute remaining width
         # Issuer: 25%, Name: 30%, Group: 20%, Note: Rest
@@ -65,18 +173,25 @@ def _calculate_column_widths(stdscr, max_cols, display_list, group_selection_mod
         # Group mode uses simple layout
         pass
 
-    return max_issuer_len, max_name_len, max_code_len, max_group_len, max_note_len, inner_box_content_width
+    return max_issuer_len, max_name_len, max_code_len, max_group_len, max_note_len, inner_box_content_width, max_vault_len
+
+def draw_hud(stdscr, hud_text, colors):
+    """Draws the latency overlay right-aligned on the title row."""
+    max_cols = stdscr.getmaxyx()[1]
+    text = f" {hud_text} "[:max(0, max_cols - 1)]
+    stdscr.addstr(0, max(0, max_cols - 1 - len(text)), text, colors["HIGHLIGHT_COLOR"])
 
 def draw_main_screen(
     stdscr, max_rows, max_cols, display_list, selected_row, search_term,
     current_mode, group_selection_mode, current_group_filter,
     cli_args_group, colors, curses_colors_enabled, scroll_offset=0,
-    in_search_mode=False, status_message=""
+    in_search_mode=False, status_message="", layout=None, viewport=None,
+    code_renderer=None, code_width=6, hud_text="", badge=""
 ):
     NORMAL_TEXT_COLOR = colors["NORMAL_TEXT_COLOR"]
     HIGHLIGHT_COLOR = colors["HIGHLIGHT_COLOR"]
 
-    stdscr.clear()
+    stdscr.erase() # Let curses diff against the previous frame instead of repainting everything
 
     row = 0
     header_row_offset = 0
@@ -92,6 +207,10 @@ def draw_main_screen(
             stdscr.addstr(row, 0, f"--- Group: {cli_args_group} ---")
         else:
             stdscr.addstr(row, 0, "--- All OTPs ---")
+    if badge: # e.g. [unencrypted], after the title
+        title_end = stdscr.getyx()[1] + 1
+        if title_end + len(badge) < max_cols:
+            stdscr.addstr(row, title_end, badge, colors["RED_TEXT_COLOR"])
     row += 1
     header_row_offset = row
 
@@ -120,23 +239,28 @@ def draw_main_screen(
 
     row = header_row_offset + 1
 
+    if layout is None:
+        layout = ColumnLayout()
+
     # Calculate Widths (No Index)
-    max_issuer_len, max_name_len, max_code_len, max_group_len, max_note_len, inner_box_content_width = \
-        _calculate_column_widths(stdscr, max_cols, display_list, group_selection_mode)
+    row_layout = _calculate_column_widths(stdscr, max_cols, display_list, group_selection_mode, layout, code_width)
+    max_issuer_len, max_name_len, max_code_len, max_group_len, max_note_len, inner_box_content_width, max_vault_len = row_layout
 
     # Define Separator Gap
-    sep = "    " # 4 spaces
+    sep = COLUMN_SEPARATOR
 
     if not group_selection_mode:
         # Draw Header
         # Issuer             Name               Code    Group              Note
         header_str = (
-            "Issuer".ljust(max_issuer_len) + sep +
-            "Name".ljust(max_name_len) + sep +
-            "Code".ljust(max_code_len) + sep +
-            "Group".ljust(max_group_len) + sep +
-            "Note".ljust(max_note_len)
+            fit_to_width("Issuer", max_issuer_len) + sep +
+            fit_to_width("Name", max_name_len) + sep +
+            fit_to_width("Code", max_code_len) + sep +
+            fit_to_width("Group", max_group_len) + sep +
+            fit_to_width("Note", max_note_len)
         )
+        if max_vault_len:
+            header_str = fit_to_width("Vault", max_vault_len) + sep + header_str
         stdscr.addstr(row, 2, header_str[:inner_box_content_width], curses.A_BOLD)
         row += 1
 
@@ -148,59 +272,44 @@ def draw_main_screen(
             ("-" * max_group_len) + sep +
             ("-" * max_note_len)
         )
+        if max_vault_len:
+            separator_line = ("-" * max_vault_len) + sep + separator_line
         stdscr.addstr(row, 2, separator_line[:inner_box_content_width], curses.A_DIM)
         row += 1
 
     # Max visible items reduced by header lines
     max_visible_items = max(0, box_height - 2 - (2 if not group_selection_mode else 0))
+    max_visible_items = max(0, min(max_visible_items, max_rows - 2 - row))
+    list_top_row = row
 
+    if viewport is None:
+        viewport = ListViewport(-1 if group_selection_mode else 0)
+        viewport.count = len(display_list)
+        viewport.selected = selected_row
+        viewport.scroll_offset = scroll_offset
+
+    render_cell = None
     if group_selection_mode:
-        total_virtual_items = len(display_list) + 1
-        start_idx = scroll_offset
-        end_idx = min(total_virtual_items, scroll_offset + max_visible_items)
-        
-        for v_idx in range(start_idx, end_idx):
-            if row >= max_rows - 2: break
-            
-            if v_idx == 0:
-                display_attr = HIGHLIGHT_COLOR if selected_row == -1 else NORMAL_TEXT_COLOR
-                all_otps_text = "-- All OTPs --"
-                stdscr.addstr(row, 2, all_otps_text[:inner_box_content_width], display_attr)
-            else:
-                item = display_list[v_idx - 1]
-                is_selected = (selected_row == (v_idx - 1))
-                display_attr = HIGHLIGHT_COLOR if is_selected else NORMAL_TEXT_COLOR
-                
-                # Simple list for groups
-                group_name_str = item["name"][:inner_box_content_width - 2].ljust(inner_box_content_width - 2)
-                stdscr.addstr(row, 2, group_name_str, display_attr)
-            
-            row += 1
+        def render_row(index, is_selected):
+            display_attr = HIGHLIGHT_COLOR if is_selected else NORMAL_TEXT_COLOR
+            if index == -1:
+                return "-- All OTPs --", display_attr
+            # Simple list for groups
+            return fit_to_width(display_list[index]["name"], inner_box_content_width - 2), display_attr
     else:
-        start_idx = scroll_offset
-        end_idx = min(len(display_list), scroll_offset + max_visible_items)
-        
-        for i in range(start_idx, end_idx):
-            if row >= max_rows - 2: break
-            
-            item = display_list[i]
-            display_attr = HIGHLIGHT_COLOR if i == selected_row else NORMAL_TEXT_COLOR
-
-            issuer_str = item["issuer"][:max_issuer_len].ljust(max_issuer_len)
-            name_str = item["name"][:max_name_len].ljust(max_name_len)
-            code_str = "******".ljust(max_code_len) # Placeholder code
-            group_str = item["groups"][:max_group_len].ljust(max_group_len)
-            note_str = item["note"][:max_note_len].ljust(max_note_len)
-
-            line = (
-                issuer_str + sep +
-                name_str + sep +
-                code_str + sep +
-                group_str + sep +
-                note_str
-            )
-            stdscr.addstr(row, 2, line[:inner_box_content_width], display_attr)
-            row += 1
+        def render_row(index, is_selected):
+            item = display_list[index]
+            display_attr = HIGHLIGHT_COLOR if is_selected else NORMAL_TEXT_COLOR
+            left, cell_width, right = layout.row_parts(item, row_layout)
+            code_str = code_renderer(item, is_selected) if code_renderer else "******" # Placeholder code
+            return left + code_str[:cell_width].ljust(cell_width) + right, display_attr
+
+        if code_renderer:
+            def render_cell(index, is_selected):
+                item = display_list[index]
+                display_attr = HIGHLIGHT_COLOR if is_selected else NORMAL_TEXT_COLOR
+                left, cell_width, _ = layout.row_parts(item, row_layout)
+                return display_width(left), code_renderer(item, is_selected)[:cell_width].ljust(cell_width), display_attr
 
     # Prompt
     prompt_row = max_rows - 1
@@ -232,5 +341,12 @@ def draw_main_screen(
         
     stdscr.addstr(max_rows - 2, 0, instruction_text[:max_cols], curses.A_DIM)
 
-    stdscr.refresh()
+    if hud_text:
+        draw_hud(stdscr, hud_text, colors)
+
+    # The list itself is copied in from the viewport's pad on top of the frame
+    stdscr.noutrefresh()
+    viewport.paint(stdscr, list_top_row, 2, max_visible_items, inner_box_content_width, render_row,
+                   display_list, (group_selection_mode, row_layout, code_renderer is not None), render_cell)
+    curses.doupdate()
     return max_visible_items
\ No newline at end of file
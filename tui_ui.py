@@ -1,13 +1,12 @@
 import curses
-try:
-    import pyperclip
-except ImportError:
-    pass
-
+import math
 import time
 import sys
 from typing import Set, Dict, List, Any
 
+from code_cache import CodeCache
+import tracing
+
 # Define color attributes (these will be passed as arguments, no module-level definition)
 
 def display_field(stdscr, label: str, value: Any, row_num: int, col_num: int, max_w: int, attr_to_use: int) -> int:
@@ -18,97 +17,181 @@ def display_field(stdscr, label: str, value: Any, row_num: int, col_num: int, ma
     stdscr.addstr(row_num, col_num, display_line, attr_to_use)
     return row_num + 1 # Return the next row to use
 
-def run_reveal_mode(stdscr, entry_to_reveal: Dict[str, Any], otps: Dict[str, Any], revealed_otps: Set[str], get_ttn_func, current_config: Dict[str, Any], initial_max_rows: int, initial_max_cols: int, curses_colors_enabled: bool, display_list: List[Dict[str, Any]], vault_data, colors: Dict[str, int], pyperclip_available=False) -> tuple[str, bool, int]:
-    # Need to import get_otp here as it's used to regenerate the OTP object
-    from aegis_core import get_otp 
-
+def _reveal_geometry(max_rows: int, max_cols: int) -> Dict[str, int]:
+    """Computes the position of the reveal box and its fields for the given terminal size."""
+    box_height = max(7, max_rows - 2)
+    box_width = max(30, max_cols)
+    if box_height > max_rows: box_height = max_rows
+    if box_width > max_cols: box_width = max_cols
+    start_row = max(0, (max_rows - box_height) // 2)
+    start_col = max(0, (max_cols - box_width) // 2)
+
+    ctrl_row = start_row + box_height
+    ctrl_inside_box = ctrl_row >= max_rows
+    if ctrl_inside_box:
+        ctrl_row = start_row + box_height - 2 # Fall back to the last line inside the box
+
+    first_field_row = start_row + 3
+    return {
+        "max_rows": max_rows,
+        "max_cols": max_cols,
+        "start_row": start_row,
+        "start_col": start_col,
+        "box_height": box_height,
+        "box_width": box_width,
+        "field_col": start_col + 2,
+        "inner_width": max(0, box_width - 4),
+        "code_row": first_field_row + 4, # After Issuer, Name, Group and Note
+        "ttn_row": first_field_row + 5,
+        "ctrl_row": ctrl_row,
+        "ctrl_inside_box": ctrl_inside_box,
+    }
+
+def _draw_reveal_static(stdscr, geo: Dict[str, int], entry_to_reveal: Dict[str, Any], colors: Dict[str, int], curses_colors_enabled: bool):
+    """Draws the box, title and the fields that never change while an entry is revealed."""
+    NORMAL_TEXT_COLOR = colors["NORMAL_TEXT_COLOR"]
+    BOLD_WHITE_COLOR = colors["BOLD_WHITE_COLOR"]
+    top, left = geo["start_row"], geo["start_col"]
+    height, width = geo["box_height"], geo["box_width"]
+
+    stdscr.erase()
+    stdscr.addch(top, left, curses.ACS_ULCORNER)
+    stdscr.hline(top, left + 1, curses.ACS_HLINE, width - 2)
+    stdscr.addch(top, left + width - 1, curses.ACS_URCORNER)
+    for r in range(top + 1, top + height - 1):
+        stdscr.addch(r, left, curses.ACS_VLINE)
+        stdscr.addch(r, left + width - 1, curses.ACS_VLINE)
+    stdscr.addch(top + height - 1, left, curses.ACS_LLCORNER)
+    stdscr.hline(top + height - 1, left + 1, curses.ACS_HLINE, width - 2)
+    stdscr.addch(top + height - 1, left + width - 1, curses.ACS_LRCORNER)
+
+    header_text = f"--- Revealed OTP: {entry_to_reveal['name']} ---"[:geo["inner_width"]]
+    stdscr.addstr(top + 1, left + max(1, (width - len(header_text)) // 2), header_text,
+                  BOLD_WHITE_COLOR if curses_colors_enabled else curses.A_BOLD)
+
+    row = top + 3
+    for label, key in (("Issuer", "issuer"), ("Name", "name"), ("Group", "groups"), ("Note", "note")):
+        if row >= top + height - 1:
+            break
+        row = display_field(stdscr, label, entry_to_reveal[key], row, geo["field_col"], geo["inner_width"], NORMAL_TEXT_COLOR)
+
+def run_reveal_mode(stdscr, entry_to_reveal: Dict[str, Any], otps: Dict[str, Any], revealed_otps: Set[str], current_config: Dict[str, Any], initial_max_rows: int, initial_max_cols: int, curses_colors_enabled: bool, display_list: List[Dict[str, Any]], vault_data, colors: Dict[str, int], clipboard=None, clock=time.time, usage=None) -> tuple[str, bool, int]:
+    """
+    Shows a single entry with its code and countdown.
+
+    The screen is driven by explicit ticks: the countdown is redrawn once per
+    second, the code is recomputed only when its period window rolls over, and
+    between ticks the loop blocks in getch() with a timeout. The countdown follows
+    the entry's own period. clock can be replaced to drive the screen from a
+    simulated time source. Enter or Ctrl+C
+    copies the code through clipboard, whose completion shows on the control line.
+    Copies are counted in usage (a UsageStore), if given.
+    """
     NORMAL_TEXT_COLOR = colors["NORMAL_TEXT_COLOR"]
-    HIGHLIGHT_COLOR = colors["HIGHLIGHT_COLOR"]
     REVEAL_HIGHLIGHT_COLOR = colors["REVEAL_HIGHLIGHT_COLOR"]
     RED_TEXT_COLOR = colors["RED_TEXT_COLOR"]
-    BOLD_WHITE_COLOR = colors["BOLD_WHITE_COLOR"]
 
     current_mode = "reveal"
     running = True
-    max_rows, max_cols = initial_max_rows, initial_max_cols # Initial dimensions
     selected_row = 0 # Default to first item in reveal display
-    
+
     feedback_msg = ""
     feedback_expiry = 0
-    
-    last_activity_time = time.time()
+
     TIMEOUT_SECONDS = 60
     WARNING_SECONDS = 10
 
-    stdscr.nodelay(True) # Make getch non-blocking
+    code_cache = CodeCache(otps)
+    key = entry_to_reveal["key"]
 
-    # Initial full redraw for reveal mode
-    # This will draw the box and all static content once.
-    stdscr.clear()
+    now = clock()
+    last_activity_time = now
+    geo = _reveal_geometry(initial_max_rows, initial_max_cols)
+    _draw_reveal_static(stdscr, geo, entry_to_reveal, colors, curses_colors_enabled)
 
-    # ... (Keep existing layout logic) ...
+    # What is currently on screen, so each tick only rewrites what changed
+    shown_code = None
+    shown_ttn = None
+    shown_ctrl = None
+    key_started = None # Trace start of the keystroke being handled, until its refresh
 
     while current_mode == "reveal" and running:
-        current_time = time.time()
-        
-        # Check Inactivity Timeout
-        elapsed_idle = current_time - last_activity_time
-        remaining_idle = TIMEOUT_SECONDS - elapsed_idle
-        
+        # --- Tick: bring the dynamic fields up to date ---
+        remaining_idle = TIMEOUT_SECONDS - (now - last_activity_time)
         if remaining_idle <= 0:
             current_mode = "search"
             revealed_otps.clear()
             break
 
-        # Check if OTP needs to be refreshed
-        time_to_next_ms = get_ttn_func()
-        if time_to_next_ms <= 0: # OTP has expired or is about to expire
-            # ... (Keep existing OTP refresh logic) ...
-            if new_otp_code != otp_to_reveal_string: # Only redraw if the code has actually changed
-                otp_to_reveal_string = new_otp_code
-                # Clear the old OTP Code line before redrawing
-                otp_code_display_row_current = ttn_display_row - 1 # Recalculate based on current ttn_display_row
-                # Removed clrtoeol to protect border
-                display_field(stdscr, "OTP Code", otp_to_reveal_string, otp_code_display_row_current, field_col, inner_width, REVEAL_HIGHLIGHT_COLOR)
-
-        # Only update the "Time to Next" field
-        current_ttn_value_seconds = time_to_next_ms / 1000
-        ttn_attr = RED_TEXT_COLOR if current_ttn_value_seconds < 10 else NORMAL_TEXT_COLOR
-        current_ttn_value = f"{current_ttn_value_seconds:.0f}s" # Format to 0 decimal places
-        # Clear the old "Time to Next" line before redrawing
-        # Removed clrtoeol to protect border. display_field now handles padding.
-        display_field(stdscr, "Next code refresh in", current_ttn_value, ttn_display_row, field_col, inner_width, ttn_attr)
-        
-        # Display Controls or Feedback
-        ctrl_msg = "Ctrl+C: Copy | Ctrl+Q: Exit | ESC: Return"
-        
-        # Append warning if timeout is imminent
-        if remaining_idle <= WARNING_SECONDS:
-            ctrl_msg += f" | Timeout in {int(remaining_idle)}s"
-
-        if feedback_expiry > current_time:
-             ctrl_msg = feedback_msg
-        
-        ctrl_row = reveal_start_row + reveal_box_height
-        # Clear line before printing control message to handle varying lengths
-        if ctrl_row < max_rows:
-            stdscr.move(ctrl_row, 0)
-            stdscr.clrtoeol()
-            stdscr.addstr(ctrl_row, reveal_start_col, ctrl_msg, NORMAL_TEXT_COLOR if remaining_idle > WARNING_SECONDS else RED_TEXT_COLOR)
+        current = code_cache.get(key, now) # Recomputes only when the period window rolled over
+        if current is None:
+            otp_string, remaining, period = "Unavailable", 0, 0
+        else:
+            otp_string, remaining, period = current
+
+        changed = False
+        if otp_string != shown_code and geo["code_row"] < geo["start_row"] + geo["box_height"] - 1:
+            display_field(stdscr, "OTP Code", otp_string, geo["code_row"], geo["field_col"], geo["inner_width"], REVEAL_HIGHLIGHT_COLOR)
+            shown_code = otp_string
+            changed = True
+
+        if period:
+            seconds_left = int(math.ceil(remaining))
+            ttn = (f"{seconds_left}s", RED_TEXT_COLOR if seconds_left < 10 else NORMAL_TEXT_COLOR)
         else:
-             # Inside box fallback
-            stdscr.move(reveal_start_row + reveal_box_height - 2, reveal_start_col + 2)
-            # Need to clear strictly inside
-            blank = " " * (reveal_box_width - 4)
-            stdscr.addstr(reveal_start_row + reveal_box_height - 2, reveal_start_col + 2, blank, NORMAL_TEXT_COLOR)
-            stdscr.addstr(reveal_start_row + reveal_box_height - 2, reveal_start_col + 2, ctrl_msg[:reveal_box_width-4], NORMAL_TEXT_COLOR if remaining_idle > WARNING_SECONDS else RED_TEXT_COLOR)
+            ttn = ("n/a (counter based)", NORMAL_TEXT_COLOR)
+        if ttn != shown_ttn and geo["ttn_row"] < geo["start_row"] + geo["box_height"] - 1:
+            display_field(stdscr, "Next code refresh in", ttn[0], geo["ttn_row"], geo["field_col"], geo["inner_width"], ttn[1])
+            shown_ttn = ttn
+            changed = True
+
+        if clipboard is not None:
+            clipboard_message = clipboard.poll()
+            if clipboard_message:
+                feedback_msg = clipboard_message
+                feedback_expiry = now + 2
 
-        stdscr.refresh() # Only refresh the updated portion
+        # Display Controls or Feedback
+        if clipboard is not None and clipboard.available:
+            ctrl_msg = "Press <Enter> to copy the OTP code to the clipboard. | Ctrl+Q: Exit | ESC: Return"
+        else:
+            ctrl_msg = "Ctrl+Q: Exit | ESC: Return"
+        if remaining_idle <= WARNING_SECONDS:
+            ctrl_msg += f" | Timeout in {int(math.ceil(remaining_idle))}s"
+        if feedback_expiry > now:
+            ctrl_msg = feedback_msg
+        ctrl = (ctrl_msg, NORMAL_TEXT_COLOR if remaining_idle > WARNING_SECONDS else RED_TEXT_COLOR)
+        if ctrl != shown_ctrl:
+            _draw_control_line(stdscr, geo, ctrl[0], ctrl[1])
+            shown_ctrl = ctrl
+            changed = True
+
+        if changed:
+            stdscr.refresh()
+        if key_started is not None:
+            tracing.complete("reveal_key_to_refresh", key_started, {"key": reveal_char})
+            key_started = None
+
+        # --- Wait for input until the next deadline, without busy-waiting ---
+        deadlines = [math.floor(now) + 1, last_activity_time + TIMEOUT_SECONDS]
+        if period:
+            deadlines.append(now + remaining) # Window boundary
+        if feedback_expiry > now:
+            deadlines.append(feedback_expiry)
+        if clipboard is not None and clipboard.busy():
+            deadlines.append(now + 0.05) # Pick up the copy's completion message promptly
+        wait_ms = int(math.ceil((min(deadlines) - now) * 1000))
+        stdscr.timeout(max(1, wait_ms))
 
         reveal_char = stdscr.getch()
-        
-        if reveal_char != curses.ERR:
-            last_activity_time = time.time() # Reset inactivity timer on any input
+        now = clock()
+
+        if reveal_char == curses.ERR:
+            continue # Timed out: next tick
+        if tracing.enabled:
+            key_started = tracing.now_us()
+
+        last_activity_time = now # Reset inactivity timer on any input
 
         if reveal_char == 27: # ESC key
             current_mode = "search"
@@ -118,77 +201,36 @@ def run_reveal_mode(stdscr, entry_to_reveal: Dict[str, Any], otps: Dict[str, Any
         elif reveal_char == 17: # Ctrl+Q
             running = False
             break
-        elif reveal_char == 3: # Ctrl+C
+        elif reveal_char in (3, 10, 13, curses.KEY_ENTER): # Ctrl+C or Enter
              # Copy Logic
-             if pyperclip_available:
-                 try:
-                     pyperclip.copy(otp_to_reveal_string)
-                     feedback_msg = "Copied to clipboard!"
-                     feedback_expiry = time.time() + 2
-                 except Exception:
-                     feedback_msg = "Copy failed."
-                     feedback_expiry = time.time() + 2
-             else:
+             current = code_cache.get(key, now) # The code at the time of the key press, drawn or not
+             if clipboard is None or not clipboard.available:
                  feedback_msg = "Clipboard unavailable."
-                 feedback_expiry = time.time() + 2
-        
+             elif current is None:
+                 feedback_msg = "No code for this entry."
+             else:
+                 clipboard.copy(current[0]) # Completes in the background
+                 feedback_msg = "Copying..."
+                 if usage is not None:
+                     usage.record(entry_to_reveal["uuid"])
+             feedback_expiry = now + 2
         elif reveal_char == curses.KEY_RESIZE: # Handle terminal resize event
-            # ... (Rest of resize logic is implicit, but I need to make sure I don't cut off the function)
-            max_rows, max_cols = stdscr.getmaxyx() # Update dimensions
-            # Trigger a full redraw for reveal mode by clearing and redrawing all static and dynamic elements
+            max_rows, max_cols = stdscr.getmaxyx()
+            geo = _reveal_geometry(max_rows, max_cols)
             stdscr.clear()
-            # Re-calculate and redraw static elements of the box and fields
-            reveal_box_height = max(7, max_rows - 2)
-            reveal_box_width = max(30, max_cols)
-            reveal_start_row = (max_rows - reveal_box_height) // 2
-            reveal_start_col = (max_cols - reveal_box_width) // 2
-            if reveal_start_row < 0: reveal_start_row = 0
-            if reveal_start_col < 0: reveal_start_col = 0
-            if reveal_box_height > max_rows: reveal_box_height = max_rows
-            if reveal_box_width > max_cols: reveal_box_width = max_cols
-
-            stdscr.addch(reveal_start_row, reveal_start_col, curses.ACS_ULCORNER)
-            stdscr.hline(reveal_start_row, reveal_start_col + 1, curses.ACS_HLINE, reveal_box_width - 2)
-            stdscr.addch(reveal_start_row, reveal_start_col + reveal_box_width - 1, curses.ACS_URCORNER)
-            for r in range(reveal_start_row + 1, reveal_start_row + reveal_box_height - 1):
-                stdscr.addch(r, reveal_start_col, curses.ACS_VLINE)
-                stdscr.addch(r, reveal_start_col + reveal_box_width - 1, curses.ACS_VLINE)
-            stdscr.addch(reveal_start_row + reveal_box_height - 1, reveal_start_col, curses.ACS_LLCORNER)
-            stdscr.hline(reveal_start_row + reveal_box_height - 1, reveal_start_col + 1, curses.ACS_HLINE, reveal_box_width - 2)
-            stdscr.addch(reveal_start_row + reveal_box_height - 1, reveal_start_col + reveal_box_width - 1, curses.ACS_LRCORNER)
-
-            header_text = f"--- Revealed OTP: {entry_to_reveal['name']} ---"
-            stdscr.addstr(reveal_start_row + 1, reveal_start_col + (reveal_box_width - len(header_text)) // 2, header_text, BOLD_WHITE_COLOR if curses_colors_enabled else curses.A_BOLD)
-            
-            display_row_static = reveal_start_row + 3
-            display_row_static = display_field(stdscr, "Issuer", entry_to_reveal["issuer"], display_row_static, field_col, inner_width, NORMAL_TEXT_COLOR)
-            display_row_static = display_field(stdscr, "Name", entry_to_reveal["name"], display_row_static, field_col, inner_width, NORMAL_TEXT_COLOR)
-            display_row_static = display_field(stdscr, "Group", entry_to_reveal["groups"], display_row_static, field_col, inner_width, NORMAL_TEXT_COLOR)
-            display_row_static = display_field(stdscr, "Note", entry_to_reveal["note"], display_row_static, field_col, inner_width, NORMAL_TEXT_COLOR)
-            otp_code_display_row_static = display_row_static # Store the row for OTP Code for selective updates on resize
-            display_row_static = display_field(stdscr, "OTP Code", otp_to_reveal_string, otp_code_display_row_static, field_col, inner_width, REVEAL_HIGHLIGHT_COLOR)
-            ttn_display_row = display_row_static # Update ttn_display_row after redraw
-            
-            # Note: Control message is handled in the loop logic now
-
-            stdscr.refresh()
-
-        elif reveal_char != curses.ERR: # Any other key press, clear revealed OTP and return to search
-            # Optional: Allow j/k to scroll if we implemented scrolling, but for now just exit on other keys or ignore?
-            # Original logic was: any key exits.
-            # New logic: Only Esc exits? Or any key?
-            # User wants j/k nav in search mode. In reveal mode, usually static.
-            # Let's keep "Esc to return" strict? Or any key?
-            # Ctrl+C/Q are handled.
-            # Let's default to: Esc returns. Other keys ignored?
-            # The prompt says "Press ESC to return".
-            # If I make *any* key return, Ctrl+C handling might be tricky if not prioritized.
-            # I handled Ctrl+C/Q specifically.
-            # Let's ignore other keys to prevent accidental exit when trying to copy.
-            pass
-        
-        # Add a small delay if no key was pressed to prevent CPU from spinning
-        if reveal_char == curses.ERR:
-            time.sleep(0.01) # Shorter sleep for reveal mode responsiveness
+            _draw_reveal_static(stdscr, geo, entry_to_reveal, colors, curses_colors_enabled)
+            shown_code = shown_ttn = shown_ctrl = None # Everything dynamic is redrawn on the next tick
+        # Other keys are ignored to prevent accidental exit when trying to copy.
 
+    stdscr.timeout(-1)
     return current_mode, running, selected_row # Return selected_row as well
+
+def _draw_control_line(stdscr, geo: Dict[str, int], ctrl_msg: str, attr: int):
+    """Draws the control/feedback line below the box (or inside it on short terminals)."""
+    if not geo["ctrl_inside_box"]:
+        stdscr.move(geo["ctrl_row"], 0)
+        stdscr.clrtoeol()
+        stdscr.addstr(geo["ctrl_row"], geo["start_col"], ctrl_msg[:max(0, geo["max_cols"] - geo["start_col"] - 1)], attr)
+    else:
+        width = max(0, geo["box_width"] - 4)
+        stdscr.addstr(geo["ctrl_row"], geo["start_col"] + 2, ctrl_msg[:width].ljust(width), attr)
@@ -1,4 +1,6 @@
 import curses
+import unicodedata
+from functools import lru_cache
 
 def init_colors(stdscr, no_color_arg):
     """
@@ -39,3 +41,47 @@ def init_colors(stdscr, no_color_arg):
         "RED_TEXT_COLOR": RED_TEXT_COLOR,
         "BOLD_WHITE_COLOR": BOLD_WHITE_COLOR
     }, curses_colors_enabled
+
+
+@lru_cache(maxsize=4096)
+def char_width(ch):
+    """Returns the number of terminal cells a character occupies, wcwidth-style."""
+    code = ord(ch)
+    if code < 32 or 0x7f <= code < 0xa0:
+        return 0
+    if code < 0x300:
+        return 1
+    if unicodedata.combining(ch) or unicodedata.category(ch) in ("Mn", "Me", "Cf"):
+        return 0
+    if unicodedata.east_asian_width(ch) in ("W", "F"):
+        return 2
+    return 1
+
+def display_width(text):
+    """Returns the terminal display width of a string (CJK and emoji count as 2 cells)."""
+    if text.isascii():
+        return len(text)
+    return sum(char_width(ch) for ch in text)
+
+def truncate_to_width(text, width):
+    """Returns the longest prefix of text that fits in the given number of cells."""
+    if width <= 0:
+        return ""
+    if text.isascii():
+        return text[:width]
+    used = 0
+    for i, ch in enumerate(text):
+        w = char_width(ch)
+        if used + w > width:
+            return text[:i]
+        used += w
+    return text
+
+def fit_to_width(text, width):
+    """Truncates or pads text with spaces so it occupies exactly `width` cells."""
+    if width <= 0:
+        return ""
+    if text.isascii():
+        return text[:width].ljust(width)
+    clipped = truncate_to_width(text, width)
+    return clipped + " " * (width - display_width(clipped))
@@ -0,0 +1,70 @@
+import threading
+import time
+from typing import Dict, Optional
+
+from aegis_core import unlock_vault
+from vault import VaultFormatError
+
+SPINNER_FRAMES = "|/-\\"
+SPINNER_INTERVAL_MS = 100
+UNLOCK_STAGES = (("kdf", "KDF"), ("unwrap", "unwrap"), ("read", "read wait"), ("decrypt", "decrypt"), ("parse", "parse"))
+
+def format_unlock_timings(timings: Dict[str, float]) -> str:
+    """Summarises the stage timings of an unlock, e.g. 'Unlocked in 68 ms (KDF 64 ms, unwrap 1 ms, ...)'."""
+    stages = ", ".join(f"{label} {timings[key] * 1000:.0f} ms" for key, label in UNLOCK_STAGES if key in timings)
+    return f"Unlocked in {sum(timings.values()) * 1000:.0f} ms ({stages})"
+
+def run_unlock_mode(stdscr, vault_enc, password: str, row: int, colors: Dict[str, int]) -> tuple:
+    """
+    Unlocks the vault in a worker thread while animating a progress line at row.
+
+    ESC or Ctrl+C cancels the wait. Returns (vault_data, error, timings, cancelled);
+    error is the ValueError of a wrong password. Any other error, e.g. the
+    VaultFormatError of a truncated file, is re-raised here.
+    """
+    NORMAL_TEXT_COLOR = colors["NORMAL_TEXT_COLOR"]
+    max_cols = stdscr.getmaxyx()[1]
+
+    timings = {}
+    outcome = {}
+    def work():
+        try:
+            outcome["vault"] = unlock_vault(vault_enc, password, timings)
+        except Exception as e:
+            outcome["error"] = e
+
+    # A daemon thread: scrypt cannot be interrupted, so a cancelled unlock is
+    # simply abandoned instead of holding up the exit of the application.
+    worker = threading.Thread(target=work, name="unlock-vault", daemon=True)
+    started = time.monotonic()
+    worker.start()
+
+    cancelled = False
+    frame = 0
+    stdscr.timeout(SPINNER_INTERVAL_MS)
+    try:
+        while worker.is_alive():
+            elapsed = time.monotonic() - started
+            line = f"{SPINNER_FRAMES[frame % len(SPINNER_FRAMES)]} Unlocking vault... {elapsed:.1f}s (ESC to cancel)"
+            stdscr.move(row, 0)
+            stdscr.clrtoeol()
+            stdscr.addstr(row, 0, line[:max_cols - 1], NORMAL_TEXT_COLOR)
+            stdscr.refresh()
+            frame += 1
+
+            if stdscr.getch() == 27: # ESC
+                cancelled = True
+                break
+    except KeyboardInterrupt:
+        cancelled = True
+    finally:
+        stdscr.timeout(-1)
+        stdscr.move(row, 0)
+        stdscr.clrtoeol()
+
+    if cancelled:
+        return None, None, timings, True
+    error: Optional[Exception] = outcome.get("error")
+    if error is not None and (not isinstance(error, ValueError) or isinstance(error, VaultFormatError)):
+        raise error
+    return outcome.get("vault"), error, timings, False
@@ -0,0 +1,162 @@
+import math
+import os
+import queue
+import tempfile
+import threading
+import time
+from typing import Dict, List, Tuple
+
+import json_codec
+from config import DEFAULT_AEGIS_VAULT_DIR
+
+USAGE_FILE_PATH = os.path.join(DEFAULT_AEGIS_VAULT_DIR, "usage.json")
+USAGE_FORMAT_VERSION = 1
+HALF_LIFE_DAYS = 14.0 # A use counts half as much two weeks later
+PRUNE_SCORE = 0.05 # Entries that decayed below this (a single use, two months on) are dropped
+MAX_ENTRIES = 1000 # The highest scores kept when saving
+REBASE_HALF_LIVES = 64 # Stored values are rescaled before they grow past 2**64
+SAVE_TIMEOUT_SECONDS = 2
+
+class UsageStore:
+    """
+    Decayed usage frequency and last use of entries, by entry uuid, recorded
+    on reveals and copies and kept in ~/.config/aegis-tui/usage.json.
+
+    Each use adds 2**((t - epoch) / half_life) to the entry's value instead of
+    decaying every score over time, so comparing entries is a dict lookup and
+    loading the store decays nothing. The current score is the value scaled
+    back by 2**(-(now - epoch) / half_life).
+
+    Saves are handed to one background thread and written to a temporary file
+    that replaces the store, so the UI never waits and the file is never torn.
+    Only the newest pending save is written.
+    """
+
+    def __init__(self, path: str = USAGE_FILE_PATH, half_life_days: float = HALF_LIFE_DAYS, clock=time.time):
+        self.path = path
+        self.half_life = half_life_days * 86400
+        self.clock = clock
+        self.epoch = clock()
+        self._entries: Dict[str, List[float]] = {} # uuid -> [value, last used]
+        self.changes = 0 # Uses recorded since loading, so views know when to re-sort
+        self._saves = queue.SimpleQueue() # Snapshots to write, None to stop
+        self._lock = threading.Lock()
+        self._worker = None
+
+    @classmethod
+    def load(cls, path: str = USAGE_FILE_PATH, **kwargs) -> "UsageStore":
+        """The saved store, or an empty one if there is none or it cannot be read."""
+        store = cls(path, **kwargs)
+        try:
+            data = json_codec.load_file(path)
+            if data.get("version") == USAGE_FORMAT_VERSION:
+                store.epoch = float(data["epoch"])
+                store._entries = {uuid: [float(value), float(last)] for uuid, (value, last) in data["entries"].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass # Usage only orders the list; start over
+        return store
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, uuid: str):
+        """Counts one use (a reveal or a copy) of the entry now, and saves in the background."""
+        now = self.clock()
+        if (now - self.epoch) / self.half_life > REBASE_HALF_LIVES:
+            self._rebase(now)
+        entry = self._entries.setdefault(uuid, [0.0, now])
+        entry[0] += 2 ** ((now - self.epoch) / self.half_life)
+        entry[1] = now
+        self.changes += 1
+        self.save()
+
+    def score(self, uuid: str) -> float:
+        """Decayed number of uses: 1.0 right after a single use, 0.5 one half-life later."""
+        entry = self._entries.get(uuid)
+        if entry is None:
+            return 0.0
+        return entry[0] * 2 ** (-(self.clock() - self.epoch) / self.half_life)
+
+    def rank(self, uuid: str) -> Tuple[float, float]:
+        """Sort key: most used first, then most recently used; unused entries last."""
+        entry = self._entries.get(uuid)
+        return (-entry[0], -entry[1]) if entry is not None else (0.0, 0.0)
+
+    def order(self, items: List[Dict]) -> List[Dict]:
+        """items (dicts with a uuid) by rank; a stable sort, so equal ranks keep their order."""
+        if not self._entries:
+            return items
+        return sorted(items, key=lambda item: self.rank(item["uuid"]))
+
+    def _rebase(self, now: float):
+        scale = 2 ** (-(now - self.epoch) / self.half_life)
+        for entry in self._entries.values():
+            entry[0] *= scale
+        self.epoch = now
+
+    def snapshot(self) -> Dict:
+        """What is saved: entries that have not decayed away, at most MAX_ENTRIES of them."""
+        floor = PRUNE_SCORE * 2 ** ((self.clock() - self.epoch) / self.half_life)
+        kept = [(uuid, entry) for uuid, entry in self._entries.items() if entry[0] >= floor]
+        if len(kept) > MAX_ENTRIES:
+            kept = sorted(kept, key=lambda item: -item[1][0])[:MAX_ENTRIES]
+        self._entries = dict(kept)
+        return {
+            "version": USAGE_FORMAT_VERSION,
+            "epoch": self.epoch,
+            "entries": {uuid: [float(f"{value:.6g}"), math.floor(last)] for uuid, (value, last) in kept},
+        }
+
+    # --- Background saving ---
+
+    def save(self):
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="usage-store", daemon=True)
+                self._worker.start()
+        self._saves.put(self.snapshot())
+
+    def close(self):
+        """Waits (briefly) for the pending save to be written."""
+        if self._worker is not None:
+            self._saves.put(None)
+            self._worker.join(SAVE_TIMEOUT_SECONDS)
+
+    def _run(self):
+        while True:
+            snapshot = self._saves.get()
+            # Skip to the newest snapshot; older ones would be overwritten anyway
+            stop = snapshot is None
+            while True:
+                try:
+                    newer = self._saves.get_nowait()
+                except queue.Empty:
+                    break
+                if newer is None:
+                    stop = True
+                else:
+                    snapshot = newer
+            if snapshot is not None:
+                try:
+                    self._write(snapshot)
+                except OSError:
+                    pass # Usage only orders the list; the next use saves again
+            if stop:
+                return
+
+    def _write(self, snapshot: Dict):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".usage-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json_codec.dumps(snapshot))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
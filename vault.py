@@ -1,13 +1,44 @@
 import json
+import re
+import threading
+import time
 import base64
 import binascii
+from concurrent.futures import Future
 from dataclasses import dataclass, field, is_dataclass
-from typing import List, Optional, Union, get_origin, get_args
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union, get_origin, get_args
 
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.backends import default_backend
+import json_codec
+import tracing
+
+# The start of an icon payload in the decrypted vault JSON. Quotes inside JSON strings
+# are always escaped, so an unescaped "icon" followed by a colon can only be the key.
+ICON_KEY_PATTERN = re.compile(rb'"icon"\s*:\s*"')
+STREAM_CHUNK_SIZE = 256 * 1024
+DECRYPT_CHUNK_SIZE = 64 * 1024 # Base64 characters per decryptor update; a multiple of 4
+ICON_KEY_LOOKBEHIND = 32 # Tail of a plaintext chunk held back in case an icon key is cut in two
+JSON_WHITESPACE = b" \t\r\n"
+BASE64_WHITESPACE = re.compile(rb"\s+") # Line breaks of wrapped base64
+# The end of an array of objects, e.g. the entries. Entries hold no arrays of
+# objects, so outside strings this only matches where the entries (or groups) end.
+ARRAY_END_PATTERN = re.compile(rb"}\s*]")
+
+class VaultFormatError(ValueError):
+    """
+    The vault file is truncated, malformed, tampered with or could not be read.
+    Unlike a wrong password, trying again cannot help.
+    """
+
+# The contents failed GCM authentication with a master key that unwrapped fine
+TAMPERED_VAULT_MESSAGE = "The vault is corrupt or has been tampered with"
+
+def _format_error(e: Exception, what: str) -> VaultFormatError:
+    """e as a VaultFormatError, e.g. an OSError of the reading thread."""
+    if isinstance(e, VaultFormatError):
+        return e
+    error = VaultFormatError(f"{what}: {e}")
+    error.__cause__ = e
+    return error
 
 @dataclass
 class Params:
@@ -69,24 +100,194 @@ class Db:
 @dataclass
 class Vault:
     version: int
-    header: Header
+    header: Optional[Header] # None for a plaintext export
     db: Db
+    # Icons left out of the parse, loaded on demand (None when they were parsed)
+    icons: Optional["IconStore"] = field(default=None, repr=False, compare=False)
+    # False for a plaintext export, opened without a password
+    encrypted: bool = field(default=True, compare=False)
+
+class IconStore:
+    """
+    Icon payloads left out of the parse. Only their byte ranges are kept: in the
+    file for a plaintext export, in the decrypted contents for an encrypted vault.
+    The vault file is read again when icons are asked for, which for an encrypted
+    vault takes its master key again (VaultEncrypted.find_master_key()): neither
+    the ciphertext nor the key is kept for the session. Identical icons (same
+    icon_hash) share one decoded string.
+    """
+
+    def __init__(self, load_content: Callable[[Optional[bytes]], bytes], spans: List[Tuple[int, int]]):
+        self._load_content = load_content
+        self._spans = spans
+        self._refs: Dict[str, int] = {} # Entry uuid -> index into spans
+        self._by_hash: Dict[str, str] = {}
+
+    def adopt(self, entries: List[Entry]):
+        """Moves the icon indexes strip_icons() left in Entry.icon into the store."""
+        for entry in entries:
+            if isinstance(entry.icon, int):
+                self._refs[entry.uuid] = entry.icon
+                entry.icon = None
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def has_icon(self, entry: Entry) -> bool:
+        return entry.uuid in self._refs
+
+    def get(self, entry: Entry, master_key: Optional[bytes] = None) -> Optional[str]:
+        return self.load([entry], master_key).get(entry.uuid)
+
+    def load(self, entries: List[Entry], master_key: Optional[bytes] = None) -> Dict[str, str]:
+        """The base64 icons of entries, by uuid, reading (and decrypting) the vault file at most once."""
+        icons = {}
+        content = None
+        for entry in entries:
+            index = self._refs.get(entry.uuid)
+            if index is None:
+                continue
+            icon = self._by_hash.get(entry.icon_hash) if entry.icon_hash else None
+            if icon is None:
+                if content is None:
+                    content = self._load_content(master_key)
+                start, end = self._spans[index]
+                icon = json_codec.loads(content[start - 1:end + 1]) # The payload with its quotes, unescaped
+                if entry.icon_hash:
+                    self._by_hash[entry.icon_hash] = icon
+            icons[entry.uuid] = icon
+        return icons
+
+def _closing_quote(data, start: int) -> int:
+    """Index of the quote closing a JSON string whose contents start at start, or -1 if it is not in data yet."""
+    end = start
+    while True:
+        end = data.find(b'"', end)
+        if end < 0:
+            return -1
+        backslashes = 0
+        while data[end - 1 - backslashes] == 0x5C:
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return end
+        end += 1
+
+class IconStripper:
+    """
+    Replaces every icon payload in decrypted vault JSON by its index, so the
+    payloads are never decoded, and records their byte ranges for IconStore.
+    Takes the plaintext in chunks: a payload cut across chunks is held back
+    until it is complete.
+    """
+
+    def __init__(self, offset: int = 0):
+        self.spans: List[Tuple[int, int]] = []
+        self._pending = b""
+        self._offset = offset # Position of _pending in the whole plaintext
+
+    def feed(self, data: bytes, final: bool = False) -> bytes:
+        buf = self._pending + data if self._pending else data
+        parts = []
+        copied = 0
+        hold = len(buf) if final else max(0, len(buf) - ICON_KEY_LOOKBEHIND)
+        for match in ICON_KEY_PATTERN.finditer(buf):
+            start = match.end()
+            end = _closing_quote(buf, start)
+            if end < 0:
+                if final:
+                    raise VaultFormatError("Unterminated icon in vault contents")
+                hold = match.start()
+                break
+            if end == start:
+                continue # An empty icon stays as it is
+            parts += [buf[copied:match.start()], b'"icon":%d' % len(self.spans)]
+            self.spans.append((self._offset + start, self._offset + end))
+            copied = end + 1
+        hold = max(hold, copied)
+        parts.append(buf[copied:hold])
+        self._pending = buf[hold:]
+        self._offset += hold
+        return b"".join(parts)
+
+def strip_icons(content: bytes) -> Tuple[bytes, List[Tuple[int, int]]]:
+    """IconStripper over a whole plaintext: returns the smaller JSON and the payloads' byte ranges."""
+    stripper = IconStripper()
+    return stripper.feed(content, final=True), stripper.spans
+
+def share_icons(entries: List[Entry]):
+    """Makes entries with the same icon_hash share one icon string."""
+    shared: Dict[str, str] = {}
+    for entry in entries:
+        if entry.icon and entry.icon_hash:
+            entry.icon = shared.setdefault(entry.icon_hash, entry.icon)
 
 @dataclass
 class VaultEncrypted:
     version: int
     header: Header
-    db: str
+    db: Union[str, bytearray] # Base64; bytes when streamed from the file
+    # Hex-decoded slot and header parameters, filled in by prepare()
+    _decoded: dict = field(default_factory=dict, init=False, repr=False, compare=False)
+    # The db payload while it is still being read by stream_vault_file()
+    _db_pending: Optional[Future] = field(default=None, init=False, repr=False, compare=False)
+    # The file it was read from, where icons are read back from; None when built from a dict
+    path: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def load_db(self) -> Union[str, bytearray]:
+        """The base64 db payload, waiting for the rest of the file if it is still being read."""
+        if self._db_pending is not None:
+            with tracing.span("read_wait"):
+                self.db = self._db_pending.result()
+            self._db_pending = None
+        return self.db
+
+    def prepare(self) -> "VaultEncrypted":
+        """
+        Decodes the hex slot parameters ahead of time, so that unlocking (and every
+        retry with another password) only has to run the KDF and the decryption.
+        """
+        for i, slot in enumerate(self.header.slots):
+            if slot.type != 1 or i in self._decoded:
+                continue
+            try:
+                self._decoded[i] = (
+                    binascii.unhexlify(slot.salt),
+                    binascii.unhexlify(slot.key_params.nonce),
+                    binascii.unhexlify(slot.key_params.tag),
+                    binascii.unhexlify(slot.key),
+                )
+            except (binascii.Error, ValueError):
+                continue # Left for find_master_key to skip
+        if "params" not in self._decoded:
+            self._decoded["params"] = (
+                binascii.unhexlify(self.header.params.nonce),
+                binascii.unhexlify(self.header.params.tag),
+            )
+        return self
+
+    def find_master_key(self, pwd: str, timings: Optional[Dict[str, float]] = None) -> bytes:
+        # The cryptography stack is only loaded once a vault is actually unlocked
+        from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+        from cryptography.hazmat.backends import default_backend
 
-    def find_master_key(self, pwd: str) -> bytes:
         master_key = b""
-        for slot in self.header.slots:
+        for i, slot in enumerate(self.header.slots):
             if slot.type != 1:  # Only consider password-based slots
                 continue
 
             try:
-                salt = binascii.unhexlify(slot.salt)
-                
+                decoded = self._decoded.get(i)
+                if decoded is None:
+                    decoded = (
+                        binascii.unhexlify(slot.salt),
+                        binascii.unhexlify(slot.key_params.nonce),
+                        binascii.unhexlify(slot.key_params.tag),
+                        binascii.unhexlify(slot.key),
+                    )
+                salt, nonce, tag, slot_key_encrypted = decoded
+
+
                 # Scrypt key derivation
                 kdf = Scrypt(
                     salt=salt,
@@ -96,17 +297,20 @@ class VaultEncrypted:
                     p=slot.p,
                     backend=default_backend()
                 )
-                key = kdf.derive(pwd.encode('utf-8'))
-
-                nonce = binascii.unhexlify(slot.key_params.nonce)
-                tag = binascii.unhexlify(slot.key_params.tag)
-                slot_key_encrypted = binascii.unhexlify(slot.key)
+                started = time.perf_counter()
+                with tracing.span("scrypt", n=slot.n, r=slot.r, p=slot.p):
+                    key = kdf.derive(pwd.encode('utf-8'))
+                _add_timing(timings, "kdf", started)
 
                 # AES-GCM decryption
+                started = time.perf_counter()
                 cipher = Cipher(algorithms.AES(key), modes.GCM(nonce, tag), backend=default_backend())
                 decryptor = cipher.decryptor()
-                
-                master_key = decryptor.update(slot_key_encrypted) + decryptor.finalize()
+                try:
+                    with tracing.span("gcm_unwrap"):
+                        master_key = decryptor.update(slot_key_encrypted) + decryptor.finalize()
+                finally:
+                    _add_timing(timings, "unwrap", started)
                 
                 # If decryption is successful, master_key will not be empty
                 if master_key:
@@ -120,35 +324,171 @@ class VaultEncrypted:
         return master_key
 
     def decrypt_contents(self, master_key: bytes) -> bytes:
-        db_encrypted_b64 = self.db
+        from cryptography.exceptions import InvalidTag
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+        from cryptography.hazmat.backends import default_backend
+
+        db_encrypted_b64 = self.load_db()
         params = self.header.params
 
-        nonce = binascii.unhexlify(params.nonce)
-        tag = binascii.unhexlify(params.tag)
+        if "params" in self._decoded:
+            nonce, tag = self._decoded["params"]
+        else:
+            nonce = binascii.unhexlify(params.nonce)
+            tag = binascii.unhexlify(params.tag)
         db_data_encrypted = base64.b64decode(db_encrypted_b64)
 
         cipher = Cipher(algorithms.AES(master_key), modes.GCM(nonce, tag), backend=default_backend())
         decryptor = cipher.decryptor()
         
-        content = decryptor.update(db_data_encrypted) + decryptor.finalize()
+        try:
+            content = decryptor.update(db_data_encrypted) + decryptor.finalize()
+        except InvalidTag:
+            raise VaultFormatError(TAMPERED_VAULT_MESSAGE) from None
         
         return content
 
-    def decrypt_vault(self, master_key: bytes) -> Vault:
-        content = self.decrypt_contents(master_key)
-        
-        db_data = json.loads(content.decode('utf-8'))
-        db = Db(
-            version=db_data['version'],
-            entries=[from_dict(Entry, e) for e in db_data['entries']],
-            groups=[from_dict(Group, g) for g in db_data['groups']]
-        )
+    def decrypt_chunks(self, master_key: bytes, timings: Optional[Dict[str, float]] = None) -> Iterator[bytes]:
+        """
+        Decrypts the db payload piece by piece. The last piece comes from finalize(),
+        which verifies the GCM tag: until it has been consumed, nothing is authentic.
+        A tag that does not match raises VaultFormatError (TAMPERED_VAULT_MESSAGE).
+        """
+        from cryptography.exceptions import InvalidTag
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+        from cryptography.hazmat.backends import default_backend
+
+        db_encrypted_b64 = self.load_db()
+        if isinstance(db_encrypted_b64, str):
+            db_encrypted_b64 = db_encrypted_b64.encode("ascii")
+        if BASE64_WHITESPACE.search(db_encrypted_b64):
+            # Wrapped base64: without its line breaks, slices of 4-character groups decode on their own
+            db_encrypted_b64 = BASE64_WHITESPACE.sub(b"", db_encrypted_b64)
+        if "params" in self._decoded:
+            nonce, tag = self._decoded["params"]
+        else:
+            nonce = binascii.unhexlify(self.header.params.nonce)
+            tag = binascii.unhexlify(self.header.params.tag)
+        decryptor = Cipher(algorithms.AES(master_key), modes.GCM(nonce, tag), backend=default_backend()).decryptor()
+
+        for i in range(0, len(db_encrypted_b64), DECRYPT_CHUNK_SIZE):
+            started = time.perf_counter()
+            plaintext = decryptor.update(base64.b64decode(db_encrypted_b64[i:i + DECRYPT_CHUNK_SIZE]))
+            _add_timing(timings, "decrypt", started)
+            yield plaintext
+        started = time.perf_counter()
+        try:
+            plaintext = decryptor.finalize()
+        except InvalidTag:
+            raise VaultFormatError(TAMPERED_VAULT_MESSAGE) from None
+        finally:
+            _add_timing(timings, "decrypt", started)
+        # Authenticated: the ciphertext is not needed any more
+        self.db = bytearray()
+        del db_encrypted_b64
+        yield plaintext
+
+    def decrypt_vault(self, master_key: bytes, timings: Optional[Dict[str, float]] = None, load_icons: bool = False) -> Vault:
+        """
+        Decrypts and parses the entries as one pipeline: each decrypted piece goes
+        straight into an incremental JSON parser that builds the entries one by one,
+        so the whole plaintext never exists at once. The entries are only returned
+        once the GCM tag has been verified. Icons are left out unless load_icons is
+        set, or the vault was not read from a file; Vault.icons then reads them back
+        from the file on demand, given the master key again.
+
+        The ciphertext is released once it has been decrypted and authenticated;
+        nothing here keeps the master key.
+        """
+        started = time.perf_counter()
+        self.load_db()
+        _add_timing(timings, "read", started)
+        load_icons = load_icons or self.path is None
+
+        started = time.perf_counter()
+        decrypt_timings: Dict[str, float] = {}
+        pieces = self.decrypt_chunks(master_key, decrypt_timings)
+        stream = _JsonStream(lambda: next(pieces, None))
+        stripper = None if load_icons else stream.strip_icons()
+        with tracing.span("decrypt_parse", b64_len=len(self.db)):
+            try:
+                db = _parse_db(stream)
+                # Run the decryptor to its end, which authenticates everything parsed so far
+                for rest in pieces:
+                    if rest.strip():
+                        raise VaultFormatError("Unexpected data after the vault contents")
+            except (ValueError, KeyError, TypeError) as e: # Incl. binascii.Error of a broken payload
+                raise _format_error(e, "Malformed vault contents")
+
+        icons = None
+        if stripper is not None:
+            icons = IconStore(_encrypted_content(self.path, self.header.params), stripper.spans)
+            icons.adopt(db.entries)
+        else:
+            share_icons(db.entries)
+        if timings is not None:
+            decrypted = decrypt_timings.get("decrypt", 0.0)
+            timings["decrypt"] = timings.get("decrypt", 0.0) + decrypted
+            _add_timing(timings, "parse", started + decrypted)
         return Vault(
             version=self.version,
             header=self.header,
-            db=db
+            db=db,
+            icons=icons
         )
 
+def _encrypted_content(file_path: str, params: Params) -> Callable[[Optional[bytes]], bytes]:
+    """Reads and decrypts the vault file again, for IconStore; checks it is still the vault that was unlocked."""
+    def load(master_key: Optional[bytes]) -> bytes:
+        if master_key is None:
+            raise ValueError("Loading icons from an encrypted vault needs its master key")
+        vault = stream_vault_file(file_path)
+        if not isinstance(vault, VaultEncrypted) or vault.header.params != params:
+            raise ValueError("The vault file changed since it was unlocked")
+        return vault.decrypt_contents(master_key)
+    return load
+
+def _parse_db(stream: "_JsonStream") -> Db:
+    """Parses the decrypted db JSON from a stream, turning each entry into an Entry as soon as it is complete."""
+    fields = {}
+    entries: List[Entry] = []
+    stream.expect(b"{")
+    while True:
+        key = stream.value()
+        stream.expect(b":")
+        if key == "entries":
+            stream.expect(b"[")
+            if stream.peek() == ord("]"):
+                stream.next_char()
+            else:
+                while True:
+                    # Runs of entries already in the buffer are decoded in one call
+                    entries.extend(from_dict(Entry, item) for item in stream.array_items())
+                    entries.append(from_dict(Entry, stream.value()))
+                    separator = stream.next_char()
+                    if separator == ord("]"):
+                        break
+                    if separator != ord(","):
+                        raise VaultFormatError(f"Malformed vault contents: unexpected {chr(separator)!r}")
+            fields[key] = entries
+        else:
+            fields[key] = stream.value()
+        separator = stream.next_char()
+        if separator == ord("}"):
+            break
+        if separator != ord(","):
+            raise VaultFormatError(f"Malformed vault contents: unexpected {chr(separator)!r}")
+    return Db(
+        version=fields['version'],
+        entries=entries,
+        groups=[from_dict(Group, g) for g in fields['groups']]
+    )
+
+def _add_timing(timings: Optional[Dict[str, float]], stage: str, started: float):
+    """Accumulates the seconds spent in an unlock stage, if the caller asked for timings."""
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + (time.perf_counter() - started)
+
 # Helper to deserialize JSON into dataclasses
 def from_dict(cls, data):
     if isinstance(data, list):
@@ -250,3 +590,226 @@ def deserialize_vault(data: dict) -> Vault:
         header=header,
         db=db
     )
+
+class _JsonStream:
+    """
+    Just enough of an incremental JSON reader for a vault file and its decrypted
+    contents. read() returns the next piece of input, or None at the end.
+    """
+
+    def __init__(self, read: Callable[[], bytes]):
+        self.read = read
+        self.buf = bytearray()
+        self.pos = 0
+        self.dropped = 0 # Bytes of input consumed and no longer in buf
+
+    def position(self) -> int:
+        """Offset of the next unread byte in the whole input."""
+        return self.dropped + self.pos
+
+    def strip_icons(self) -> IconStripper:
+        """Runs the rest of the input through an IconStripper, and returns it for its spans."""
+        stripper = IconStripper(self.position())
+        unread, read = bytes(self.buf[self.pos:]), self.read
+
+        def pieces():
+            piece = unread
+            while piece is not None:
+                yield stripper.feed(piece)
+                piece = read()
+            yield stripper.feed(b"", final=True)
+        stripped = pieces()
+        self.read = lambda: next(stripped, None)
+        self.dropped += len(self.buf) # Positions now count stripped bytes
+        self.buf, self.pos = bytearray(), 0
+        return stripper
+
+    def _fill(self) -> bool:
+        chunk = self.read()
+        while chunk == b"": # Nothing in this piece, e.g. all held back by the icon stripper
+            chunk = self.read()
+        if chunk is None:
+            return False
+        if self.pos:
+            del self.buf[:self.pos] # Only the unread part is kept
+            self.dropped += self.pos
+            self.pos = 0
+        self.buf += chunk
+        return True
+
+    def next_char(self) -> int:
+        """The next non-whitespace byte, consumed."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in JSON_WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                self.pos += 1
+                return self.buf[self.pos - 1]
+            if not self._fill():
+                raise VaultFormatError("Unexpected end of vault file")
+
+    def peek(self) -> int:
+        """The next non-whitespace byte, left unconsumed."""
+        char = self.next_char()
+        self.pos -= 1
+        return char
+
+    def expect(self, char: bytes):
+        found = self.next_char()
+        if found != char[0]:
+            raise VaultFormatError(f"Malformed vault file: expected {char.decode()!r}, found {chr(found)!r}")
+
+    def value(self):
+        """Decodes the next JSON value (a key, the version or the header)."""
+        self.next_char()
+        self.pos -= 1 # Whitespace skipped, back on the value's first byte
+        decoder = json.JSONDecoder()
+        window = 4096 # Decode only as much as the value might need, not the whole buffer
+        while True:
+            text = self.buf[self.pos:self.pos + window].decode("utf-8", "replace")
+            try:
+                value, end = decoder.raw_decode(text)
+                # A value ending right at the window's end may be a cut-off number
+                if end < len(text) or not isinstance(value, (int, float)):
+                    self.pos += len(text[:end].encode("utf-8"))
+                    return value
+            except json.JSONDecodeError:
+                pass
+            if self.pos + window < len(self.buf):
+                window *= 2
+            elif not self._fill():
+                try:
+                    value, end = decoder.raw_decode(text) # Complete after all, or the file is cut short
+                except json.JSONDecodeError as e:
+                    raise VaultFormatError(f"Malformed vault file: {e}") from e
+                self.pos += len(text[:end].encode("utf-8"))
+                return value
+
+    def array_items(self) -> list:
+        """
+        Decodes, in one codec call, the items of the array being read that are in
+        the buffer and followed by a comma, and consumes the comma after the last.
+        The end of the last one is guessed at a "}," in the buffer. A guess inside
+        a string or a nested object leaves the batch unbalanced, which is never
+        valid JSON, so a wrong guess only costs a failed decode; an earlier "},"
+        is tried once before giving up on this buffer.
+        """
+        array_end = ARRAY_END_PATTERN.search(self.buf, self.pos)
+        limit = array_end.start() if array_end else len(self.buf)
+        for _ in range(2):
+            cut = self.buf.rfind(b"},", self.pos, limit)
+            if cut < 0:
+                break
+            try:
+                items = json_codec.loads(b"[" + self.buf[self.pos:cut + 1] + b"]")
+            except json_codec.DecodeError:
+                limit = cut
+                continue
+            self.pos = cut + 2
+            return items
+        return []
+
+    def string_bytes(self) -> bytearray:
+        """Reads the next JSON string as raw bytes, for the large base64 db payload."""
+        self.expect(b'"')
+        end = self.pos
+        while True:
+            end = self.buf.find(b'"', end)
+            if end < 0:
+                scanned = len(self.buf) - self.pos
+                if not self._fill():
+                    raise VaultFormatError("Unexpected end of vault file in db")
+                end = self.pos + scanned
+                continue
+            backslashes = 0
+            while self.buf[end - 1 - backslashes] == 0x5C:
+                backslashes += 1
+            if backslashes % 2 == 0:
+                break
+            end += 1
+        # Hand over the buffer itself rather than a copy of the payload in it
+        rest = self.buf[end + 1:]
+        self.dropped += end + 1
+        del self.buf[end:]
+        del self.buf[:self.pos]
+        raw, self.buf, self.pos = self.buf, rest, 0
+        if b"\\" in raw: # e.g. "\/" from writers that escape slashes
+            raw = json_codec.loads(b'"' + raw + b'"').encode("ascii")
+        return raw
+
+def stream_vault_file(file_path: str, on_header: Optional[Callable[[bool], None]] = None) -> Union[VaultEncrypted, Vault]:
+    """
+    Reads a vault file incrementally and returns as soon as its version and header
+    are known, so the KDF can start. The db payload keeps streaming from disk into
+    a bytes buffer on a background thread; VaultEncrypted.load_db() waits for it.
+
+    A plaintext export (its db an object, its header without slots) needs no KDF:
+    its entries are parsed straight from the file, icons left out as for an
+    encrypted vault, and it is returned as a Vault with encrypted=False.
+
+    on_header, if given, is called on the reading thread with whether the vault
+    is encrypted (its header has slots) as soon as the header is read, before a
+    plaintext db is parsed.
+    """
+    header_ready: Future = Future()
+    db_ready: Future = Future()
+
+    def read():
+        published = None
+        fields = {}
+        stripper = None
+        try:
+            with tracing.span("read_vault_file", path=file_path), open(file_path, "rb") as f:
+                stream = _JsonStream(lambda: f.read(STREAM_CHUNK_SIZE) or None)
+                stream.expect(b"{")
+                while True:
+                    key = stream.value()
+                    stream.expect(b":")
+                    if key == "db" and stream.peek() == ord("{"):
+                        stripper = stream.strip_icons() # Spans are offsets in the file
+                        with tracing.span("parse_plaintext"):
+                            fields[key] = _parse_db(stream)
+                    else:
+                        fields[key] = stream.string_bytes() if key == "db" else stream.value()
+                    header = fields.get("header")
+                    if key == "header" and on_header is not None and isinstance(header, dict):
+                        on_header(header.get("slots") is not None)
+                    if published is None and "version" in fields and isinstance(header, dict) and header.get("slots") is not None:
+                        published = deserialize_vault_encrypted(dict(fields, db=fields.get("db")))
+                        published._db_pending = db_ready
+                        published.path = file_path
+                        header_ready.set_result(published)
+                    separator = stream.next_char()
+                    if separator == ord("}"):
+                        break
+                    if separator != ord(","):
+                        raise VaultFormatError(f"Malformed vault file: unexpected {chr(separator)!r}")
+            if isinstance(fields.get("db"), Db):
+                if published is not None:
+                    raise VaultFormatError("Malformed vault file: plaintext db with an encrypted header")
+                header_ready.set_result(_plaintext_vault(file_path, fields, stripper))
+                return
+            if published is None:
+                published = deserialize_vault_encrypted(fields) # Raises KeyError on a missing field
+                published.path = file_path
+                header_ready.set_result(published)
+            if "db" not in fields:
+                raise KeyError("db")
+            db_ready.set_result(fields["db"])
+        except BaseException as e:
+            if published is None and not header_ready.done():
+                header_ready.set_exception(e)
+            else:
+                # Only found while unlocking: it must not pass for a wrong password
+                db_ready.set_exception(_format_error(e, "Could not read the vault file") if isinstance(e, Exception) else e)
+
+    threading.Thread(target=read, name="read-vault", daemon=True).start()
+    return header_ready.result()
+
+def _plaintext_vault(file_path: str, fields: dict, stripper: IconStripper) -> Vault:
+    def read_file(master_key: Optional[bytes]) -> bytes:
+        with open(file_path, "rb") as f:
+            return f.read()
+    icons = IconStore(read_file, stripper.spans)
+    icons.adopt(fields["db"].entries)
+    return Vault(version=fields["version"], header=None, db=fields["db"], icons=icons, encrypted=False)
@@ -0,0 +1,134 @@
+import os
+from concurrent import futures
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from aegis_core import prepare_vault_file, unlock_vault, get_otp
+from vault import Vault, Db, IconStore, VaultFormatError
+
+def vault_label(path: str) -> str:
+    """Short name of a vault for the vault column: its file name without .json."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+class VaultSet:
+    """
+    Several vaults unlocked concurrently and merged into one Vault.
+
+    Each vault is parsed and unlocked (its own scrypt) on a worker thread; the
+    KDF releases the GIL, so the workers run in parallel. Finished vaults are
+    merged by poll(), so the list can be shown as soon as the first one is
+    ready and grow as the others arrive.
+
+    Merged entries keep their own UUIDs (for usage and their vault's IconStore).
+    The merged views (otps, the list's rows) are indexed by a key, "uuid@label":
+    every merged entry stays addressable when the same UUID is in two vaults,
+    and the key does not depend on which vault finishes first, so pins saved
+    with it find the same entry every run. sources records each merged entry's
+    key and vault label.
+    """
+
+    def __init__(self, paths: List[str]):
+        labels = [vault_label(path) for path in paths]
+        for i, label in enumerate(labels):
+            if labels.count(label) > 1:
+                labels[i] = f"{label}#{i + 1}"
+        self.labels = dict(zip(paths, labels))
+
+        self.vault = Vault(version=1, header=None, db=Db(version=1, entries=[], groups=[]))
+        self.otps = {} # Merged entry key -> OTP
+        self.group_names = {} # Group uuid -> name, across all vaults
+        self.sources: List[Tuple[str, str]] = [] # (key, vault label) of each entry in vault.db.entries
+        self.icons: Dict[str, IconStore] = {} # Vault label -> the icons left out of its parse
+        self.loaded = [] # Paths merged so far, in merge order
+        self.errors = {} # Path -> message of its last failed unlock
+
+        self._executor = ThreadPoolExecutor(max_workers=max(1, min(len(paths), os.cpu_count() or 1)), thread_name_prefix="unlock-vault")
+        self._pending = {} # Path -> Future of its unlocked Vault
+        self._passwords = {} # Path -> password of the attempt in flight
+        self._retries = {} # Path -> newer password to try if the attempt in flight fails
+        self._unreadable = set() # Paths that failed to read or authenticate: no password can open them
+
+    def start(self, password: str, paths: Optional[List[str]] = None):
+        """
+        Starts unlocking every vault (or the given ones) that is not merged yet and
+        has not turned out to be unreadable, corrupt or tampered with.
+        An attempt with another password that has not started is replaced; one
+        already running is retried with this password if it fails.
+        """
+        for path in paths if paths is not None else self.labels:
+            if path in self.loaded or path in self._unreadable:
+                continue
+            future = self._pending.get(path)
+            if future is not None:
+                if self._passwords[path] == password:
+                    continue
+                if not future.cancel():
+                    self._retries[path] = password
+                    continue
+            self._submit(path, password)
+
+    def _submit(self, path: str, password: str):
+        self.errors.pop(path, None)
+        self._retries.pop(path, None)
+        self._passwords[path] = password
+        self._pending[path] = self._executor.submit(self._unlock, path, password)
+
+    @staticmethod
+    def _unlock(path: str, password: str) -> Vault:
+        return unlock_vault(prepare_vault_file(path), password)
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, path: str, vault_data: Vault):
+        """Merges an unlocked vault into the set."""
+        label = self.labels.setdefault(path, vault_label(path))
+        if not vault_data.encrypted:
+            self.vault.encrypted = False # Flagged as long as any vault in the set is a plaintext export
+        for group in vault_data.db.groups:
+            if group.uuid not in self.group_names:
+                self.group_names[group.uuid] = group.name
+                if all(g.name != group.name for g in self.vault.db.groups):
+                    self.vault.db.groups.append(group) # Groups with the same name are offered once
+        for entry in vault_data.db.entries:
+            key = f"{entry.uuid}@{label}"
+            self.vault.db.entries.append(entry)
+            self.sources.append((key, label))
+            try:
+                self.otps[key] = get_otp(entry)
+            except Exception:
+                pass # Shown as unavailable, like in a single vault
+        if vault_data.icons is not None:
+            self.icons[label] = vault_data.icons
+        self.loaded.append(path)
+
+    def poll(self, wait: bool = False) -> Tuple[List[str], List[str]]:
+        """
+        Merges the vaults that finished unlocking. With wait, blocks until at least
+        one finished. Returns (labels merged, labels that failed).
+        """
+        if wait and self._pending:
+            futures.wait(self._pending.values(), return_when=futures.FIRST_COMPLETED)
+
+        merged, failed = [], []
+        for path in [path for path, future in self._pending.items() if future.done()]:
+            future = self._pending.pop(path)
+            self._passwords.pop(path, None)
+            try:
+                vault_data = future.result()
+            except (OSError, ValueError, KeyError, TypeError) as e: # Incl. VaultFormatError, e.g. of a tampered vault
+                if isinstance(e, (OSError, VaultFormatError)):
+                    self._unreadable.add(path)
+                elif path in self._retries:
+                    self._submit(path, self._retries[path]) # A newer password came in meanwhile
+                    continue
+                self.errors[path] = str(e)
+                failed.append(self.labels[path])
+            else:
+                self._retries.pop(path, None)
+                self.add(path, vault_data)
+                merged.append(self.labels[path])
+        return merged, failed
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
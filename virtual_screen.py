@@ -0,0 +1,364 @@
+import curses
+import threading
+from collections import deque
+from typing import Iterable, Optional, Tuple, Union
+
+from tui_utils import char_width
+
+# Box-drawing characters standing in for the ACS_* constants, which real curses
+# only defines after initscr()
+ACS_CHARS = {
+    "ACS_ULCORNER": "┌", "ACS_URCORNER": "┐", "ACS_LLCORNER": "└", "ACS_LRCORNER": "┘",
+    "ACS_HLINE": "─", "ACS_VLINE": "│", "ACS_LTEE": "├", "ACS_RTEE": "┤",
+    "ACS_TTEE": "┬", "ACS_BTEE": "┴", "ACS_PLUS": "┼", "ACS_BLOCK": "█",
+}
+
+# Rough cost of the escape sequences a terminal update needs, for the bytes estimate
+CURSOR_MOVE_BYTES = 8 # ESC [ row ; col H
+ATTRIBUTE_CHANGE_BYTES = 6 # ESC [ 0 ; nn m
+
+BLANK = (" ", 0)
+
+Key = Union[int, str, None]
+
+class ScriptEnded(Exception):
+    """Raised by getch() when the scripted keys run out; ends a VirtualBackend session."""
+
+class VirtualWindow:
+    """
+    An in-memory curses window (or pad). Implements the subset of the window API
+    the UI uses, with curses' wrapping and out-of-range errors, and counts cell writes.
+    """
+
+    def __init__(self, terminal: "VirtualTerminal", rows: int, cols: int, is_pad: bool = False):
+        self.terminal = terminal
+        self.rows = rows
+        self.cols = cols
+        self.is_pad = is_pad
+        self.cells = [[BLANK] * cols for _ in range(rows)]
+        self.y = 0
+        self.x = 0
+        self.delay = -1 # getch() timeout in ms; -1 blocks
+
+    # --- Writing ---
+
+    def _check(self, y, x):
+        if not (0 <= y < self.rows and 0 <= x < self.cols):
+            raise curses.error(f"position ({y}, {x}) outside the {self.rows}x{self.cols} window")
+
+    def _put(self, text: str, attr: int):
+        row = self.cells[self.y]
+        for ch in text:
+            if ch == "\n":
+                for x in range(self.x, self.cols):
+                    row[x] = BLANK
+                self.y, self.x = self.y + 1, 0
+                if self.y >= self.rows:
+                    self.y = self.rows - 1
+                    raise curses.error("addstr() returned ERR")
+                row = self.cells[self.y]
+                continue
+            width = char_width(ch)
+            if width == 0:
+                if self.x > 0: # Combining mark: joins the previous cell
+                    prev, prev_attr = row[self.x - 1]
+                    row[self.x - 1] = (prev + ch, prev_attr)
+                continue
+            if width == 2 and self.x == self.cols - 1:
+                row[self.x] = BLANK # A wide character never straddles the edge
+                self._advance(1)
+                row = self.cells[self.y]
+            row[self.x] = (ch, attr)
+            self.terminal.cell_writes += 1
+            if width == 2:
+                row[self.x + 1] = ("", attr) # Covered by the wide character
+            self._advance(width)
+            row = self.cells[self.y]
+
+    def _advance(self, width):
+        self.x += width
+        if self.x >= self.cols:
+            self.x = 0
+            self.y += 1
+            if self.y >= self.rows:
+                # Like curses: the write happened, but the cursor cannot move past the end
+                self.y, self.x = self.rows - 1, self.cols - 1
+                raise curses.error("addwstr() returned ERR")
+
+    @staticmethod
+    def _parse(args, text_type=str) -> Tuple[Optional[int], Optional[int], object, int]:
+        if len(args) >= 3:
+            y, x, value = args[0], args[1], args[2]
+            attr = args[3] if len(args) > 3 else 0
+        else:
+            y = x = None
+            value = args[0]
+            attr = args[1] if len(args) > 1 else 0
+        return y, x, value, attr
+
+    def addstr(self, *args):
+        y, x, text, attr = self._parse(args)
+        if y is not None:
+            self.move(y, x)
+        self._put(str(text), attr)
+
+    addnstr = addstr
+
+    def addch(self, *args):
+        y, x, ch, attr = self._parse(args)
+        if y is not None:
+            self.move(y, x)
+        self._put(chr(ch) if isinstance(ch, int) else ch, attr)
+
+    def hline(self, *args):
+        if len(args) >= 4:
+            y, x, ch, n = args[:4]
+        else:
+            y, x = self.y, self.x
+            ch, n = args[:2]
+        self._check(y, x)
+        ch = chr(ch) if isinstance(ch, int) else ch
+        row = self.cells[y]
+        for col in range(x, min(self.cols, x + n)):
+            row[col] = (ch, 0)
+        self.terminal.cell_writes += max(0, min(self.cols, x + n) - x)
+
+    def vline(self, *args):
+        if len(args) >= 4:
+            y, x, ch, n = args[:4]
+        else:
+            y, x = self.y, self.x
+            ch, n = args[:2]
+        self._check(y, x)
+        ch = chr(ch) if isinstance(ch, int) else ch
+        for row in range(y, min(self.rows, y + n)):
+            self.cells[row][x] = (ch, 0)
+        self.terminal.cell_writes += max(0, min(self.rows, y + n) - y)
+
+    def move(self, y, x):
+        self._check(y, x)
+        self.y, self.x = y, x
+
+    def clrtoeol(self):
+        row = self.cells[self.y]
+        for x in range(self.x, self.cols):
+            row[x] = BLANK
+
+    def delch(self, *args):
+        if args:
+            self.move(*args)
+        row = self.cells[self.y]
+        del row[self.x]
+        row.append(BLANK)
+
+    def erase(self):
+        self.cells = [[BLANK] * self.cols for _ in range(self.rows)]
+        self.y = self.x = 0
+
+    def clear(self):
+        self.erase()
+        self.terminal.force_repaint = True # curses repaints everything on the next refresh
+
+    def resize(self, rows, cols):
+        self.cells = [(row + [BLANK] * cols)[:cols] for row in self.cells[:rows]]
+        self.cells += [[BLANK] * cols for _ in range(rows - len(self.cells))]
+        self.rows, self.cols = rows, cols
+        self.y, self.x = min(self.y, rows - 1), min(self.x, cols - 1)
+
+    # --- Geometry and settings ---
+
+    def getmaxyx(self):
+        return self.rows, self.cols
+
+    def getyx(self):
+        return self.y, self.x
+
+    def timeout(self, delay):
+        self.delay = delay
+
+    def nodelay(self, flag):
+        self.delay = 0 if flag else -1
+
+    def keypad(self, flag): pass
+    def attron(self, attr): pass
+    def attroff(self, attr): pass
+    def attrset(self, attr): pass
+    def bkgd(self, *args): pass
+    def leaveok(self, flag): pass
+    def scrollok(self, flag): pass
+
+    # --- Output and input ---
+
+    def noutrefresh(self, *args):
+        if self.is_pad:
+            pminrow, pmincol, sminrow, smincol, smaxrow, smaxcol = args
+            self.terminal.stage(self, pminrow, pmincol, sminrow, smincol, smaxrow - sminrow + 1, smaxcol - smincol + 1)
+        else:
+            self.terminal.stage(self, 0, 0, 0, 0, self.rows, self.cols)
+
+    def refresh(self, *args):
+        self.noutrefresh(*args)
+        self.terminal.doupdate()
+
+    def getch(self):
+        return self.terminal.next_key(self.delay)
+
+class VirtualTerminal:
+    """
+    An in-memory terminal: a virtual screen that windows are staged into, the
+    physical screen as last emitted, and a script of keys for getch().
+
+    doupdate() diffs the two screens like curses does and estimates the bytes a
+    real terminal would receive (cursor moves, attribute changes, UTF-8 text).
+    """
+
+    def __init__(self, rows: int = 24, cols: int = 80, keys: Iterable[Key] = ()):
+        self.rows = rows
+        self.cols = cols
+        self.virtual = [[BLANK] * cols for _ in range(rows)]
+        self.physical = [[BLANK] * cols for _ in range(rows)]
+        self.stdscr = VirtualWindow(self, rows, cols)
+        self.keys = deque()
+        self.feed(*keys)
+
+        self.frames = 0 # doupdate() calls
+        self.bytes_emitted = 0
+        self.cell_writes = 0
+        self.keys_read = 0
+        self.force_repaint = False
+
+    def feed(self, *keys: Key):
+        """Queues keys: ints (curses key codes), strings (one key per character) or None (a getch() timeout)."""
+        for key in keys:
+            if isinstance(key, str):
+                self.keys.extend(ord(ch) for ch in key)
+            else:
+                self.keys.append(curses.ERR if key is None else key)
+
+    def next_key(self, delay: int) -> int:
+        if not self.keys:
+            raise ScriptEnded()
+        key = self.keys.popleft()
+        if key == curses.ERR and delay < 0:
+            return self.next_key(delay) # A blocking getch() never times out
+        self.keys_read += 1
+        return key
+
+    def resize(self, rows: int, cols: int):
+        """Resizes the terminal and queues KEY_RESIZE, as a SIGWINCH would."""
+        self.rows, self.cols = rows, cols
+        self.virtual = [[BLANK] * cols for _ in range(rows)]
+        self.physical = [[BLANK] * cols for _ in range(rows)]
+        self.stdscr.resize(rows, cols)
+        self.keys.appendleft(curses.KEY_RESIZE)
+
+    def newpad(self, rows: int, cols: int) -> VirtualWindow:
+        return VirtualWindow(self, rows, cols, is_pad=True)
+
+    def stage(self, window: VirtualWindow, src_y, src_x, dst_y, dst_x, height, width):
+        """Copies part of a window onto the virtual screen (wnoutrefresh)."""
+        height = min(height, self.rows - dst_y, window.rows - src_y)
+        width = min(width, self.cols - dst_x, window.cols - src_x)
+        for r in range(max(0, height)):
+            self.virtual[dst_y + r][dst_x:dst_x + width] = window.cells[src_y + r][src_x:src_x + width]
+
+    def doupdate(self):
+        """Brings the physical screen up to date, counting the bytes a terminal would receive."""
+        self.frames += 1
+        emitted = 0
+        attr = 0
+        for y in range(self.rows):
+            wanted = self.virtual[y]
+            shown = self.physical[y]
+            if wanted == shown and not self.force_repaint:
+                continue
+            cursor = None
+            for x in range(self.cols):
+                cell = wanted[x]
+                if cell == shown[x] and not self.force_repaint:
+                    continue
+                if cursor != x:
+                    emitted += CURSOR_MOVE_BYTES
+                if cell[1] != attr:
+                    emitted += ATTRIBUTE_CHANGE_BYTES
+                    attr = cell[1]
+                emitted += len(cell[0].encode("utf-8"))
+                cursor = x + max(1, len(cell[0]) and char_width(cell[0][0]))
+            self.physical[y] = list(wanted)
+        self.force_repaint = False
+        self.bytes_emitted += emitted
+        return emitted
+
+    def text(self) -> str:
+        """The physical screen as text, one line per row."""
+        return "\n".join("".join(ch for ch, _ in row).rstrip() for row in self.physical)
+
+    def line(self, y: int) -> str:
+        return "".join(ch for ch, _ in self.physical[y]).rstrip()
+
+    def attr_at(self, y: int, x: int) -> int:
+        return self.physical[y][x][1]
+
+class VirtualBackend:
+    """
+    Test and benchmark helper: runs a curses screen function against a
+    VirtualTerminal instead of a real terminal. run(func, *args) calls
+    func(stdscr, *args) with the terminal's window and returns its result, or
+    None once the scripted keys run out.
+
+    The screens call curses module functions directly (newpad, doupdate,
+    curs_set, colours, mouse, ACS_* characters), so for the duration of run()
+    those attributes of the curses module itself are pointed at the virtual
+    terminal, and restored afterwards, also when func raises. That is process-wide
+    state: only one run() may be active at a time (another raises RuntimeError),
+    and nothing else in the process should use curses meanwhile. The real
+    application never goes through here; it uses curses.wrapper().
+    """
+
+    _active = threading.Lock() # Held while the curses module is patched
+
+    def __init__(self, terminal: Optional[VirtualTerminal] = None, rows: int = 24, cols: int = 80, keys: Iterable[Key] = ()):
+        self.terminal = terminal or VirtualTerminal(rows, cols, keys)
+
+    def _replacements(self):
+        terminal = self.terminal
+        def getmouse():
+            raise curses.error("no mouse event")
+        replacements = {
+            "newpad": terminal.newpad,
+            "doupdate": terminal.doupdate,
+            "curs_set": lambda visibility: 1,
+            "mousemask": lambda mask: (mask, 0),
+            "getmouse": getmouse,
+            "has_colors": lambda: True,
+            "start_color": lambda: None,
+            "use_default_colors": lambda: None,
+            "init_pair": lambda pair, fg, bg: None,
+            "color_pair": lambda pair: pair << 8,
+            "echo": lambda: None,
+            "noecho": lambda: None,
+            "beep": lambda: None,
+            "napms": lambda ms: None,
+        }
+        replacements.update(ACS_CHARS)
+        return replacements
+
+    def run(self, func, *args, **kwargs):
+        if not VirtualBackend._active.acquire(blocking=False):
+            raise RuntimeError("another VirtualBackend is already running; the curses module is patched")
+        missing = object()
+        saved = {}
+        try:
+            for name, value in self._replacements().items():
+                saved[name] = getattr(curses, name, missing)
+                setattr(curses, name, value)
+            return func(self.terminal.stdscr, *args, **kwargs)
+        except ScriptEnded:
+            return None
+        finally:
+            for name, value in saved.items():
+                if value is missing:
+                    delattr(curses, name)
+                else:
+                    setattr(curses, name, value)
+            VirtualBackend._active.release()